@@ -6,8 +6,18 @@ Requisitos:
     # (opcional) pip install pillow   ← para ver la imagen de Borre
 Ejecución:
     python cerebrino_hd_plus.py
+    python cerebrino_hd_plus.py --reduced-motion   ← sin fundidos ni animación
+                                                     (o CEREBRINO_REDUCED_MOTION=1)
+    python cerebrino_hd_plus.py --perf             ← medir desde el arranque
+                                                     (o CEREBRINO_PERF=1)
+    python cerebrino_hd_plus.py --semilla 42       ← sesiones reproducibles
+                                                     (o CEREBRINO_SEED=42)
+
+Cada sesión graba sus entradas en ~/.cerebrino/trazas/ (ver cerebrino.replay).
 
 Atajos:
+    F3  → panel de rendimiento (enciende la medición)
+    F4  → exportar la traza de rendimiento a ~/.cerebrino/perf-*.json y .csv
     F11 → alternar pantalla completa
     Esc  → salir
 """
@@ -15,10 +25,16 @@ Atajos:
 import tkinter as tk
 from tkinter import messagebox as mb
 from tkinter import ttk
-import random, ast, operator, math
+import math, time, os, sys, threading
 import numpy as np
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from cerebrino import compile_expr, safe_eval_expr, sample_curve, curve_ylim, FUNCS, DerivGame, PointGame
+from cerebrino import perf
+from cerebrino.calc import IncrementalCalc, CalcTape
+from cerebrino.bank import QuestionBank, build_bank, save_bank, default_path as default_bank_path
+from cerebrino.store import ProgressStore
+from cerebrino.replay import Recorder
+from cerebrino.tiles import TileCache
+# matplotlib se importa al construir el primer gráfico (ver PlotSurface)
 
 # -------- (opcional) Pillow para la imagen de Borre --------
 try:
@@ -52,48 +68,55 @@ F_P   = (FONT_FAMILY, 12)
 F_SM  = (FONT_FAMILY, 10, "italic")
 
 # ==========================
-#    EVALUADOR SEGURO AST
+#   EVALUACIÓN EN SEGUNDO PLANO
 # ==========================
-_ALLOWED_OPS = {
-    ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul,
-    ast.Div: operator.truediv, ast.Pow: operator.pow, ast.USub: operator.neg, ast.Mod: operator.mod,
-}
-_ALLOWED_NAMES = {
-    "pi": math.pi, "e": math.e, "tau": math.tau,
-    "sin": math.sin, "cos": math.cos, "tan": math.tan,
-    "asin": math.asin, "acos": math.acos, "atan": math.atan,
-    "sqrt": math.sqrt, "log": math.log, "log10": math.log10, "exp": math.exp, "abs": abs,
-    "np": np, "arcsin": np.arcsin, "arccos": np.arccos, "arctan": np.arctan,
-}
-def safe_eval_expr(expr: str, x_value=None):
-    expr = (expr or "").strip().lower().replace("^", "**")
-    node = ast.parse(expr, mode="eval")
-    def _eval(n):
-        if isinstance(n, ast.Expression): return _eval(n.body)
-        if isinstance(n, ast.Constant):
-            if isinstance(n.value, (int,float)): return n.value
-            raise ValueError("Constante no numérica")
-        if isinstance(n, ast.Num): return n.n
-        if isinstance(n, ast.BinOp) and type(n.op) in _ALLOWED_OPS:
-            return _ALLOWED_OPS[type(n.op)](_eval(n.left), _eval(n.right))
-        if isinstance(n, ast.UnaryOp) and type(n.op) in _ALLOWED_OPS: return _ALLOWED_OPS[type(n.op)](_eval(n.operand))
-        if isinstance(n, ast.Name):
-            if n.id == "x" and x_value is not None: return x_value
-            if n.id in _ALLOWED_NAMES: return _ALLOWED_NAMES[n.id]
-            raise ValueError(f"Nombre no permitido: {n.id}")
-        if isinstance(n, ast.Call) and isinstance(n.func, ast.Name):
-            fname = n.func.id
-            if fname in _ALLOWED_NAMES: return _ALLOWED_NAMES[fname](*[_eval(a) for a in n.args])
-            raise ValueError(f"Función no permitida: {fname}")
-        raise ValueError("Expresión no permitida")
-    return _eval(node)
+class BackgroundEval:
+    """Evalúa expresiones fuera del hilo de Tk con un tiempo máximo.
+
+    El resultado vuelve por `on_done(res)` / `on_error(exc)` en el hilo de Tk.
+    Un `submit` o `cancel` nuevo descarta el pedido pendiente."""
+    _pool = None
+
+    def __init__(self, widget, timeout_ms=1000):
+        self.widget = widget
+        self.timeout_ms = timeout_ms
+        self._token = None
+
+    def submit(self, expr, on_done, on_error):
+        if BackgroundEval._pool is None:
+            from concurrent.futures import ThreadPoolExecutor
+            BackgroundEval._pool = ThreadPoolExecutor(max_workers=2)
+        token = self._token = object()
+        fut = BackgroundEval._pool.submit(safe_eval_expr, expr)
+        deadline = time.perf_counter() + self.timeout_ms / 1000
+        def poll():
+            if token is not self._token: return
+            if fut.done():
+                self._token = None
+                err = fut.exception()
+                on_error(err) if err else on_done(fut.result())
+            elif time.perf_counter() > deadline:
+                self._token = None; on_error(TimeoutError("Tiempo agotado"))
+            else:
+                self.widget.after(15, poll)
+        poll()
+
+    @property
+    def pending(self):
+        return self._token is not None
+
+    def cancel(self):
+        self._token = None
 
 # ==========================
 #         APP ROOT
 # ==========================
 class App(tk.Tk):
-    def __init__(self):
+    def __init__(self, prewarm=True, reduced_motion=False, seed=None):
         super().__init__()
+        # Movimiento reducido / bajo consumo: sin fundidos ni Borre saltando
+        self.reduced_motion = reduced_motion
+        self._fade_token = None
         self.title("Cerebrino HD+")
         self.configure(bg=COL_BG_DARK)
         self.resizable(True, True)
@@ -103,6 +126,10 @@ class App(tk.Tk):
         # Atajos globales
         self.bind("<F11>", self._toggle_fullscreen)
         self.bind("<Escape>", lambda e: self._exit())
+        # Cerrar con la ventana también pasa por _exit (cierra el registro y guarda la traza)
+        self.protocol("WM_DELETE_WINDOW", self._exit)
+        self.bind_all("<F3>", self._toggle_hud)
+        self.bind_all("<F4>", self._export_perf)
 
         # ttk theme
         style = ttk.Style(self)
@@ -116,14 +143,31 @@ class App(tk.Tk):
         self.container.grid_rowconfigure(0, weight=1)
         self.container.grid_columnconfigure(0, weight=1)
 
-        self.frames = {}
-        for F in (MenuFrame, CalculatorFrame, GrapherFrame, DerivandoFrame):
-            frame = F(self.container, self)
-            self.frames[F] = frame
-            frame.grid(row=0, column=0, sticky="nsew")
+        self.animator = AnimationManager(self)
+        self.animator.paused = reduced_motion
+
+        # Progreso: jugador actual y una sesión por juego (se crean al primer evento)
+        try: self.store = ProgressStore()
+        except Exception: self.store = None
+        self.player = None
+        self._sessions = {}
+        # Cada sesión tiene su semilla (fija con --semilla) y graba sus entradas
+        self.seed = seed
+        self.recorder = Recorder(seed)
 
+        # Las pantallas se construyen al primer uso; el menú aparece enseguida
+        self.frames = {}
         self.current = None
+        # Un solo gráfico y un solo Borre para todas las pantallas (ver on_show)
+        self._surface = None
+        self._borre = None
+        self._hud = None
+        self._hud_after = self._tick_after = None
+        self._frame_ms = None
         self.show_frame(MenuFrame, animate=False)
+        if prewarm:
+            self._prewarm_queue = [CalculatorFrame, GrapherFrame, DerivandoFrame]
+            self.after(400, self._prewarm)
 
     def _toggle_fullscreen(self, *_):
         fs = self.attributes("-fullscreen")
@@ -131,26 +175,201 @@ class App(tk.Tk):
 
     def _exit(self):
         if mb.askokcancel("Salir", "¿Seguro que quieres salir?"):
+            if self._hud is not None: self._toggle_hud()
+            self._end_sessions(); self._save_trace()
+            if self.store is not None: self.store.close()
             self.destroy()
 
-    def _fade(self, start, end, steps=8, delay=12):
-        delta = (end - start) / max(1, steps)
-        val = start
-        for _ in range(steps):
-            val += delta
+    # -------- progreso
+    def set_player(self, name):
+        """Cambia de jugador y deja que cada pantalla reanude su estado."""
+        name = name.strip()
+        if not name or name == self.player: return
+        self._end_sessions(); self._save_trace()
+        self.player = name
+        self.recorder = Recorder(self.seed, player=name)
+        for frame in self.frames.values():
+            if hasattr(frame, "on_player"): frame.on_player(name)
+
+    def session(self, game):
+        if self.store is None or self.player is None: return None
+        sid = self._sessions.get(game)
+        if sid is None: sid = self._sessions[game] = self.store.start_session(self.player, game)
+        return sid
+
+    def last_state(self, game):
+        if self.store is None or self.player is None: return None
+        return self.store.last_state(self.player, game)
+
+    def log(self, game, kind, **data):
+        """Encola un evento; nunca espera al disco."""
+        sid = self.session(game)
+        if sid is not None: self.store.log(sid, kind, **data)
+
+    def _end_sessions(self):
+        for sid in self._sessions.values(): self.store.end_session(sid)
+        self._sessions = {}
+
+    # -------- sesiones reproducibles
+    def rng(self, stream):
+        """Generador de un juego para la sesión actual."""
+        return self.recorder.rng(stream)
+
+    def rec(self, code, *args):
+        self.recorder.record(code, *args)
+
+    def _save_trace(self):
+        if not len(self.recorder): return
+        try: self.recorder.save()
+        except OSError: pass
+
+    # -------- rendimiento (F3 / F4)
+    def _toggle_hud(self, *_):
+        """Muestra u oculta el panel; mientras está visible la medición queda encendida."""
+        if self._hud is not None:
+            for a in (self._hud_after, self._tick_after):
+                if a: self.after_cancel(a)
+            self._hud.destroy(); self._hud = self._hud_after = self._tick_after = None
+            perf.enable(self._perf_was_on)
+            return
+        self._perf_was_on = perf.enabled
+        perf.enable(True)
+        self._hud = tk.Label(self, font=("Consolas", 11), justify="left", anchor="nw",
+                             bg="#000000", fg="#7CFC00", padx=8, pady=6)
+        self._hud.place(relx=1.0, rely=0.0, anchor="ne")
+        self._frame_ms = None
+        self._tick(time.perf_counter())
+        self._hud_refresh()
+
+    def _tick(self, last):
+        # Un `after(16)` que mide cuánto tardó de verdad: si el loop está ocupado, se nota
+        now = time.perf_counter()
+        perf.record("cuadro", now - last, last)
+        self._tick_after = self.after(16, self._tick, now)
+
+    def _hud_refresh(self):
+        def ms(name):
+            h = perf.last(name)
+            return f"{h['p50_ms']:6.2f} / {h['p95_ms']:6.2f} ms  ({h['n']})" if h else "     —"
+        pending = len(self.tk.splitlist(self.tk.call("after", "info")))
+        self._hud.config(text=(f"cuadro    {ms('cuadro')}\n"
+                               f"eval      {ms('eval')}\n"
+                               f"muestreo  {ms('muestreo')}\n"
+                               f"dibujo    {ms('dibujo')}\n"
+                               f"blit      {ms('blit')}\n"
+                               f"pantalla  {ms('pantalla')}\n"
+                               f"pendientes Tk  {pending}\n"
+                               f"p50 / p95  ·  F4 exporta"))
+        self._hud.lift()
+        self._hud_after = self.after(250, self._hud_refresh)
+
+    def _export_perf(self, *_):
+        folder = os.path.join(os.path.expanduser("~"), ".cerebrino")
+        base = os.path.join(folder, time.strftime("perf-%Y%m%d-%H%M%S"))
+        try:
+            os.makedirs(folder, exist_ok=True)
+            perf.export(base + ".json"); perf.export(base + ".csv")
+        except OSError as e:
+            mb.showerror("Rendimiento", f"No se pudo exportar la traza:\n{e}"); return
+        mb.showinfo("Rendimiento", f"Traza guardada en:\n{base}.json\n{base}.csv")
+
+    def _fade(self, start, end, steps=8, delay=12, then=None):
+        """Anima el alfa con `after`; no bloquea el loop y una navegación nueva la interrumpe."""
+        token = self._fade_token = object()
+        def step(i):
+            if token is not self._fade_token: return
+            if i >= steps:
+                self.attributes('-alpha', end)
+                if then: then()
+                return
+            val = start + (end - start) * (i + 1) / max(1, steps)
             self.attributes('-alpha', max(0.75, min(1.0, val)))
-            self.update_idletasks(); self.after(delay)
-        self.attributes('-alpha', end)
+            self.after(delay, step, i + 1)
+        step(0)
+
+    def _get_frame(self, cont):
+        frame = self.frames.get(cont)
+        if frame is None:
+            with perf.span("construir"): frame = self.frames[cont] = cont(self.container, self)
+            frame.grid(row=0, column=0, sticky="nsew")
+            if self.player and hasattr(frame, "on_player"): frame.on_player(self.player)
+        return frame
+
+    def plot_surface(self):
+        if self._surface is None: self._surface = PlotSurface(self.container)
+        return self._surface
+
+    def borre_panel(self, owner):
+        """El panel de Borre compartido; su animación corre mientras `owner` esté visible."""
+        if self._borre is None: self._borre = BigBorrePanel(self.container)
+        self.animator.register(owner, self._borre._animate)
+        return self._borre
+
+    def _raise(self, frame):
+        # Los widgets compartidos son hermanos de las pantallas: la que sube los reclama
+        frame.tkraise()
+        if hasattr(frame, "on_show"): frame.on_show()
+
+    def _prewarm(self):
+        """Construye en segundo plano (una pantalla por turno) las que falten."""
+        while self._prewarm_queue and self._prewarm_queue[0] in self.frames:
+            self._prewarm_queue.pop(0)
+        if not self._prewarm_queue: return
+        self._get_frame(self._prewarm_queue.pop(0))
+        if self.current is not None: self._raise(self.current)  # la nueva quedó encima
+        self.after(150, self._prewarm)
 
     def show_frame(self, cont, animate=True):
-        frame = self.frames[cont]
-        if animate and self.current is not None and self.current is not frame:
-            self._fade(1.0, 0.88, steps=6, delay=10)
-            frame.tkraise()
-            self._fade(0.88, 1.0, steps=6, delay=10)
+        with perf.span("pantalla"): self._show_frame(cont, animate)
+
+    def _show_frame(self, cont, animate):
+        frame = self._get_frame(cont)
+        self._fade_token = None     # interrumpe la transición en curso, si la hay
+        if animate and not self.reduced_motion and self.current is not None and self.current is not frame:
+            def swap():
+                self._raise(frame)
+                self._fade(0.88, 1.0, steps=6, delay=10)
+            self._fade(1.0, 0.88, steps=6, delay=10, then=swap)
         else:
-            frame.tkraise()
+            self.attributes('-alpha', 1.0)
+            self._raise(frame)
         self.current = frame
+        self.animator.set_visible(frame)
+
+# ==========================
+#   ANIMACIONES (tick compartido)
+# ==========================
+class AnimationManager:
+    """Un solo `after` para todos los widgets animados de la pantalla visible.
+
+    Las pantallas ocultas no reciben ticks; si la visible no tiene nada
+    animado, el tick se detiene por completo hasta el próximo `show_frame`."""
+    def __init__(self, root, interval=80):
+        self.root = root
+        self.interval = interval
+        self._owners = {}      # pantalla → [callbacks]
+        self._visible = None
+        self._after = None
+        self.paused = False
+
+    def register(self, owner, callback):
+        self._owners.setdefault(owner, []).append(callback)
+        self._kick()
+
+    def set_visible(self, owner):
+        self._visible = owner
+        self._kick()
+
+    def _kick(self):
+        if self._after is None and not self.paused and self._owners.get(self._visible):
+            self._after = self.root.after(self.interval, self._tick)
+
+    def _tick(self):
+        self._after = None
+        callbacks = self._owners.get(self._visible)
+        if not callbacks or self.paused: return
+        for cb in callbacks: cb()
+        self._after = self.root.after(self.interval, self._tick)
 
 # ==========================
 #       MENU PRINCIPAL
@@ -184,6 +403,54 @@ class MenuFrame(tk.Frame):
         mk_btn("🐶 Derivando con Borre", COL_ACCENT_1, lambda: controller.show_frame(DerivandoFrame)).grid(row=1, column=0, padx=14, pady=14)
         mk_btn("🚪 Salir", COL_ACCENT_3, controller._exit).grid(row=1, column=1, padx=14, pady=14)
 
+        # Jugador: el progreso se guarda por nombre y se reanuda al volver
+        who = tk.Frame(self, bg=COL_BG_DARK); who.pack(pady=(18, 0))
+        tk.Label(who, text="¿Quién juega?", font=F_H3, fg=COL_TEXT_MAIN, bg=COL_BG_DARK).pack(side="left", padx=(0, 8))
+        self.var_player = tk.StringVar()
+        ent = tk.Entry(who, textvariable=self.var_player, font=F_P, width=16, bg=COL_BG_CARD, fg=COL_TEXT_MAIN,
+                       insertbackground=COL_TEXT_MAIN, relief="flat", highlightthickness=2, highlightbackground=COL_BORDER)
+        ent.pack(side="left", ipady=4)
+        ent.bind("<Return>", lambda e: (self._enter(), "break")[1])   # que no llegue a la calculadora
+        tk.Button(who, text="Entrar", font=F_P, bg=COL_ACCENT_2, fg="#102a43", bd=0, padx=12, pady=4,
+                  command=self._enter).pack(side="left", padx=8)
+        tk.Button(who, text="📄 Reporte", font=F_P, bg=COL_BG_CARD, fg=COL_TEXT_MAIN, bd=0, padx=12, pady=4,
+                  command=self._report).pack(side="left")
+        self.lbl_history = tk.Label(self, text="", font=F_SM, fg=COL_TEXT_MUTED, bg=COL_BG_DARK)
+        self.lbl_history.pack(pady=(6, 0))
+        # El último jugador se busca después de pintar el menú
+        if controller.store is not None: self.after_idle(self._resume_last)
+
+    def _resume_last(self):
+        players = self.controller.store.players()
+        if players and not self.var_player.get():
+            self.var_player.set(players[0]); self._enter()
+
+    def _enter(self):
+        self.controller.set_player(self.var_player.get())
+        self._show_history()
+
+    def _show_history(self):
+        store, player = self.controller.store, self.controller.player
+        if store is None or player is None: return
+        hist = store.history(player)
+        answers = sum(h["answers"] for h in hist); correct = sum(h["correct"] for h in hist)
+        self.lbl_history.config(text=f"Hola, {player}: {len(hist)} sesiones · {correct}/{answers} aciertos")
+
+    def _report(self):
+        store, player = self.controller.store, self.controller.player
+        hist = store.history(player) if store is not None and player else []
+        if not hist:
+            mb.showinfo("Reporte", "Todavía no hay sesiones guardadas para este jugador."); return
+        folder = os.path.join(os.path.dirname(store.path), "reportes")
+        name = "".join(c if c.isalnum() else "_" for c in player)[:40]
+        path = os.path.join(folder, f"{name}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+        try:
+            os.makedirs(folder, exist_ok=True)
+            store.write_report(hist[0]["session"], path)
+        except OSError as e:
+            mb.showerror("Reporte", f"No se pudo guardar el reporte:\n{e}"); return
+        mb.showinfo("Reporte", f"Reporte de la última sesión guardado en:\n{path}")
+
 # ==========================
 #        CALCULADORA
 # ==========================
@@ -192,6 +459,11 @@ class CalculatorFrame(tk.Frame):
         super().__init__(parent, bg=COL_BG_DARK)
         self.controller = controller
         self.expression = ""
+        self._evaluator = BackgroundEval(self)
+        # Vista previa: incremental por tecla; lo que no modela va al evaluador, con tope corto
+        self.calc = IncrementalCalc()
+        self.tape = CalcTape()
+        self._preview_eval = BackgroundEval(self, timeout_ms=300)
         self._build()
 
     def _build(self):
@@ -204,9 +476,22 @@ class CalculatorFrame(tk.Frame):
         display.pack(fill="both", expand=True, padx=12, pady=(0, 10))
         self.lbl = tk.Label(display, text="", font=(FONT_FAMILY, 40, "bold"), fg=COL_TEXT_MAIN, bg=COL_BG_CARD, anchor="e", padx=16)
         self.lbl.pack(fill="both", expand=True)
-
-        grid = tk.Frame(self, bg=COL_BG_DARK)
-        grid.pack(fill="both", expand=True, padx=12, pady=12)
+        self.lbl_preview = tk.Label(display, text="", font=(FONT_FAMILY, 20), fg=COL_TEXT_MUTED, bg=COL_BG_CARD, anchor="e", padx=16)
+        self.lbl_preview.pack(fill="x", pady=(0, 8))
+
+        keys = tk.Frame(self, bg=COL_BG_DARK)
+        keys.pack(fill="both", expand=True, padx=12, pady=12)
+        # Cinta: cuentas hechas; al tocar una vuelve su resultado (memorizado, sin recalcular)
+        tape = tk.Frame(keys, bg=COL_BG_CARD, padx=8, pady=8, highlightthickness=2, highlightbackground=COL_BORDER)
+        tape.pack(side="right", fill="y", padx=(12, 0))
+        tk.Label(tape, text="🧾 Cinta", font=F_H3, bg=COL_BG_CARD, fg=COL_TEXT_MAIN).pack(anchor="w")
+        self.lst_tape = tk.Listbox(tape, font=F_P, bg=COL_BG_CARD, fg=COL_TEXT_MAIN, bd=0, highlightthickness=0,
+                                   selectbackground=COL_ACCENT_2, activestyle="none", width=22, exportselection=False)
+        self.lst_tape.pack(fill="both", expand=True, pady=(6, 0))
+        self.lst_tape.bind("<<ListboxSelect>>", self._recall)
+
+        grid = tk.Frame(keys, bg=COL_BG_DARK)
+        grid.pack(side="left", fill="both", expand=True)
         for i in range(5): grid.grid_rowconfigure(i, weight=1)
         for i in range(4): grid.grid_columnconfigure(i, weight=1)
 
@@ -232,22 +517,65 @@ class CalculatorFrame(tk.Frame):
         self.bind_all("<Escape>", lambda e: self.controller._exit())
 
     def _press(self, val):
+        self._evaluator.cancel()   # cualquier tecla descarta un cálculo pendiente
         if val == 'C':
             self.expression = ""
             self.lbl.config(highlightbackground=COL_BORDER)
         elif val == 'del':
             self.expression = self.expression[:-1]
         elif val == '=':
-            try:
-                res = safe_eval_expr(self.expression)
-                self.expression = str(res)
-                self.lbl.config(highlightbackground=COL_BORDER)
-            except Exception:
-                self.lbl.config(highlightbackground=COL_ACCENT_3)
+            self._equals()
+            return
         else:
             self.expression += str(val)
         self._update()
 
+    def _equals(self):
+        expr = self.expression
+        if not expr: return
+        # Cuenta ya hecha: sale de la cinta. Si no, el estado incremental ya la tiene
+        # resuelta; solo lo que no modela pasa por el evaluador completo.
+        hit = self.tape.get(expr)
+        if hit is not None:
+            ok, res = hit
+            self._on_result(res) if ok else self._on_error(res)
+            return
+        if self.calc.complete:
+            try: res = self.calc.result()
+            except ArithmeticError as err:
+                self.tape.add(expr, err, ok=False); self._on_error(err); return
+            self._remember(expr, res); self._on_result(res)
+            return
+        def done(res):
+            self._remember(expr, res); self._on_result(res)
+        def failed(err):
+            if not isinstance(err, TimeoutError): self.tape.add(expr, err, ok=False)
+            self._on_error(err)
+        self._evaluator.submit(expr, done, failed)
+
+    def _remember(self, expr, res):
+        self.tape.add(expr, res)
+        self.lst_tape.delete(0, tk.END)
+        for e, r in self.tape.entries(): self.lst_tape.insert(tk.END, f"{e} = {r}")
+
+    def _recall(self, event):
+        sel = self.lst_tape.curselection()
+        if not sel: return
+        entries = self.tape.entries()
+        self.lst_tape.selection_clear(0, tk.END)
+        if sel[0] < len(entries):
+            self._evaluator.cancel()
+            self._on_result(entries[sel[0]][1])
+
+    def _on_result(self, res):
+        self.expression = str(res)
+        self.lbl.config(highlightbackground=COL_BORDER)
+        self._update()
+
+    def _on_error(self, err):
+        self.lbl.config(highlightbackground=COL_ACCENT_3)
+        self.lbl_preview.config(text="Error")
+
     def _update(self):
         txt = self.expression or ""
         size = 40
@@ -255,12 +583,113 @@ class CalculatorFrame(tk.Frame):
         if len(txt)>16: size=28
         if len(txt)>20: size=24
         self.lbl.config(text=txt[:24], font=(FONT_FAMILY,size,"bold"))
+        self._update_preview()
+
+    def _update_preview(self):
+        """Resultado parcial a cada tecla; nunca espera en el hilo de Tk."""
+        self._preview_eval.cancel()
+        expr = self.expression
+        self.calc.set(expr)                 # solo procesa lo que cambió desde la última tecla
+        hit = self.tape.get(expr) if expr else None
+        if hit is not None:
+            self._show_preview(hit[1] if hit[0] else None)
+        elif not self.calc.fallback:
+            self._show_preview(None if self.calc.error else self.calc.preview())
+        else:
+            self._preview_eval.submit(expr, self._show_preview, lambda err: self._show_preview(None))
+
+    def _show_preview(self, res):
+        text = "" if res is None or str(res) == self.expression else f"= {res}"
+        self.lbl_preview.config(text=text[:28])
+
+# ==========================
+#   SPRITES DE BORRE (cache compartido)
+# ==========================
+class SpriteCache:
+    """Imagen de Borre decodificada una sola vez y servida por cubetas de tamaño.
+
+    Cada cubeta es un nivel de la pirámide (factor 1.25 entre niveles) que se
+    genera al primer uso a partir del nivel mayor más cercano. Los paneles
+    muestran primero la cubeta y luego piden la versión exacta en un hilo."""
+    STEP = 1.25
+    PATHS = ["borre.png", "/mnt/data/e8e2cb69-dbce-45aa-b57e-e71d249bc84f.png"]
+
+    def __init__(self):
+        self._original = None
+        self._loaded = False
+        self._levels = {}          # k → imagen PIL a escala STEP**-k
+        self._photos = {}          # k → PhotoImage
+        self._exact = {}           # (w, h) → PhotoImage exacto
+        self._pool = None
+
+    def original(self):
+        if not self._loaded:
+            self._loaded = True
+            if PIL_AVAILABLE:
+                for p in self.PATHS:
+                    try:
+                        self._original = Image.open(p).convert("RGBA")
+                        break
+                    except Exception:
+                        pass
+        return self._original
+
+    def _bucket(self, max_w, max_h):
+        w, h = self._original.size
+        fit = min(max_w / w, max_h / h, 1.0)
+        return max(0, math.ceil(math.log(1 / fit, self.STEP) - 1e-9))
+
+    def _level(self, k):
+        if k == 0: return self._original
+        if k not in self._levels:
+            base = max((j for j in self._levels if j < k), default=None)
+            src = self._levels[base] if base is not None else self._original
+            w, h = self._original.size; s = self.STEP ** -k
+            self._levels[k] = src.resize((max(1, round(w*s)), max(1, round(h*s))), Image.LANCZOS)
+        return self._levels[k]
+
+    def nearest(self, max_w, max_h):
+        """PhotoImage de la cubeta que cabe en (max_w, max_h); inmediato si ya existe."""
+        exact = self._exact.get((max_w, max_h))
+        if exact is not None: return exact
+        k = self._bucket(max_w, max_h)
+        if k not in self._photos: self._photos[k] = ImageTk.PhotoImage(self._level(k))
+        return self._photos[k]
+
+    def exact(self, max_w, max_h):
+        return self._exact.get((max_w, max_h))
+
+    def exact_async(self, max_w, max_h):
+        """Future con la imagen PIL exacta (LANCZOS), calculada fuera del hilo de Tk.
+
+        La pirámide solo se toca desde el hilo de Tk: el nivel de partida se
+        arma (o se toma del cache) acá y el hilo recibe la imagen ya lista."""
+        if self._pool is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self._pool = ThreadPoolExecutor(max_workers=1)
+        src = self._level(max(0, self._bucket(max_w, max_h) - 1))
+        def work():
+            img = src.copy()
+            img.thumbnail((max_w, max_h), Image.LANCZOS)
+            return img
+        return self._pool.submit(work)
+
+    def store_exact(self, max_w, max_h, img):
+        if len(self._exact) >= 4: self._exact.pop(next(iter(self._exact)))
+        photo = self._exact[(max_w, max_h)] = ImageTk.PhotoImage(img)
+        return photo
+
+BORRE_SPRITES = SpriteCache()
 
 # ==========================
 #   WIDGET: Panel lateral grande de Borre
 # ==========================
 class BigBorrePanel:
-    """Panel con Borre grande, escalado automático y mensajes."""
+    """Panel con Borre grande, escalado automático y mensajes.
+
+    Hay uno solo para toda la app (`App.borre_panel`): cada pantalla le
+    reserva un hueco y lo toma con `show` al subir. La animación la mueve el
+    AnimationManager solo mientras alguna de esas pantallas es la visible."""
     def __init__(self, parent):
         self.frame = tk.Frame(parent, bg=COL_BG_CARD, padx=14, pady=14,
                               highlightthickness=2, highlightbackground=COL_BORDER)
@@ -275,59 +704,237 @@ class BigBorrePanel:
                             font=F_P, bg=COL_BG_CARD, fg=COL_TEXT_MUTED, wraplength=360, justify="center")
         self.msg.pack(pady=(10,0))
 
-        # Carga imagen original (si existe) y guarda para reescalar
-        self._pil_original = None
+        # La imagen la decodifica (una vez) el cache compartido de sprites
+        self._sprites = BORRE_SPRITES
         self._imgtk = None
         self._item = None
         self._phase = 0.0
+        self._x_center = 0
         self._y_center = 0
+        self._dy = None
+        self._flash_after = None
+        self._refine_after = None
+        self._size = None
 
-        if PIL_AVAILABLE:
-            for p in ["borre.png", "/mnt/data/e8e2cb69-dbce-45aa-b57e-e71d249bc84f.png"]:
-                try:
-                    self._pil_original = Image.open(p).convert("RGBA")
-                    break
-                except Exception:
-                    pass
-
-        if self._pil_original is None:
+        if self._sprites.original() is None:
             self._item = None
             self._ascii = [" (\\_/)", " ( •_•)", " / > 🦴 "]
         else:
             self._item = self.canvas.create_image(0, 0, anchor="center")
 
         self.canvas.bind("<Configure>", self._on_resize)
-        self._animate()
+
+    def show(self, slot):
+        """Se muestra dentro de `slot` (un hueco de la pantalla visible)."""
+        self.frame.pack(in_=slot, fill="both", expand=True)
+        self.frame.lift()
 
     def _on_resize(self, event):
+        with perf.span("borre_resize"): self._resize(event)
+
+    def _resize(self, event):
         w, h = max(100, event.width), max(140, event.height)
-        self._y_center = h // 2
-        if self._pil_original is None:
+        self._x_center, self._y_center = w // 2, h // 2
+        self._dy = None
+        if self._sprites.original() is None:
             self.canvas.delete("all")
             y0 = self._y_center - 36
             for i, line in enumerate(self._ascii):
                 self.canvas.create_text(w//2, y0 + i*22, text=line, fill=COL_TEXT_MAIN, font=(FONT_FAMILY, 18))
             return
 
-        max_w = int(w * 0.9); max_h = int(h * 0.9)
-        img = self._pil_original.copy()
-        img.thumbnail((max_w, max_h), Image.LANCZOS)
-        self._imgtk = ImageTk.PhotoImage(img)
-        self.canvas.delete("all")
-        self._item = self.canvas.create_image(w//2, self._y_center, image=self._imgtk)
+        # Se muestra ya la cubeta más cercana; la versión exacta llega cuando el resize se calma
+        self._size = (int(w * 0.9), int(h * 0.9))
+        self._show(self._sprites.nearest(*self._size))
+        if self._refine_after: self.canvas.after_cancel(self._refine_after)
+        self._refine_after = self.canvas.after(150, self._refine)
+
+    def _show(self, photo):
+        self._imgtk = photo
+        self.canvas.itemconfigure(self._item, image=photo)
+        self.canvas.coords(self._item, self._x_center, self._y_center)
+
+    def _refine(self):
+        self._refine_after = None
+        size = self._size
+        if self._sprites.exact(*size) is not None: return
+        fut = self._sprites.exact_async(*size)
+        def poll():
+            if size != self._size: return            # hubo otro resize: se descarta
+            if not fut.done(): self.canvas.after(30, poll); return
+            self._show(self._sprites.store_exact(*size, fut.result()))
+        poll()
 
     def _animate(self):
+        perf.count("borre_ticks")
         self._phase += 0.15
-        dy = int(8*np.sin(self._phase))
-        if self._item is not None:
-            coords = self.canvas.coords(self._item)
-            if coords:
-                self.canvas.coords(self._item, coords[0], self._y_center + dy)
-        self.canvas.after(80, self._animate)
+        dy = int(8*math.sin(self._phase))
+        # En las crestas el desplazamiento se repite: no se toca el canvas
+        if dy == self._dy or self._item is None or not self._x_center: return
+        self._dy = dy
+        self.canvas.coords(self._item, self._x_center, self._y_center + dy)
 
     def flash(self, text, good=True):
         self.msg.config(text=text, fg=(COL_ACCENT_4 if good else COL_ACCENT_3))
-        self.frame.after(1200, lambda: self.msg.config(text="¡Listo para aprender! 🐾", fg=COL_TEXT_MUTED))
+        # Un solo temporizador pendiente: un flash nuevo reemplaza al anterior
+        if self._flash_after: self.frame.after_cancel(self._flash_after)
+        self._flash_after = self.frame.after(1200, self._flash_reset)
+
+    def _flash_reset(self):
+        self._flash_after = None
+        self.msg.config(text="¡Listo para aprender! 🐾", fg=COL_TEXT_MUTED)
+
+# ==========================
+#   WIDGET: Lienzo de gráfico con artistas persistentes
+# ==========================
+class PlotSurface:
+    """La única Figure + FigureCanvasTkAgg de la app (un solo buffer Agg).
+
+    Cada pantalla con gráfico tiene su PlotCanvas (ejes y artistas propios)
+    sobre esta figura; solo los ejes de la vista activa están visibles y el
+    widget se empaqueta dentro del hueco de la pantalla que lo muestra."""
+    def __init__(self, master):
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        self.fig = Figure(figsize=(9.6, 7.2), dpi=100, facecolor=COL_BG_CARD)
+        self.canvas = FigureCanvasTkAgg(self.fig, master=master)
+        self.widget = self.canvas.get_tk_widget()
+        self.active = None
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+
+    def show(self, view, slot):
+        """Activa los ejes de `view` y pone el widget en `slot`."""
+        if self.active is not view:
+            if self.active is not None: self.active.ax.set_visible(False)
+            view.ax.set_visible(True); view.invalidate()
+            self.active = view
+        self.widget.pack(in_=slot, fill="both", expand=True)
+        self.widget.lift()
+        view.refresh()
+
+    def _on_draw(self, event):
+        if self.active is not None: self.active._on_draw(event)
+
+class PlotCanvas:
+    """Ejes con la decoración fija dibujada una vez y blitting de los artistas animados.
+
+    Los cambios de datos con los mismos límites solo redibujan los artistas
+    animados sobre el fondo cacheado; cambiar límites (o `invalidate()`)
+    hace el redibujado completo. Mientras la vista no es la activa de la
+    superficie compartida solo se anotan los límites: dibuja al mostrarse."""
+    def __init__(self, surface):
+        self.surface = surface
+        self.fig, self.canvas, self.widget = surface.fig, surface.canvas, surface.widget
+        self.ax = self.fig.add_subplot(111, label=f"vista{len(self.fig.axes)}")
+        self.ax.set_visible(False)
+        self._animated = []
+        self._bg = None
+        self._lims = None
+        self._dirty = True
+        self._decorate()
+
+    @property
+    def active(self):
+        return self.surface.active is self
+
+    def show(self, slot):
+        self.surface.show(self, slot)
+
+    def _decorate(self):
+        ax = self.ax
+        ax.set_facecolor("#1b2043")
+        for side in ('top','right'): ax.spines[side].set_visible(False)
+        ax.spines['left'].set_color(COL_PLOT_AXES)
+        ax.spines['bottom'].set_color(COL_PLOT_AXES)
+        ax.tick_params(axis='x', colors=COL_PLOT_AXES)
+        ax.tick_params(axis='y', colors=COL_PLOT_AXES)
+        ax.axhline(0, color=COL_PLOT_AXES, linewidth=1.5)
+        ax.axvline(0, color=COL_PLOT_AXES, linewidth=1.5)
+        self.set_grid(True)
+
+    def set_grid(self, on):
+        if on: self.ax.grid(True, linestyle='--', color=COL_PLOT_GRID, alpha=0.25)
+        else: self.ax.grid(False)
+        self.invalidate()
+
+    def line(self, animated=False, **kw):
+        ln, = self.ax.plot([], [], animated=animated, **kw)
+        if animated: self._animated.append(ln)
+        return ln
+
+    def scatter(self, animated=False, **kw):
+        sc = self.ax.scatter([], [], animated=animated, **kw)
+        if animated: self._animated.append(sc)
+        return sc
+
+    def invalidate(self):
+        self._dirty = True
+
+    def update(self, xlim, ylim):
+        lims = (tuple(xlim), tuple(ylim))
+        if not self.active:
+            self.ax.set_xlim(*xlim); self.ax.set_ylim(*ylim)
+            self._lims = lims; self._dirty = True
+            return
+        if self._dirty or self._bg is None or lims != self._lims:
+            self.ax.set_xlim(*xlim); self.ax.set_ylim(*ylim)
+            self._lims = lims; self._dirty = False
+            with perf.span("dibujo"): self.canvas.draw()
+        else:
+            with perf.span("blit"):
+                self.canvas.restore_region(self._bg)
+                self._draw_animated()
+                self.canvas.blit(self.fig.bbox)
+
+    def refresh(self):
+        """Redibuja con los límites actuales (blit si nada estático cambió)."""
+        if self._lims is None:
+            if self.active:
+                with perf.span("dibujo"): self.canvas.draw()
+        else: self.update(*self._lims)
+
+    def _on_draw(self, event):
+        # Cada redibujado completo (incluido el de un resize) renueva el fondo
+        self._bg = self.canvas.copy_from_bbox(self.fig.bbox)
+        self._draw_animated()
+
+    def _draw_animated(self):
+        for a in self._animated: self.ax.draw_artist(a)
+
+# ==========================
+#   PLANIFICADOR DE REDIBUJADO
+# ==========================
+class RenderScheduler:
+    """Agrupa los pedidos de redibujado de los sliders sobre el loop de Tk.
+
+    Como mucho un render por cuadro y siempre con el estado más reciente.
+    Mientras se arrastra se puede pedir un `preview` barato; un pedido de
+    calidad completa (p. ej. al soltar el slider) gana sobre el preview."""
+    def __init__(self, widget, render, fps=60):
+        self.widget = widget
+        self.render = render          # render(preview: bool)
+        self.frame_ms = max(1, int(1000 / fps))
+        self._after = None
+        self._preview = True
+        self._last = 0.0
+
+    def request(self, preview=False):
+        self._preview = self._preview and preview if self._after else preview
+        if self._after: return
+        wait = self.frame_ms - (time.perf_counter() - self._last) * 1000
+        self._after = self.widget.after(max(0, int(wait)), self._run)
+
+    def _run(self):
+        self._after = None
+        self._last = time.perf_counter()
+        self.render(self._preview)
+
+    def cancel(self):
+        if self._after: self.widget.after_cancel(self._after); self._after = None
+
+    def bind_release(self, *scales):
+        """Al soltar el slider se pide el render de calidad completa."""
+        for sc in scales: sc.bind("<ButtonRelease-1>", lambda e: self.request(preview=False), add="+")
 
 # ==========================
 #         GRAFICADORA
@@ -336,7 +943,11 @@ class GrapherFrame(tk.Frame):
     def __init__(self, parent, controller):
         super().__init__(parent, bg=COL_BG_DARK)
         self.controller = controller
-        self.target = None
+        self.points_game = PointGame(rng=controller.rng("puntos"))
+        # Vista movida con el mouse: (x1, x2) y (y1, y2); None = sliders / y automática
+        self.tiles = TileCache()
+        self._xview = self._yview = None
+        self._pan = self._settle_after = None
         self._build()
 
     def _build(self):
@@ -360,28 +971,50 @@ class GrapherFrame(tk.Frame):
         self.xmin = tk.DoubleVar(value=-10)
         self.xmax = tk.DoubleVar(value=10)
         frx = tk.Frame(panel, bg=COL_BG_CARD); frx.pack(fill="x")
-        ttk.Scale(frx, from_=-20, to=0, variable=self.xmin, command=lambda e: self._sync_ranges()).pack(fill="x", padx=2)
-        ttk.Scale(frx, from_=0, to=20, variable=self.xmax, command=lambda e: self._sync_ranges()).pack(fill="x", padx=2, pady=(4,8))
+        self._sched = RenderScheduler(self, lambda preview: self._plot(preview=preview))
+        sc_min = ttk.Scale(frx, from_=-20, to=0, variable=self.xmin, command=lambda e: self._sync_ranges())
+        sc_min.pack(fill="x", padx=2)
+        sc_max = ttk.Scale(frx, from_=0, to=20, variable=self.xmax, command=lambda e: self._sync_ranges())
+        sc_max.pack(fill="x", padx=2, pady=(4,8))
 
         self.show_grid = tk.BooleanVar(value=True)
-        ttk.Checkbutton(panel, text="Mostrar cuadrícula", variable=self.show_grid, command=self._plot).pack(anchor="w")
+        ttk.Checkbutton(panel, text="Mostrar cuadrícula", variable=self.show_grid, command=self._toggle_grid).pack(anchor="w")
+        tk.Label(panel, text="Rueda: zoom · clic derecho y arrastrar: mover", font=F_SM, bg=COL_BG_CARD, fg=COL_TEXT_MUTED).pack(anchor="w")
+        tk.Button(panel, text="↺ Vista inicial", font=F_P, bg=COL_BG_DARK, fg=COL_TEXT_MAIN, bd=0, padx=8, pady=2,
+                  command=self._reset_view).pack(anchor="w", pady=(2,0))
 
         tk.Label(panel, text="Recta y = m·x + b", font=F_H3, bg=COL_BG_CARD, fg=COL_TEXT_MUTED).pack(anchor="w", pady=(10,0))
         self.m_val = tk.DoubleVar(value=2.0)
         self.b_val = tk.DoubleVar(value=1.0)
-        tk.Scale(panel, from_=-10, to=10, orient="horizontal", resolution=0.1, variable=self.m_val, bg=COL_BG_CARD,
-                 troughcolor=COL_ACCENT_2, highlightthickness=0, command=lambda e: self._from_mb()).pack(fill="x")
-        tk.Scale(panel, from_=-10, to=10, orient="horizontal", resolution=0.1, variable=self.b_val, bg=COL_BG_CARD,
-                 troughcolor=COL_ACCENT_2, highlightthickness=0, command=lambda e: self._from_mb()).pack(fill="x", pady=(0,8))
+        sc_m = tk.Scale(panel, from_=-10, to=10, orient="horizontal", resolution=0.1, variable=self.m_val, bg=COL_BG_CARD,
+                        troughcolor=COL_ACCENT_2, highlightthickness=0, command=lambda e: self._from_mb())
+        sc_m.pack(fill="x")
+        sc_b = tk.Scale(panel, from_=-10, to=10, orient="horizontal", resolution=0.1, variable=self.b_val, bg=COL_BG_CARD,
+                        troughcolor=COL_ACCENT_2, highlightthickness=0, command=lambda e: self._from_mb())
+        sc_b.pack(fill="x", pady=(0,8))
+        self._sched.bind_release(sc_min, sc_max, sc_m, sc_b)
+
+        # Curvas superpuestas: f, la recta m·x+b, f' y las que se agreguen para comparar
+        self.show_line = tk.BooleanVar(value=False)
+        self.show_deriv = tk.BooleanVar(value=False)
+        ttk.Checkbutton(panel, text="Mostrar recta m·x+b", variable=self.show_line, command=self._plot).pack(anchor="w")
+        ttk.Checkbutton(panel, text="Mostrar f'(x)", variable=self.show_deriv, command=self._plot).pack(anchor="w")
+        cmp_row = tk.Frame(panel, bg=COL_BG_CARD); cmp_row.pack(fill="x", pady=(4,0))
+        tk.Button(cmp_row, text="➕ Comparar f", font=F_P, bg=COL_ACCENT_2, fg="#102a43", bd=0, padx=8, pady=4,
+                  command=self._add_compare).pack(side="left", padx=(0,4))
+        tk.Button(cmp_row, text="Quitar", font=F_P, bg=COL_BG_DARK, fg=COL_TEXT_MAIN, bd=0, padx=8, pady=4,
+                  command=self._clear_compare).pack(side="left")
 
         quick = tk.Frame(panel, bg=COL_BG_CARD); quick.pack(fill="x", pady=(6,6))
-        for txt, f in [("Recta","x"),("Parábola","x**2"),("Seno","np.sin(x)")]:
+        for txt, f in [("Recta","x"),("Parábola","x**2"),("Seno","sin(x)")]:
             b = tk.Button(quick, text=txt, font=F_P, bg=COL_ACCENT_2, fg="#102a43", bd=0, padx=10, pady=6,
                           command=lambda s=f: self._set_func(s))
             b.pack(side="left", padx=4)
 
         tk.Button(panel, text="📈 Graficar", font=F_BTN, bg=COL_ACCENT_4, fg="#102a43", bd=0,
                   padx=12, pady=10, command=self._plot).pack(fill="x", pady=(10,6))
+        self.lbl_status = tk.Label(panel, text="", font=F_SM, bg=COL_BG_CARD, fg=COL_ACCENT_3, wraplength=260, justify="left")
+        self.lbl_status.pack(anchor="w")
 
         sep = ttk.Separator(panel, orient="horizontal"); sep.pack(fill="x", pady=8)
         tk.Label(panel, text="🎯 Mini-juego de puntos", font=F_H3, bg=COL_BG_CARD, fg=COL_TEXT_MAIN).pack(anchor="w")
@@ -397,150 +1030,245 @@ class GrapherFrame(tk.Frame):
         # Centro: gráfico
         center = tk.Frame(body, bg=COL_BG_DARK)
         center.pack(side="left", fill="both", expand=True, padx=(10,12))
-        self.fig = Figure(figsize=(9.6, 7.2), dpi=100, facecolor=COL_BG_CARD)
-        self.ax = self.fig.add_subplot(111)
-        self.canvas = FigureCanvasTkAgg(self.fig, master=center)
-        self.canvas_widget = self.canvas.get_tk_widget()
-        self.canvas_widget.pack(fill="both", expand=True)
-
-        # Derecha: Borre grande siempre visible
-        self.borre_panel = BigBorrePanel(body)
-        self.borre_panel.frame.pack(side="left", fill="both", padx=(6,14), pady=(0,0))
+        self._plot_slot = center
+        self.plot = PlotCanvas(self.controller.plot_surface())
+        self.fig, self.ax, self.canvas = self.plot.fig, self.plot.ax, self.plot.canvas
+
+        # Artistas persistentes: solo cambian sus datos. Una línea por serie.
+        self.line_f = self.plot.line(animated=True, linewidth=3)
+        self.line_mb = self.plot.line(animated=True, linewidth=2, color=COL_ACCENT_1, linestyle="--")
+        self.line_df = self.plot.line(animated=True, linewidth=2, color=COL_ACCENT_4)
+        self.lines_cmp = [self.plot.line(animated=True, linewidth=2, color=c, alpha=0.85)
+                          for c in (COL_ACCENT_2, COL_ACCENT_3, "#c77dff")]
+        self.compare = []               # textos fijados con «Comparar»
+        self._drawn = {}                # línea → (texto, vista) que muestra ahora
+        self._legend_key = None
+        self.pts_placed = self.plot.scatter(animated=True, s=60, zorder=5)
+        from matplotlib.colors import to_rgba
+        self._rgba_ok, self._rgba_bad = np.array(to_rgba(COL_ACCENT_4)), np.array(to_rgba(COL_ACCENT_3))
+        self.goal_star = self.ax.scatter([], [], s=160, marker='*', c=COL_ACCENT_1, edgecolors='k', linewidths=0.6, zorder=6)
+        self.goal_halo = self.ax.scatter([], [], s=400, facecolors='none', edgecolors=COL_ACCENT_1, alpha=0.25, zorder=4)
+
+        # Derecha: Borre grande siempre visible (el panel es compartido; acá va su hueco)
+        self._borre_slot = tk.Frame(body, bg=COL_BG_DARK)
+        self._borre_slot.pack(side="left", fill="both", padx=(6,14), pady=(0,0))
+        self.borre_panel = self.controller.borre_panel(owner=self)
 
-        self._setup_axes()
         self._new_goal()
-        self._plot()
         self.cid_click = self.canvas.mpl_connect('button_press_event', self._on_click_plot)
+        self.canvas.mpl_connect('scroll_event', self._on_scroll)
+        self.canvas.mpl_connect('button_press_event', self._on_pan_start)
+        self.canvas.mpl_connect('motion_notify_event', self._on_pan_move)
+        self.canvas.mpl_connect('button_release_event', self._on_pan_end)
 
-    def _setup_axes(self):
-        self.ax.clear()
-        self.ax.set_facecolor("#1b2043")
-        self.ax.spines['top'].set_visible(False)
-        self.ax.spines['right'].set_visible(False)
-        self.ax.spines['left'].set_color(COL_PLOT_AXES)
-        self.ax.spines['bottom'].set_color(COL_PLOT_AXES)
-        self.ax.tick_params(axis='x', colors=COL_PLOT_AXES)
-        self.ax.tick_params(axis='y', colors=COL_PLOT_AXES)
-        self.ax.axhline(0, color=COL_PLOT_AXES, linewidth=1.5)
-        self.ax.axvline(0, color=COL_PLOT_AXES, linewidth=1.5)
+    def on_show(self):
+        self.plot.show(self._plot_slot); self.borre_panel.show(self._borre_slot)
+
+    def _toggle_grid(self):
+        self.plot.set_grid(self.show_grid.get())
+        self._plot()
 
     def _sync_ranges(self):
         if self.xmin.get() >= self.xmax.get():
             self.xmax.set(self.xmin.get()+1)
+        self._xview = self._yview = None     # los sliders vuelven a mandar
+        self._sched.request(preview=True)
+
+    # ------------- Pan / zoom con el mouse -------------
+    def _reset_view(self):
+        self._xview = self._yview = None
         self._plot()
 
+    def _on_scroll(self, event):
+        if event.inaxes != self.ax: return
+        (x1, x2), (y1, y2) = self.ax.get_xlim(), self.ax.get_ylim()
+        k = 0.8 ** (event.step or (1 if event.button == "up" else -1))
+        if not 1e-6 < (x2 - x1) * k < 1e6: return
+        cx, cy = event.xdata, event.ydata
+        self._xview = (cx - (cx - x1) * k, cx + (x2 - cx) * k)
+        self._yview = (cy - (cy - y1) * k, cy + (y2 - cy) * k)
+        self._sched.request(preview=True)
+        self._settle()
+
+    def _settle(self):
+        """Calidad completa cuando la rueda deja de moverse."""
+        if self._settle_after: self.after_cancel(self._settle_after)
+        self._settle_after = self.after(200, lambda: self._sched.request(preview=False))
+
+    def _on_pan_start(self, event):
+        if event.button not in (2, 3) or event.inaxes != self.ax: return
+        self._pan = (event.x, event.y, self.ax.get_xlim(), self.ax.get_ylim())
+
+    def _on_pan_move(self, event):
+        if self._pan is None or event.x is None: return
+        px, py, (x1, x2), (y1, y2) = self._pan
+        bb = self.ax.bbox
+        dx = (event.x - px) * (x2 - x1) / bb.width; dy = (event.y - py) * (y2 - y1) / bb.height
+        self._xview = (x1 - dx, x2 - dx); self._yview = (y1 - dy, y2 - dy)
+        self._sched.request(preview=True)
+
+    def _on_pan_end(self, event):
+        if self._pan is None: return
+        self._pan = None
+        self._sched.request(preview=False)
+
     def _set_func(self, s):
         self.entry_func.delete(0, tk.END)
         self.entry_func.insert(0, s)
         self._plot()
 
     def _from_mb(self):
-        m = self.m_val.get(); b = self.b_val.get()
-        self.entry_func.delete(0, tk.END)
-        self.entry_func.insert(0, f"{m:.2f}*x + {b:.2f}")
+        # La recta es su propia serie: ya no pisa lo escrito en y = …
+        self.show_line.set(True)
+        self._sched.request(preview=True)
+
+    def _add_compare(self):
+        func = self.entry_func.get().strip()
+        if func and func not in self.compare:
+            self.compare = (self.compare + [func])[-len(self.lines_cmp):]
+            self._plot()
+
+    def _clear_compare(self):
+        self.compare = []
         self._plot()
 
-    def _plot(self):
+    def _series(self):
+        """[(línea, texto, etiqueta)] de las curvas visibles; f siempre primero."""
         func = self.entry_func.get()
-        x1, x2 = float(self.xmin.get()), float(self.xmax.get())
+        out = [(self.line_f, func, f"y = {func}")]
+        if self.show_line.get():
+            m, b = self.m_val.get(), self.b_val.get()
+            out.append((self.line_mb, f"{m:.2f}*x + {b:.2f}", f"y = {m:.2f}·x + {b:.2f}"))
+        if self.show_deriv.get():
+            out.append((self.line_df, None, "f'(x)"))
+        out += [(ln, src, f"y = {src}") for ln, src in zip(self.lines_cmp, self.compare)]
+        return out
+
+    def _plot(self, preview=False):
+        self._sched.cancel()
+        x1, x2 = self._xview or (float(self.xmin.get()), float(self.xmax.get()))
         if x2 - x1 < 1e-6: x2 = x1 + 1
-        x = np.linspace(x1, x2, 600)
-        try:
-            y = safe_eval_expr(func, x_value=x)
-            y = np.asarray(y, dtype=float)
-            y[~np.isfinite(y)] = np.nan
-        except Exception:
-            self._setup_axes()
-            self.ax.set_xlim(x1, x2)
-            self.ax.set_ylim(-10, 10)
-            if True: self.ax.grid(True, linestyle='--', color=COL_PLOT_GRID, alpha=0.25)
-            self.canvas.draw(); return
-
-        self._setup_axes()
-        self.ax.grid(True, linestyle='--', color=COL_PLOT_GRID, alpha=0.25)
-        self.ax.plot(x, y, linewidth=3)
-        self.ax.set_xlim(x1, x2)
-        valid = y[np.isfinite(y)]
-        if valid.size:
-            ymin, ymax = float(np.nanmin(valid)), float(np.nanmax(valid))
-            pad = 0.1 * (ymax - ymin + 1e-6)
-            self.ax.set_ylim(ymin - pad, ymax + pad)
-        else:
-            self.ax.set_ylim(-10, 10)
-        self._draw_goal()
-        if hasattr(self, 'placed_points'):
-            for (px, py, ok) in self.placed_points:
-                self.ax.scatter(px, py, s=60, c=(COL_ACCENT_4 if ok else COL_ACCENT_3), zorder=5)
-        self.canvas.draw()
+        series, fs = [], []
+        for ln, src, label in self._series():
+            try:
+                f = compile_expr(src) if src is not None else compile_expr(self.entry_func.get()).derivative()
+            except Exception:
+                f = None
+            series.append((ln, f, label))
+            if f is not None: fs.append(f)
+        # Tramos cacheados: mover la vista solo muestrea lo que recién aparece, y
+        # lo que falte de todas las curvas se evalúa junto en una pasada.
+        # Durante el arrastre alcanza con tramos un nivel más gruesos.
+        # Una curva que no se puede evaluar (p. ej. 1/0+x) se deja afuera sola.
+        data = iter(self.tiles.try_curves(fs, x1, x2, preview=preview))
+        view = (x1, x2, preview)
+        visible, drawn, failed = set(), [], []
+        for ln, f, label in series:
+            xy = next(data) if f is not None else None
+            if xy is None:
+                f, xy = None, ([], [])
+                if label.removeprefix("y = ").strip(): failed.append(label)
+            else: drawn.append((ln, f, label))
+            key = (f.source, view) if f is not None else None
+            # Solo se tocan los datos de la serie que cambió
+            if self._drawn.get(ln) != key:
+                ln.set_data(*xy); self._drawn[ln] = key
+            ln.set_label(label); visible.add(ln)
+            if ln is self.line_f: fx, fy = xy
+        for ln in (self.line_mb, self.line_df, *self.lines_cmp):
+            if ln not in visible and self._drawn.get(ln) is not None:
+                ln.set_data([], []); self._drawn[ln] = None
+        self.lbl_status.config(text="No se pudo graficar: " + ", ".join(failed) if failed else "")
+        self._update_legend([s for s in drawn if s[0] is not self.line_f])
+        try: ylim = self._yview or curve_ylim(np.asarray(fx), np.asarray(fy))
+        except Exception: ylim = (-10, 10)
+        self.plot.update((x1, x2), ylim)
+        self.controller.rec("gp", x1, x2, list(self._yview) if self._yview else None, preview, self.entry_func.get(),
+                            [self.m_val.get(), self.b_val.get()] if self.show_line.get() else None,
+                            self.show_deriv.get(), list(self.compare))
+
+    def _update_legend(self, extra):
+        """Leyenda solo con varias curvas; va al fondo cacheado, así que se rehace solo si cambia."""
+        key = (self.line_f.get_label(), *(label for _, _, label in extra)) if extra else None
+        if key == self._legend_key: return
+        self._legend_key = key
+        leg = self.ax.get_legend()
+        if leg is not None: leg.remove()
+        if key:
+            lines = [self.line_f] + [ln for ln, _, _ in extra]
+            self.ax.legend(handles=lines, loc="upper left", fontsize=9, facecolor=COL_BG_CARD,
+                           edgecolor=COL_BORDER, labelcolor=COL_TEXT_MAIN)
+        self.plot.invalidate()
 
     # ------------- Minijuego -------------
+    def on_player(self, name):
+        # Sesión nueva: minijuego nuevo con el generador de la sesión
+        self.points_game = PointGame(rng=self.controller.rng("puntos"))
+        self.points_game.restore(self.controller.last_state("graficadora") or {"score": 0})
+        self.controller.rec("ge", self.points_game.score)
+        self.lbl_score.config(text=f"Puntos: {self.points_game.score}")
+        self._new_goal()
+
     def _new_goal(self):
-        tx = random.randint(-5, 5)
-        ty = random.randint(-5, 5)
-        self.target = (tx, ty)
+        self.controller.rec("gg", *self.points_game.new_goal())
+        self._show_goal()
+        self._clear_points()
+
+    def _show_goal(self):
+        tx, ty = self.points_game.target
         self.lbl_goal.config(text=f"Meta: coloca el punto en ({tx}, {ty})")
-        self.placed_points = []
-        self._plot()
+        self.goal_star.set_offsets([(tx, ty)]); self.goal_halo.set_offsets([(tx, ty)])
+        self.plot.invalidate()
 
     def _clear_points(self):
-        self.placed_points = []
+        self.points_game.clear(); self.controller.rec("gl")
+        self._draw_points()
         self._plot()
 
-    def _draw_goal(self):
-        if not self.target: return
-        tx, ty = self.target
-        self.ax.scatter([tx], [ty], s=160, marker='*', c=COL_ACCENT_1, edgecolors='k', linewidths=0.6, zorder=6)
-        self.ax.scatter([tx], [ty], s=400, facecolors='none', edgecolors=COL_ACCENT_1, alpha=0.25, zorder=4)
+    def _draw_points(self):
+        # Un único scatter: se le pasan los arreglos del índice, sin listas por punto
+        pts = self.points_game.points
+        self.pts_placed.set_offsets(pts.xy)
+        if len(pts): self.pts_placed.set_facecolors(np.where(pts.ok[:, None], self._rgba_ok, self._rgba_bad))
 
     def _on_click_plot(self, event):
-        if event.inaxes != self.ax: return
-        px, py = event.xdata, event.ydata
-        ok = False
-        if self.target:
-            tx, ty = self.target
-            dist = math.hypot(px - tx, py - ty)
-            ok = dist <= 0.6
-        self.placed_points.append((px, py, ok))
+        if event.button != 1 or event.inaxes != self.ax: return
+        tx, ty = self.points_game.target
+        ok = self.points_game.click(event.xdata, event.ydata)
+        best = self.points_game.closest()
+        self.controller.rec("gc", float(event.xdata), float(event.ydata), ok)
+        self.controller.log("graficadora", "punto", ok=ok, x=round(event.xdata, 2), y=round(event.ydata, 2), meta=[tx, ty])
+        if ok: self.controller.log("graficadora", "estado", **self.points_game.snapshot())
+        self._draw_points()
         if ok:
-            current = int(self.lbl_score.cget('text').split(':')[-1])
-            current += 1
-            self.lbl_score.config(text=f"Puntos: {current}")
+            self.lbl_score.config(text=f"Puntos: {self.points_game.score}")
             self.borre_panel.flash("¡Exacto! ⭐", good=True)
-            self._new_goal()
+            self._show_goal()
+            self._plot()
         else:
-            self.lbl_goal.config(text=f"Casi… prueba más cerca de ({tx}, {ty})")
+            self.lbl_goal.config(text=f"Casi… tu mejor intento quedó a {best:.1f} de ({tx}, {ty})")
             self.borre_panel.flash("Casi… 😅", good=False)
-        self._plot()
+            self.plot.refresh()
 
 # ==========================
 #   DERIVANDO CON BORRE — juego principal
 # ==========================
 class DerivandoFrame(tk.Frame):
-    FUNCS = [
-        ("x",           "Recta"),
-        ("2*x+1",       "Recta inclinada"),
-        ("x**2",        "Parábola"),
-        ("-0.5*x**2+4", "Parábola invertida"),
-        ("x**3/8",      "Cúbica suave"),
-        ("np.sin(x)",   "Seno"),
-        ("np.cos(x)",   "Coseno"),
-    ]
+    """Vista del juego: el estado y las preguntas los lleva cerebrino.DerivGame."""
+    FUNCS = FUNCS
 
     def __init__(self, parent, controller):
         super().__init__(parent, bg=COL_BG_DARK)
         self.controller = controller
 
         # Estado
-        self.score = 0
-        self.level = 1
-        self.lives = 3
-        self.bones = 0
+        self.game = DerivGame(self.FUNCS, rng=controller.rng("derivando"))
+        self._bank = None
+        threading.Thread(target=self._load_bank, daemon=True).start()
         self.mode = tk.StringVar(value="signo")  # "signo" | "valor"
-        self.in_boss = False
 
         self.func_str = "x"
         self.x0 = 0.0
-        self.correct_answer = None
 
         # ---- Top bar
         top = tk.Frame(self, bg=COL_BG_DARK); top.pack(fill="x")
@@ -580,8 +1308,9 @@ class DerivandoFrame(tk.Frame):
 
         tk.Label(left, text="Evaluar en x =", font=F_H3, bg=COL_BG_CARD, fg=COL_TEXT_MUTED).pack(anchor="w", pady=(10,2))
         self.var_x0 = tk.DoubleVar(value=1.0)
+        self._sched = RenderScheduler(self, lambda preview: self._refresh_plot())
         tk.Scale(left, from_=-6, to=6, orient="horizontal", resolution=0.5, variable=self.var_x0, bg=COL_BG_CARD,
-                 troughcolor=COL_ACCENT_2, highlightthickness=0, command=lambda e: self._refresh_plot()).pack(fill="x")
+                 troughcolor=COL_ACCENT_2, highlightthickness=0, command=lambda e: self._sched.request()).pack(fill="x")
 
         self.lbl_question = tk.Label(left, text="Pulsa «Nueva pregunta»", font=F_H3, bg=COL_BG_CARD, fg=COL_TEXT_MAIN, wraplength=260, justify="left")
         self.lbl_question.pack(anchor="w", pady=(10,8))
@@ -607,164 +1336,133 @@ class DerivandoFrame(tk.Frame):
         # Centro (gráfico)
         center = tk.Frame(body, bg=COL_BG_DARK)
         center.pack(side="left", fill="both", expand=True, padx=(10,12))
-        self.fig = Figure(figsize=(9.6, 7.2), dpi=100, facecolor=COL_BG_CARD)
-        self.ax = self.fig.add_subplot(111)
-        self.canvas = FigureCanvasTkAgg(self.fig, master=center)
-        self.canvas_widget = self.canvas.get_tk_widget()
-        self.canvas_widget.pack(fill="both", expand=True)
-
-        # Derecha: Borre grande siempre visible
-        self.borre_panel = BigBorrePanel(body)
-        self.borre_panel.frame.pack(side="left", fill="both", padx=(6,14), pady=(0,0))
+        self._plot_slot = center
+        self.plot = PlotCanvas(self.controller.plot_surface())
+        self.fig, self.ax, self.canvas = self.plot.fig, self.plot.ax, self.plot.canvas
+        # La curva va al fondo cacheado; tangente y punto se mueven con x0
+        self.line_f = self.plot.line(linewidth=3)
+        self.line_tan = self.plot.line(animated=True, linewidth=2)
+        self.pt_x0 = self.plot.scatter(animated=True, s=80, zorder=5)
+        self._plotted_func = None
+
+        # Derecha: Borre grande siempre visible (el panel es compartido; acá va su hueco)
+        self._borre_slot = tk.Frame(body, bg=COL_BG_DARK)
+        self._borre_slot.pack(side="left", fill="both", padx=(6,14), pady=(0,0))
+        self.borre_panel = self.controller.borre_panel(owner=self)
 
         # Inicializa
-        self._setup_axes()
         self.nueva_pregunta()
 
-    # -------- utilidades matemáticas
-    def _y(self, x): return safe_eval_expr(self.func_str, x_value=x)
-    def _deriv_num(self, x0, h=1e-4): return (self._y(x0+h) - self._y(x0-h)) / (2*h)
+    def _load_bank(self):
+        """Hilo: carga el banco de preguntas (o lo genera si falta o es de otras funciones)."""
+        path = default_bank_path()
+        try:
+            bank = QuestionBank.load(path, self.FUNCS)
+        except Exception:
+            arrays = build_bank(self.FUNCS)
+            try: save_bank(arrays, path)
+            except OSError: pass
+            bank = QuestionBank(arrays)
+        # Asignación atómica; la próxima pregunta (en el hilo de Tk) ya sale del banco
+        self._bank = bank
 
-    # -------- progreso
-    def _update_statebar(self):
-        self.lbl_state.config(text=f"Nivel {self.level}  |  Vidas: {self.lives}  |  Huesitos: {self.bones}")
+    def on_show(self):
+        self.plot.show(self._plot_slot); self.borre_panel.show(self._borre_slot)
 
-    def _gain_bone(self, amount=1):
-        self.bones += amount
-        self._update_statebar()
-        self.borre_panel.flash("+1 huesito 🎉", good=True)
+    # -------- progreso
+    def on_player(self, name):
+        """Reanuda el último estado guardado del jugador (o empieza de cero)."""
+        # Sesión nueva: partida nueva con el generador de la sesión
+        self.game = DerivGame(self.FUNCS, rng=self.controller.rng("derivando"), bank=self.game.bank)
+        self.game.restore(self.controller.last_state("derivando") or {})
+        self.controller.rec("de", self.game.snapshot(), len(self.game.bank) if self.game.bank else 0)
+        self.mode.set(self.game.mode)
+        self._update_statebar(); self.nueva_pregunta()
 
-    def _lose_life(self):
-        self.lives -= 1
-        self._update_statebar()
-        self.borre_panel.flash("-1 vida 😅", good=False)
-        if self.lives <= 0:
-            mb.showwarning("Juego terminado", "Borre se cansó… ¡Inténtalo otra vez!")
-            self.level = 1; self.lives = 3; self.bones = 0; self.score = 0; self.in_boss = False
-            self.lbl_score.config(text="Racha: 0/5 para Jefe")
-            self._update_statebar()
-
-    def _level_up(self):
-        self.level += 1
-        self.score = 0
-        self.in_boss = False
-        mb.showinfo("¡Nivel superado!", f"Subiste al Nivel {self.level}. ¡Borre está orgulloso! 🐾")
-        self.lbl_score.config(text="Racha: 0/5 para Jefe")
-        self._update_statebar()
-        self.borre_panel.flash("¡Nivel ↑!", good=True)
+    def _update_statebar(self):
+        self.lbl_state.config(text=self.game.state_text)
+        self.lbl_score.config(text=self.game.streak_text)
 
     # -------- preguntas
     def nueva_pregunta(self, force_mode=False):
-        if not self.in_boss and self.score >= 5:
-            self.in_boss = True
+        if self.game.bank is None and self._bank is not None:
+            self.game.bank = self._bank; self.controller.rec("db", len(self._bank))
+        mode = self.game.mode = self.mode.get()
+        q = self.game.new_question(force_mode)
+        self.controller.rec("dq", mode, q.func, q.x0)
+        if "jefe" in q.events:
             mb.showinfo("🐺 ¡Jefe!", "Reto de Jefe: combina pendiente y valor.\n¡Consigue 2 aciertos seguidos!")
-            self.mode.set("signo")
+            self.mode.set(self.game.mode)
 
-        self.func_str, _ = random.choice(self.FUNCS)
+        self.func_str, self.x0 = q.func, q.x0
         self.lbl_func.config(text=self.func_str)
-        self.x0 = round(random.uniform(-3, 3), 1)
         self.var_x0.set(self.x0)
         self.lbl_feedback.config(text="")
-        self._setup_axes()
         self._refresh_plot()
 
-        m = self.mode.get()
-        if self.in_boss:
-            m = "signo" if (getattr(self, "_boss_toggle", 0) % 2 == 0) else "valor"
-            self._boss_toggle = getattr(self, "_boss_toggle", 0) + 1
-        elif force_mode:
-            m = self.mode.get()
-
-        if m == "signo": self._q_signo()
-        else: self._q_valor()
-
-    def _q_signo(self):
-        self.lbl_question.config(text=f"En y = {self.func_str} y en x = {self.x0}, ¿la pendiente es…?")
-        slope = self._deriv_num(self.x0)
-        if abs(slope) < 1e-2:
-            self.correct_answer = "Plana (0)"; opciones = ["Plana (0)", "Positiva", "Negativa", "No se puede"]
-        elif slope > 0:
-            self.correct_answer = "Positiva"; opciones = ["Positiva", "Negativa", "Plana (0)", "No se puede"]
-        else:
-            self.correct_answer = "Negativa"; opciones = ["Negativa", "Positiva", "Plana (0)", "No se puede"]
-        random.shuffle(opciones); self._fill_options(opciones)
-
-    def _q_valor(self):
-        self.lbl_question.config(text=f"Velocidad de Borre: estima f'(x) en x = {self.x0}")
-        slope = self._deriv_num(self.x0)
-        corr = round(slope, 1)
-        self.correct_answer = f"{corr}"
-        opciones = {corr}
-        while len(opciones) < 4:
-            delta = random.choice([0.1, 0.2, 0.3, 0.5, 1.0]) * random.choice([-1,1])
-            opciones.add(round(corr + delta, 1))
-        opciones = [str(o) for o in opciones]; random.shuffle(opciones)
-        self._fill_options(opciones)
-
-    def _fill_options(self, opciones):
-        for b, txt in zip(self.btns_opts, opciones): b.config(text=txt, state="normal")
+        self.lbl_question.config(text=q.prompt)
+        for b, txt in zip(self.btns_opts, q.options): b.config(text=txt, state="normal")
 
     def _choose(self, idx):
-        txt = self.btns_opts[idx].cget("text")
-        ok = (txt == self.correct_answer)
-        if ok:
-            if self.in_boss:
-                streak = getattr(self, "_boss_streak", 0) + 1
-                self._boss_streak = streak
-                if streak >= 2:
-                    self._boss_streak = 0
-                    self._level_up()
-            else:
-                self.score += 1
-                self._gain_bone(1)
-                self.lbl_score.config(text=f"Racha: {self.score}/5 para Jefe")
-            self.lbl_feedback.config(text="⭐ ¡Correcto!")
-        else:
-            self._lose_life()
-            self.lbl_feedback.config(text=f"Ups… La respuesta era: {self.correct_answer}")
-            if self.in_boss: self._boss_streak = 0
+        q, chosen = self.game.question, self.btns_opts[idx].cget("text")
+        res = self.game.answer(chosen)
+        self.controller.rec("da", chosen, res.ok)
+        self.controller.log("derivando", "respuesta", ok=res.ok, modo=q.mode, func=q.func, x0=q.x0,
+                            elegida=chosen, correcta=res.answer, nivel=self.game.level)
+        self.controller.log("derivando", "estado", **self.game.snapshot())
+        self._update_statebar()
+        if "hueso" in res.events: self.borre_panel.flash("+1 huesito 🎉", good=True)
+        if "nivel" in res.events:
+            mb.showinfo("¡Nivel superado!", f"Subiste al Nivel {self.game.level}. ¡Borre está orgulloso! 🐾")
+            self.borre_panel.flash("¡Nivel ↑!", good=True)
+        if "vida" in res.events: self.borre_panel.flash("-1 vida 😅", good=False)
+        if "fin" in res.events: mb.showwarning("Juego terminado", "Borre se cansó… ¡Inténtalo otra vez!")
+
+        if res.ok: self.lbl_feedback.config(text="⭐ ¡Correcto!")
+        else: self.lbl_feedback.config(text=f"Ups… La respuesta era: {res.answer}")
 
         for b in self.btns_opts: b.config(state="disabled")
         self.after(900, self.nueva_pregunta)
 
     def _reset_level(self):
-        self.score = 0; self.in_boss = False
-        self.lbl_score.config(text="Racha: 0/5 para Jefe")
+        self.game.reset_level(); self.controller.rec("dr")
         self._update_statebar(); self.nueva_pregunta()
 
     # -------- gráfico
-    def _setup_axes(self):
-        self.ax.clear()
-        self.ax.set_facecolor("#1b2043")
-        for side in ('top','right'): self.ax.spines[side].set_visible(False)
-        self.ax.spines['left'].set_color(COL_PLOT_AXES)
-        self.ax.spines['bottom'].set_color(COL_PLOT_AXES)
-        self.ax.tick_params(axis='x', colors=COL_PLOT_AXES)
-        self.ax.tick_params(axis='y', colors=COL_PLOT_AXES)
-        self.ax.axhline(0, color=COL_PLOT_AXES, linewidth=1.5)
-        self.ax.axvline(0, color=COL_PLOT_AXES, linewidth=1.5)
-        self.ax.grid(True, linestyle='--', color=COL_PLOT_GRID, alpha=0.25)
-
     def _refresh_plot(self):
+        self._sched.cancel()
         x0 = float(self.var_x0.get()); self.x0 = x0
-        x = np.linspace(-6, 6, 600)
-        try:
-            y = self._y(x); y = np.asarray(y, dtype=float); y[~np.isfinite(y)] = np.nan
-        except Exception:
-            self._setup_axes(); self.ax.set_xlim(-6,6); self.ax.set_ylim(-6,6); self.canvas.draw(); return
-
-        self._setup_axes(); self.ax.plot(x, y, linewidth=3)
+        self.controller.rec("dx", x0)
+        if self._plotted_func != self.func_str:
+            try:
+                with perf.span("muestreo"): x, y = sample_curve(compile_expr(self.func_str), -6, 6)
+            except Exception:
+                x, y = [], []
+            self.line_f.set_data(x, y)
+            self._plotted_func = self.func_str
+            self.plot.invalidate()
         try:
-            y0 = float(self._y(x0)); m = float(self._deriv_num(x0))
-            xt = np.linspace(x0-2, x0+2, 40); yt = m*(xt - x0) + y0
-            self.ax.plot(xt, yt, linewidth=2); self.ax.scatter([x0],[y0], s=80, zorder=5)
+            y0, m = map(float, compile_expr(self.func_str).value_and_slope(x0))
+            self.line_tan.set_data([x0-2, x0+2], [y0 - 2*m, y0 + 2*m])
+            self.pt_x0.set_offsets([(x0, y0)])
         except Exception:
-            pass
-        self.ax.set_xlim(-6,6); self.ax.set_ylim(-6,6); self.canvas.draw()
+            self.line_tan.set_data([], []); self.pt_x0.set_offsets(np.empty((0, 2)))
+        self.plot.update((-6, 6), (-6, 6))
 
 # ==========================
 #            RUN
 # ==========================
 if __name__ == "__main__":
-    app = App()
+    if "--bench-startup" in sys.argv:
+        # Para cerebrino.bench: segundos desde el lanzamiento hasta que el menú se pinta
+        t0 = float(os.environ.get("CEREBRINO_T0", time.time()))
+        app = App(prewarm=False, reduced_motion=True)
+        app.update()
+        print(f"{time.time() - t0:.4f}")
+        app.destroy(); sys.exit(0)
+    if "--perf" in sys.argv: perf.enable()
+    reduced = "--reduced-motion" in sys.argv or os.environ.get("CEREBRINO_REDUCED_MOTION") == "1"
+    seed = os.environ.get("CEREBRINO_SEED")
+    if "--semilla" in sys.argv: seed = sys.argv[sys.argv.index("--semilla") + 1]
+    app = App(reduced_motion=reduced, seed=int(seed) if seed else None)
     app.mainloop()
@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+"""
+Motor de Cerebrino sin interfaz gráfica.
+
+Todo lo que no es Tk vive aquí (evaluador, muestreo, derivadas, preguntas
+y estado del juego) para poder usarlo, medirlo y probarlo sin abrir una
+ventana:
+
+    >>> from cerebrino import compile_expr, DerivGame
+    >>> compile_expr("x**2").derivative()(3.0)
+    6.0
+"""
+
+from .expr import CompiledExpr, ExprBatch, compile_expr, compile_batch, safe_eval_expr
+from .sampling import sample_curve, sample_many, curve_ylim
+from .tiles import TileCache
+from .points import PointIndex
+from .game import FUNCS, DerivGame, PointGame, Question, AnswerResult, slope, slope_sign
+from .calc import IncrementalCalc, CalcTape
+from .bank import QuestionBank, build_bank
+from .store import ProgressStore
+
+__all__ = [
+    "CompiledExpr", "ExprBatch", "compile_expr", "compile_batch", "safe_eval_expr",
+    "sample_curve", "sample_many", "curve_ylim", "TileCache", "PointIndex",
+    "FUNCS", "DerivGame", "PointGame", "Question", "AnswerResult", "slope", "slope_sign",
+    "IncrementalCalc", "CalcTape", "QuestionBank", "build_bank", "ProgressStore",
+]
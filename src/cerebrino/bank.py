@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+Banco de preguntas precalculado para 'Derivando con Borre'.
+
+Se recorre la malla función × x0 en tandas vectorizadas: pendiente exacta,
+curvatura, opciones de valor sin duplicados y un puntaje de dificultad.
+Se descartan las pendientes ambiguas (casi planas pero no planas). El
+resultado se guarda en un .npz compacto, ordenado e indexado por modo y
+nivel, así que servir una pregunta es un acceso O(1) sin evaluar nada.
+
+    PYTHONPATH=src python -m cerebrino.bank              # genera el banco por defecto
+    PYTHONPATH=src python -m cerebrino.bank otro.npz     # en otra ruta
+"""
+
+import os, sys
+import numpy as np
+
+from .expr import compile_expr
+from .game import FUNCS, FLAT_EPS, SIGN_OPTIONS, Question
+
+NUM_LEVELS = 3
+AMBIGUOUS  = 0.1                  # 0 < |f'(x0)| < 0.1 se ve plano pero no lo es: fuera
+DELTAS     = np.array([0.1, 0.2, 0.3, 0.5, 1.0, -0.1, -0.2, -0.3, -0.5, -1.0])
+SIGNS      = ("Negativa", "Plana (0)", "Positiva")    # índice = signo + 1
+MODES      = ("signo", "valor")
+
+def default_path():
+    return os.environ.get("CEREBRINO_BANCO") or os.path.join(os.path.expanduser("~"), ".cerebrino", "banco.npz")
+
+def _levels(difficulty):
+    return np.minimum((difficulty * NUM_LEVELS).astype(int), NUM_LEVELS - 1) + 1
+
+def build_bank(funcs=FUNCS, x0_grid=None, seed=0):
+    """Arreglos del banco (dict de np.ndarray) para todas las funciones y x0."""
+    if x0_grid is None: x0_grid = np.round(np.arange(-30, 31) / 10, 1)
+    rng = np.random.default_rng(seed)
+    cols = {k: [] for k in ("func", "x0", "slope", "sign", "corr", "dist", "diff_signo", "diff_valor")}
+    for i, (func, _) in enumerate(funcs):
+        d1 = compile_expr(func).derivative()
+        s = np.asarray(d1(x0_grid), dtype=float)
+        curv = np.abs(np.asarray(d1.derivative()(x0_grid), dtype=float))
+        keep = np.isfinite(s) & ((np.abs(s) < 1e-9) | (np.abs(s) >= AMBIGUOUS))
+        s, curv, x0 = s[keep], np.nan_to_num(curv[keep]), x0_grid[keep]
+        n = s.size
+        sign = np.where(np.abs(s) < FLAT_EPS, 0, np.sign(s)).astype(np.int8)
+        corr = np.round(s, 1) + 0.0                     # + 0.0 evita el "-0.0"
+        # 3 desplazamientos distintos por fila → opciones sin duplicados
+        pick = np.argsort(rng.random((n, DELTAS.size)), axis=1)[:, :3]
+        dist = np.round(corr[:, None] + DELTAS[pick], 1) + 0.0
+        cols["func"].append(np.full(n, i, np.uint8)); cols["x0"].append(x0)
+        cols["slope"].append(s); cols["sign"].append(sign); cols["corr"].append(corr); cols["dist"].append(dist)
+        # Signo: más difícil cuanto más plana se ve la tangente y más curva la función
+        cols["diff_signo"].append(np.clip(1 / (1 + 2*np.abs(s)) * (sign != 0) + 0.35*np.minimum(curv, 2)/2, 0, 1))
+        # Valor: pendientes grandes, curvas y no enteras cuestan más de estimar
+        frac = (np.abs(corr - np.round(corr)) > 1e-9).astype(float)
+        cols["diff_valor"].append(np.clip(0.45*np.minimum(np.abs(s), 4)/4 + 0.35*np.minimum(curv, 2)/2 + 0.2*frac, 0, 1))
+
+    rows = {k: np.concatenate(v) for k, v in cols.items()}
+    bank = {
+        "funcs": np.array([f for f, _ in funcs]),
+        "func": rows["func"],
+        "x0": np.round(rows["x0"] * 10).astype(np.int16),       # décimas (mallas hasta ±3276.7)
+        "sign": rows["sign"],
+        "corr": np.round(rows["corr"] * 10).astype(np.int16),   # décimas
+        "dist": np.round(rows["dist"] * 10).astype(np.int16),
+    }
+    for mode in MODES:
+        lvl = _levels(rows[f"diff_{mode}"])
+        order = np.argsort(lvl, kind="stable")
+        bank[f"diff_{mode}"] = rows[f"diff_{mode}"].astype(np.float16)
+        bank[f"order_{mode}"] = order.astype(np.int32)
+        bank[f"offsets_{mode}"] = np.searchsorted(lvl[order], np.arange(1, NUM_LEVELS + 2)).astype(np.int32)
+    return bank
+
+def save_bank(bank, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "wb") as fh: np.savez_compressed(fh, **bank)
+
+class QuestionBank:
+    """Sirve preguntas del banco por modo y nivel."""
+    def __init__(self, arrays):
+        self.a = arrays
+        self.funcs = [str(f) for f in arrays["funcs"]]
+
+    @classmethod
+    def load(cls, path, funcs=FUNCS):
+        """Banco de disco; ValueError si se armó con otras funciones (hay que regenerarlo)."""
+        with np.load(path) as z: bank = cls({k: z[k] for k in z.files})
+        if funcs is not None and bank.funcs != [f for f, _ in funcs]:
+            raise ValueError(f"El banco de {path} es de otras funciones")
+        return bank
+
+    def __len__(self):
+        return int(self.a["func"].size)
+
+    def _row(self, mode, level, rng):
+        off = self.a[f"offsets_{mode}"]
+        level = min(max(int(level), 1), NUM_LEVELS)
+        lo, hi = int(off[level - 1]), int(off[level])
+        if lo == hi: lo, hi = 0, int(off[-1])         # nivel vacío: cualquiera
+        return int(self.a[f"order_{mode}"][lo + rng.randrange(hi - lo)])
+
+    def draw(self, mode, level, rng):
+        i = self._row(mode, level, rng)
+        func = self.funcs[self.a["func"][i]]
+        x0 = round(int(self.a["x0"][i]) / 10, 1)
+        if mode == "signo":
+            answer = SIGNS[int(self.a["sign"][i]) + 1]
+            opciones = list(SIGN_OPTIONS[answer]); rng.shuffle(opciones)
+            return Question(func, x0, "signo", f"En y = {func} y en x = {x0}, ¿la pendiente es…?", opciones, answer)
+        answer = str(int(self.a["corr"][i]) / 10)
+        opciones = [answer] + [str(int(d) / 10) for d in self.a["dist"][i]]; rng.shuffle(opciones)
+        return Question(func, x0, "valor", f"Velocidad de Borre: estima f'(x) en x = {x0}", opciones, answer)
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    path = argv[0] if argv else default_path()
+    bank = build_bank()
+    save_bank(bank, path)
+    sizes = {m: np.diff(bank[f"offsets_{m}"]).tolist() for m in MODES}
+    print(f"{bank['func'].size} preguntas → {path}  (por nivel: {sizes})")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
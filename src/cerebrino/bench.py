@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks de los caminos calientes de Cerebrino.
+
+    PYTHONPATH=src python -m cerebrino.bench              # compara con la línea base
+    PYTHONPATH=src python -m cerebrino.bench --save       # guarda una línea base nueva
+    PYTHONPATH=src python -m cerebrino.bench -k eval      # solo los casos que contienen "eval"
+
+Cada caso reporta p50/p95 por operación. Si el p50 empeora más que
+`--threshold` (25 % por defecto) respecto a la línea base guardada, el
+proceso sale con código 1. Las líneas base dependen de la máquina: hay que
+regenerarlas en el equipo donde se comparan.
+"""
+
+import argparse, json, os, random, subprocess, sys, time
+import numpy as np
+
+from . import perf
+from .expr import CompiledExpr, compile_expr, safe_eval_expr
+from .calc import IncrementalCalc
+from .sampling import sample_curve, curve_ylim
+from .game import FUNCS, DerivGame, PointGame, slope
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+
+# Lo que suelen escribir los chicos y lo que generan los sliders m·x+b
+USER_CORPUS = [
+    "2*x + 1", "2.00*x + 1.00", "x^2 - 3*x + 2", "pi/2*x", "sqrt(x)", "1/x",
+    "tan(x)", "abs(x-2)", "exp(-x**2)", "log(x)", "np.sin(x)*x", "(x+1)*(x-1)/4",
+    "sin(x)**2 + sin(x)", "x**4 - 2*x**3 + x",
+]
+
+def _measure(fn, number, repeat):
+    """Tiempos por operación (s) de `repeat` tandas de `number` llamadas.
+
+    Con `number=None` el caso mide por su cuenta y devuelve los segundos."""
+    out = []
+    for _ in range(repeat):
+        if number is None: out.append(fn()); continue
+        t = time.perf_counter()
+        for _ in range(number): fn()
+        out.append((time.perf_counter() - t) / number)
+    return out
+
+# ---------------------------------------------------------------- casos
+def _eval_cases():
+    xs = np.linspace(-6, 6, 600)
+    pts = [float(v) for v in np.linspace(-3, 3, 50)]
+    for func, _ in FUNCS:
+        f = compile_expr(func)
+        yield f"eval_scalar[{func}]", (lambda f=f: [f(p) for p in pts]), 20
+        yield f"eval_array[{func}]", (lambda f=f: f(xs)), 200
+        yield f"slope[{func}]", (lambda func=func: slope(func, 1.3)), 2000
+    for expr in USER_CORPUS:
+        f = compile_expr(expr)
+        yield f"eval_array[{expr}]", (lambda f=f: f(xs)), 200
+    # Camino completo: normalizar + cache + evaluar, como en cada tick de slider
+    yield "compile_cached[corpus]", (lambda: [compile_expr(e) for e in USER_CORPUS]), 200
+    # Costo de la instrumentación: apagada debe ser casi nada frente a la evaluación
+    def traced(on):
+        was = perf.enabled; perf.enable(on)
+        try: return safe_eval_expr("x**2 + 1", 1.5)
+        finally: perf.enable(was)
+    yield "safe_eval[perf apagado]", (lambda: traced(False)), 2000
+    yield "safe_eval[perf encendido]", (lambda: traced(True)), 2000
+    # Calculadora: vista previa tras cada tecla de una cuenta de 36 teclas
+    typed = "12.5*3-48/6+7*7-0.25*8+1000/25-3*3*3"
+    calc = IncrementalCalc()
+    def incremental():
+        calc.clear()
+        for ch in typed: calc.push(ch); calc.preview()
+    def reparse():
+        for i in range(1, len(typed) + 1):
+            try: CompiledExpr(typed[:i])(None)
+            except (ValueError, SyntaxError): pass
+    yield "calc_preview[incremental]", incremental, 200
+    yield "calc_preview[reparse]", reparse, 20
+
+def _sampling_cases():
+    for expr in ["2*x + 1", "sin(x)", "tan(x)", "1/x", "sqrt(x)"]:
+        f = compile_expr(expr)
+        yield f"sample_curve[{expr}]", (lambda f=f: sample_curve(f, -10, 10)), 20
+
+def _pan_cases():
+    """Arrastre de la vista: tramos cacheados vs. remuestrear todo el rango."""
+    from .tiles import TileCache
+    f = compile_expr("sin(x)*x"); tiles = TileCache(); state = {"x1": -10.0}
+    def step():
+        x1 = state["x1"] = -10.0 if state["x1"] > 10 else state["x1"] + 0.1
+        return x1
+    yield "pan_frame[tiles]", (lambda: tiles.curve(f, step(), state["x1"] + 20)), 50
+    yield "pan_frame[full]", (lambda: sample_curve(f, step(), state["x1"] + 20)), 50
+    # Superposición de 5 curvas (f, f', recta y dos más) con la recta cambiando como con el slider
+    over = TileCache(); fixed = [f, f.derivative(), compile_expr("x**3/8"), compile_expr("cos(x)")]
+    ms = iter(np.tile(np.round(np.linspace(-3, 3, 61), 2), 1000))
+    yield "overlay5_frame[tiles]", (lambda: over.curves(fixed + [compile_expr(f"{next(ms)}*x + 1")], -10, 10)), 50
+
+def _render_cases():
+    """Redibujado fuera de pantalla con Agg, con el mismo esquema que PlotCanvas."""
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    fig = Figure(figsize=(9.6, 7.2), dpi=100)
+    canvas = FigureCanvasAgg(fig); ax = fig.add_subplot(111)
+    ax.axhline(0); ax.axvline(0); ax.grid(True, linestyle="--", alpha=0.25)
+    line, = ax.plot([], [], linewidth=3)
+    tan, = ax.plot([], [], linewidth=2, animated=True)
+    pt = ax.scatter([], [], s=80, animated=True)
+    f = compile_expr("-0.5*x**2+4")
+    x, y = sample_curve(f, -6, 6); line.set_data(x, y)
+    ax.set_xlim(-6, 6); ax.set_ylim(-6, 6)
+    canvas.draw(); bg = canvas.copy_from_bbox(fig.bbox)
+    state = {"x0": -3.0}
+
+    def full_replot():
+        xs, ys = sample_curve(f, -6, 6); line.set_data(xs, ys)
+        ax.set_ylim(*curve_ylim(xs, ys)); canvas.draw()
+
+    def blit_tangent():
+        x0 = state["x0"] = -3.0 if state["x0"] > 3 else state["x0"] + 0.5
+        y0, m = f.value_and_slope(x0)
+        tan.set_data([x0-2, x0+2], [y0 - 2*m, y0 + 2*m]); pt.set_offsets([(x0, y0)])
+        canvas.restore_region(bg); ax.draw_artist(tan); ax.draw_artist(pt)
+
+    yield "replot_full[agg]", full_replot, 3
+    yield "replot_blit[agg]", blit_tangent, 30
+
+def _game_cases():
+    game = DerivGame(rng=random.Random(0))
+    def one():
+        q = game.new_question(); game.answer(q.answer)
+    yield "question+answer", one, 500
+    from .bank import QuestionBank, build_bank
+    banked = DerivGame(rng=random.Random(0), bank=QuestionBank(build_bank()))
+    def one_banked():
+        q = banked.new_question(); banked.answer(q.answer)
+    yield "question+answer[banco]", one_banked, 500
+    # Sesión larga del minijuego de puntos: los fallos se acumulan y el costo por clic no debe crecer
+    pg = PointGame(rng=random.Random(0)); pg.new_goal(); pg.target = (3, 4)
+    clicks = np.random.default_rng(0).uniform(-10, 10, (200000, 2))
+    it = iter(clicks[np.hypot(clicks[:, 0] - 3, clicks[:, 1] - 4) > 1].tolist())
+    def click():
+        pg.click(*next(it)); pg.closest()
+    yield "point_click+nearest", click, 500
+    import tempfile
+    from .store import ProgressStore
+    store = ProgressStore(os.path.join(tempfile.mkdtemp(), "bench.db"))
+    sid = store.start_session("bench", "derivando")
+    def logged():
+        q = game.new_question(); res = game.answer(q.answer)
+        store.log(sid, "respuesta", ok=res.ok, modo=q.mode, func=q.func, x0=q.x0, elegida=q.answer, correcta=res.answer)
+        store.log(sid, "estado", **game.snapshot())
+    yield "question+answer[guardado]", logged, 500
+    # Sesión grabada reproducida de punta a punta (juego + trabajo de los gráficos)
+    from .replay import replay, synthetic
+    trace = synthetic(0, 300)
+    yield "replay[sesion sintetica]", (lambda: replay(trace)), 1
+
+def _startup_case():
+    """Tiempo hasta que el menú se pinta (necesita pantalla; si no hay, se omite)."""
+    script = os.path.join(ROOT, "src", "Prototipo1.py")
+    def run():
+        env = dict(os.environ, CEREBRINO_T0=repr(time.time()))
+        proc = subprocess.run([sys.executable, script, "--bench-startup"], env=env,
+                              capture_output=True, text=True, timeout=60)
+        if proc.returncode != 0:
+            raise RuntimeError((proc.stderr.strip().splitlines() or ["falló"])[-1])
+        return float(proc.stdout.split()[-1])
+    yield "startup_to_menu", run, None
+
+GROUPS = [_eval_cases, _sampling_cases, _pan_cases, _render_cases, _game_cases, _startup_case]
+
+# ---------------------------------------------------------------- CLI
+def run_all(select=None, repeat=15):
+    results = {}
+    for group in GROUPS:
+        for name, fn, number in group():
+            if select and select not in name: continue
+            try: fn()   # calentar caches (y descartar casos que no pueden correr aquí)
+            except Exception as err:
+                print(f"  ({name} omitido: {err})"); continue
+            times = _measure(fn, number, 5 if name == "startup_to_menu" else repeat)
+            p50, p95 = np.percentile(times, [50, 95])
+            results[name] = {"p50_us": round(p50 * 1e6, 2), "p95_us": round(p95 * 1e6, 2)}
+    return results
+
+def compare(results, baseline, threshold):
+    """Devuelve la lista de casos cuyo p50 empeoró más que el umbral."""
+    worse = []
+    for name, r in results.items():
+        base = baseline.get(name)
+        if base and r["p50_us"] > base["p50_us"] * (1 + threshold): worse.append(name)
+    return worse
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m cerebrino.bench", description=__doc__.split("\n\n")[0].strip())
+    ap.add_argument("-k", dest="select", help="solo casos cuyo nombre contenga este texto")
+    ap.add_argument("--baseline", default=BASELINE)
+    ap.add_argument("--save", action="store_true", help="guardar los resultados como línea base")
+    ap.add_argument("--threshold", type=float, default=0.25, help="regresión tolerada en p50 (0.25 = 25 %%)")
+    ap.add_argument("--repeat", type=int, default=15)
+    args = ap.parse_args(argv)
+
+    results = run_all(args.select, args.repeat)
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as fh: baseline = json.load(fh)
+
+    worse = compare(results, baseline, args.threshold)
+    print(f"{'caso':40} {'p50 (µs)':>12} {'p95 (µs)':>12} {'base p50':>12}")
+    for name, r in results.items():
+        base = baseline.get(name, {}).get("p50_us")
+        mark = "  ← REGRESIÓN" if name in worse else ""
+        print(f"{name:40} {r['p50_us']:12.2f} {r['p95_us']:12.2f} {base if base is not None else '—':>12}{mark}")
+
+    if args.save:
+        baseline.update(results)
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as fh: json.dump(baseline, fh, indent=1, sort_keys=True)
+        print(f"Línea base guardada en {args.baseline}")
+        return 0
+    return 1 if worse else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
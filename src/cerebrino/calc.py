@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+Calculadora incremental: vista previa del resultado a cada tecla.
+
+`IncrementalCalc` lee la expresión carácter por carácter con un
+shunting-yard de dos niveles (+ - y * /) y guarda el estado después de cada
+carácter. Agregar una tecla parte del estado anterior (números ya leídos,
+productos ya reducidos) y borrar vuelve al anterior, así que ninguna de las
+dos re-parsea el prefijo. Las pilas quedan de largo acotado, por eso cada
+paso y cada vista previa cuestan O(1).
+
+Solo modela lo que tiene el teclado (dígitos, punto, + - * / y el menos
+unario) con la misma semántica que `safe_eval_expr`. Todo lo demás
+(`**`, `1e-05`, errores de sintaxis, textos muy largos) queda marcado como
+`fallback` y se evalúa con el evaluador completo.
+
+`CalcTape` es la cinta de resultados: memoriza cada cuenta hecha, así que
+repetirla o recuperarla no vuelve a evaluar nada.
+"""
+
+import operator
+from collections import OrderedDict
+
+MAX_CHARS = 60             # más largo: lo evalúa el evaluador completo (con sus límites)
+_OPS  = {"+": operator.add, "-": operator.sub, "*": operator.mul, "/": operator.truediv}
+_PREC = {"+": 1, "-": 1, "*": 2, "/": 2}
+
+class _State:
+    """Estado tras un carácter: operandos y operadores pendientes, número en curso."""
+    __slots__ = ("vals", "ops", "num", "neg", "fallback", "value", "error", "shown")
+
+    def __init__(self, vals=(), ops=(), num="", neg=0, fallback=False, shown=None):
+        self.vals, self.ops, self.num, self.neg = vals, ops, num, neg
+        self.fallback = fallback
+        self.value = self.error = None      # resultado si la expresión está completa
+        self.shown = shown                   # último resultado completo (para la vista previa)
+
+_FALLBACK = _State(fallback=True)
+
+def _number(text, neg):
+    """Literal como lo leería Python (None si Python no lo aceptaría)."""
+    if text == "." or text.count(".") > 1: return None
+    if "." in text: v = float(text)
+    elif len(text) > 1 and text[0] == "0" and text.strip("0"): return None   # 01: SyntaxError
+    else: v = int(text)
+    return -v if neg % 2 else v
+
+def _reduce(vals, ops, floor):
+    """Aplica operadores de la pila mientras su precedencia sea >= floor."""
+    vals, ops = list(vals), list(ops)
+    while ops and _PREC[ops[-1]] >= floor:
+        b = vals.pop(); a = vals.pop()
+        vals.append(_OPS[ops.pop()](a, b))
+    return tuple(vals), tuple(ops)
+
+class IncrementalCalc:
+    """Expresión de la calculadora con un estado guardado por carácter."""
+    def __init__(self, text=""):
+        self.text = ""
+        self._states = [_State()]
+        self.set(text)
+
+    def __len__(self):
+        return len(self.text)
+
+    @property
+    def state(self):
+        return self._states[-1]
+
+    @property
+    def fallback(self):
+        """True si hace falta el evaluador completo para esta expresión."""
+        return self.state.fallback
+
+    @property
+    def complete(self):
+        s = self.state
+        return not s.fallback and (s.value is not None or s.error is not None)
+
+    @property
+    def error(self):
+        """Error de la cuenta completa (p. ej. división por cero), o None."""
+        return None if self.state.fallback else self.state.error
+
+    def result(self):
+        """Valor de la expresión completa; levanta el error si la cuenta falla."""
+        s = self.state
+        if not self.complete: raise ValueError("Expresión incompleta")
+        if s.error is not None: raise s.error
+        return s.value
+
+    def preview(self):
+        """Último resultado de un prefijo completo (None si no hay o hace falta el evaluador)."""
+        s = self.state
+        return None if s.fallback or s.error is not None else s.shown
+
+    # -------- edición
+    def push(self, ch):
+        prev = self._states[-1]
+        self.text += ch
+        self._states.append(_FALLBACK if prev.fallback or len(self.text) > MAX_CHARS else self._step(prev, ch))
+
+    def pop(self):
+        if not self.text: return
+        self.text = self.text[:-1]; self._states.pop()
+
+    def set(self, text):
+        """Cambia el texto reutilizando los estados del prefijo común."""
+        k = 0
+        for a, b in zip(self.text, text):
+            if a != b: break
+            k += 1
+        while len(self.text) > k: self.pop()
+        for ch in text[k:]: self.push(ch)
+
+    def clear(self):
+        self.set("")
+
+    @staticmethod
+    def _step(s, ch):
+        if ch.isdigit() or ch == ".":
+            t = _State(s.vals, s.ops, s.num + ch, s.neg, shown=s.shown)
+            v = _number(t.num, t.neg)
+            if v is None:
+                # "." o "01" todavía pueden completarse ("0.", "01.5"): solo quedan incompletos
+                if t.num.count(".") > 1: return _FALLBACK
+                return t
+            try:
+                vals, _ = _reduce(t.vals + (v,), t.ops, 1)
+                t.value = t.shown = vals[0]
+            except ArithmeticError as e:
+                t.error = e
+            return t
+        if ch not in _OPS: return _FALLBACK
+        if s.num:
+            # Fin del número: se reduce lo de igual o mayor precedencia y se apila el operador
+            v = _number(s.num, s.neg)
+            if v is None: return _FALLBACK
+            try:
+                vals, ops = _reduce(s.vals + (v,), s.ops, _PREC[ch])
+            except ArithmeticError:
+                return _FALLBACK              # el evaluador completo dará el mismo error
+            return _State(vals, ops + (ch,), shown=s.shown)
+        # Sin número todavía: solo vale el menos unario (** y // los resuelve el evaluador)
+        if ch == "-": return _State(s.vals, s.ops, "", s.neg + 1, shown=s.shown)
+        return _FALLBACK
+
+# ==========================
+#   CINTA DE RESULTADOS
+# ==========================
+class CalcTape:
+    """Cuentas hechas (expresión → resultado o error), la más reciente al final."""
+    def __init__(self, maxlen=50):
+        self.maxlen = maxlen
+        self._items = OrderedDict()
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, expr):
+        return expr in self._items
+
+    def get(self, expr):
+        """(ok, resultado o error) memorizado; None si nunca se calculó."""
+        return self._items.get(expr)
+
+    def add(self, expr, result, ok=True):
+        self._items[expr] = (ok, result); self._items.move_to_end(expr)
+        while len(self._items) > self.maxlen: self._items.popitem(last=False)
+
+    def entries(self):
+        """[(expresión, resultado)] de las cuentas bien hechas, la más nueva primero."""
+        return [(e, r) for e, (ok, r) in reversed(self._items.items()) if ok]
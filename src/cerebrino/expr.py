@@ -0,0 +1,494 @@
+# -*- coding: utf-8 -*-
+"""
+Evaluador seguro de expresiones y(x) para Cerebrino.
+
+La expresión se valida contra una lista blanca del AST una sola vez, pasa
+por un optimizador (constantes plegadas, identidades, potencias chicas como
+productos) y se reduce a un árbol de closures para escalares (`math`) o a
+un programa lineal con subexpresiones compartidas para arreglos (ufuncs de
+NumPy). Queda en un cache LRU. También da la derivada exacta y detecta si
+es afín (una recta se dibuja con dos puntos).
+"""
+
+import ast, operator, math, functools, time
+import numpy as np
+
+from . import perf
+
+_ALLOWED_OPS = {
+    ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul,
+    ast.Div: operator.truediv, ast.Pow: None, ast.USub: operator.neg, ast.Mod: operator.mod,
+}
+# Límites de costo: un error de tipeo (9**9**9) no debe congelar la máquina
+MAX_EXPR_CHARS = 400
+MAX_EXPR_NODES = 400
+MAX_EXPR_DEPTH = 100
+MAX_INT_BITS   = 4096
+
+def _safe_pow(a, b):
+    """pow que estima el tamaño del resultado antes de elevar enteros."""
+    if type(a) is int and type(b) is int and b > 0 and abs(a) > 1:
+        if b * a.bit_length() > MAX_INT_BITS: raise OverflowError("Resultado demasiado grande")
+    return operator.pow(a, b)
+
+def _safe_mul(a, b):
+    """Producto acotado igual que la potencia: una cadena de 9999999*… no crece sin fin."""
+    if type(a) is int and type(b) is int and a.bit_length() + b.bit_length() > MAX_INT_BITS + 1:
+        raise OverflowError("Resultado demasiado grande")
+    return a * b
+
+_ALLOWED_OPS[ast.Pow] = _safe_pow
+_ALLOWED_OPS[ast.Mult] = _safe_mul
+_CONSTS = {"pi": math.pi, "e": math.e, "tau": math.tau}
+# Misma lista blanca en dos sabores: escalar (math) y vectorizado (ufuncs de NumPy)
+_SCALAR_FUNCS = {
+    "sin": math.sin, "cos": math.cos, "tan": math.tan,
+    "asin": math.asin, "acos": math.acos, "atan": math.atan,
+    "arcsin": math.asin, "arccos": math.acos, "arctan": math.atan,
+    "sqrt": math.sqrt, "log": math.log, "log10": math.log10, "exp": math.exp, "abs": abs,
+}
+_ARRAY_FUNCS = {
+    "sin": np.sin, "cos": np.cos, "tan": np.tan,
+    "asin": np.arcsin, "acos": np.arccos, "atan": np.arctan,
+    "arcsin": np.arcsin, "arccos": np.arccos, "arctan": np.arctan,
+    "sqrt": np.sqrt, "log": np.log, "log10": np.log10, "exp": np.exp, "abs": np.abs,
+}
+
+def _normalize_expr(expr):
+    return (expr or "").strip().lower().replace("^", "**")
+
+def _const(value):
+    fn = lambda x: value
+    fn.const = True
+    return fn
+
+def _np_attr(n):
+    """'np.sin' / 'np.pi' → 'sin' / 'pi'; None si no es un atributo de np."""
+    if isinstance(n, ast.Attribute) and isinstance(n.value, ast.Name) and n.value.id == "np":
+        return n.attr
+    return None
+
+class CompiledExpr:
+    """Expresión validada una sola vez y optimizada.
+
+    Con x escalar (o sin x) se evalúa con un árbol de closures sobre `math`;
+    con arreglos, con un `_Program` de ufuncs sobre el arreglo completo.
+    `affine` es (m, b) si la expresión es m·x + b, o None."""
+    __slots__ = ("source", "uses_x", "affine", "_body", "_scalar", "_array", "_deriv")
+
+    def __init__(self, source):
+        self.source = source
+        self.uses_x = False
+        self._body = ast.parse(source, mode="eval").body
+        _check_size(self._body)
+        body = _optimize(self._body)
+        self._scalar = self._lower(body, _SCALAR_FUNCS)
+        self.affine = _affine(body)
+        self._array = None
+        self._deriv = None
+
+    def __call__(self, x_value=None):
+        # Cada evaluación (calculadora, gráficos, tangente) cuenta en "eval" del HUD
+        if perf.enabled:
+            t = time.perf_counter()
+            try: return self._eval(x_value)
+            finally: perf.record("eval", time.perf_counter() - t, t)
+        return self._eval(x_value)
+
+    def _eval(self, x_value):
+        if x_value is None or isinstance(x_value, (int, float)):
+            if self.uses_x and x_value is None: raise ValueError("Nombre no permitido: x")
+            return self._scalar(x_value)
+        if self._array is None: self._array = self._lower_array()
+        x = np.asarray(x_value, dtype=float)
+        with np.errstate(all="ignore"):
+            y = self._array(x)
+        # Una constante (p. ej. "y = 3") también se traza como curva
+        return y if np.ndim(y) else np.full(x.shape, float(y))
+
+    def array_body(self):
+        """AST optimizado para arreglos (con las potencias chicas ya como productos)."""
+        return _optimize(self._body, array=True)
+
+    def _lower_array(self):
+        # Si el programa lineal comparte algo (p. ej. x*x en x**4) se usa él;
+        # si no, el árbol de closures hace lo mismo con menos indirección
+        body = self.array_body()
+        prog = _Program([body])
+        if len(prog) < _count_ops(body):
+            out = prog.outputs[0]; return lambda x: prog.run(x)[out]
+        return self._lower(body, _ARRAY_FUNCS)
+
+    def derivative(self):
+        """d/dx exacta, también compilada (y cacheada) como expresión."""
+        if self._deriv is None:
+            res = _compile_cached(ast.unparse(_diff(self._body)))
+            if isinstance(res, Exception): raise type(res)(*res.args)
+            self._deriv = res
+        return self._deriv
+
+    def value_and_slope(self, x_value):
+        return self(x_value), self.derivative()(x_value)
+
+    def _lower(self, n, funcs):
+        if isinstance(n, ast.Constant):
+            if isinstance(n.value, (int,float)): return _const(n.value)
+            raise ValueError("Constante no numérica")
+        if isinstance(n, ast.BinOp) and type(n.op) in _ALLOWED_OPS:
+            op = _ALLOWED_OPS[type(n.op)]
+            left, right = self._lower(n.left, funcs), self._lower(n.right, funcs)
+            # Con arreglos lo que quedó sin plegar (1/0) vale inf/nan, como en _Program
+            if funcs is _ARRAY_FUNCS and getattr(left, "const", False) and getattr(right, "const", False):
+                v = _array_fold(op, left(None), right(None))
+                if v is not None: return _const(v)
+            # Lado constante: se evita una llamada por evaluación
+            if getattr(right, "const", False):
+                c = right(None); return lambda x: op(left(x), c)
+            if getattr(left, "const", False):
+                c = left(None); return lambda x: op(c, right(x))
+            return lambda x: op(left(x), right(x))
+        if isinstance(n, ast.UnaryOp) and type(n.op) in _ALLOWED_OPS:
+            op = _ALLOWED_OPS[type(n.op)]; arg = self._lower(n.operand, funcs)
+            if funcs is _ARRAY_FUNCS and getattr(arg, "const", False):
+                v = _array_fold(op, arg(None))
+                if v is not None: return _const(v)
+            return lambda x: op(arg(x))
+        if isinstance(n, ast.Name) or _np_attr(n):
+            name = _np_attr(n) or n.id
+            if name == "x" and isinstance(n, ast.Name):
+                self.uses_x = True; return lambda x: x
+            if name in _CONSTS: return _const(_CONSTS[name])
+            raise ValueError(f"Nombre no permitido: {name}")
+        if isinstance(n, ast.Call) and (isinstance(n.func, ast.Name) or _np_attr(n.func)):
+            fname = _np_attr(n.func) or n.func.id
+            if fname not in funcs: raise ValueError(f"Función no permitida: {fname}")
+            # log(a, b) ya llega como log(a)/log(b) (ver _optimize): el resto es de un argumento
+            if len(n.args) != 1: raise ValueError(f"Cantidad de argumentos inválida: {fname}")
+            fn = funcs[fname]; a0 = self._lower(n.args[0], funcs)
+            if funcs is _ARRAY_FUNCS and getattr(a0, "const", False):
+                v = _array_fold(fn, a0(None))
+                if v is not None: return _const(v)
+            return lambda x: fn(a0(x))
+        raise ValueError("Expresión no permitida")
+
+# -------- Optimizador sobre el AST de la lista blanca --------
+def _number(n):
+    """Valor si `n` es una constante numérica ya plegada; None si no."""
+    return n.value if isinstance(n, ast.Constant) and type(n.value) in (int, float) else None
+
+def _fold(fn, *args):
+    """Aplica fn a constantes; None si falla (el error aparece igual al evaluar)."""
+    try: v = fn(*args)
+    except (ArithmeticError, ValueError, TypeError): return None
+    return ast.Constant(v) if type(v) in (int, float) else None
+
+def _array_fold(fn, *args):
+    """fn sobre constantes con la semántica de los arreglos (1/0 → inf, no excepción).
+
+    Solo le llega lo que `_fold` no pudo plegar; None si ni así se puede
+    (p. ej. un entero que no entra en float64)."""
+    try:
+        with np.errstate(all="ignore"): v = fn(*[np.float64(a) for a in args])
+    except (ArithmeticError, ValueError, TypeError): return None
+    return float(v)
+
+# Potencias con exponente chico: productos (con CSE, x**4 son dos multiplicaciones)
+def _square(u): return ast.BinOp(u, ast.Mult(), u)
+_POW_REDUCE = {
+    2:   _square,
+    3:   lambda u: ast.BinOp(_square(u), ast.Mult(), u),
+    4:   lambda u: _square(_square(u)),
+    -1:  lambda u: ast.BinOp(ast.Constant(1), ast.Div(), u),
+    -2:  lambda u: ast.BinOp(ast.Constant(1), ast.Div(), _square(u)),
+    0.5: lambda u: _call("sqrt", u),
+}
+
+def _optimize(n, array=False):
+    """Pliega constantes e identidades; con `array`, además reduce potencias.
+
+    No toca lo que no sabe validar: nombres o funciones fuera de la lista
+    blanca siguen ahí para que `_lower` los rechace. Las potencias solo se
+    reducen para arreglos: en escalares x*x no desborda igual que x**2."""
+    if isinstance(n, ast.Name) or _np_attr(n):
+        name = _np_attr(n) or n.id
+        return ast.Constant(_CONSTS[name]) if name in _CONSTS else n
+    if isinstance(n, ast.UnaryOp) and isinstance(n.op, ast.USub):
+        u = _optimize(n.operand, array); v = _number(u)
+        if v is not None: return ast.Constant(-v)
+        if isinstance(u, ast.UnaryOp) and isinstance(u.op, ast.USub): return u.operand
+        return ast.UnaryOp(ast.USub(), u)
+    if isinstance(n, ast.BinOp) and type(n.op) in _ALLOWED_OPS:
+        a, b = _optimize(n.left, array), _optimize(n.right, array)
+        va, vb = _number(a), _number(b)
+        if va is not None and vb is not None:
+            folded = _fold(_ALLOWED_OPS[type(n.op)], va, vb)
+            if folded is not None: return folded
+        op = n.op
+        if isinstance(op, ast.Add):
+            if va == 0: return b
+            if vb == 0: return a
+        elif isinstance(op, ast.Sub):
+            if vb == 0: return a
+            if va == 0: return _optimize(ast.UnaryOp(ast.USub(), b), array)
+        elif isinstance(op, ast.Mult):
+            if va == 1: return b
+            if vb == 1: return a
+            if va == -1: return _optimize(ast.UnaryOp(ast.USub(), b), array)
+            if vb == -1: return _optimize(ast.UnaryOp(ast.USub(), a), array)
+            # c1*(c2*u) → (c1*c2)*u, p. ej. 2*(0.5*x)
+            if va is not None and isinstance(b, ast.BinOp) and isinstance(b.op, ast.Mult) and _number(b.left) is not None:
+                c = _fold(_safe_mul, va, _number(b.left))
+                if c is not None: return ast.BinOp(c, ast.Mult(), b.right)
+        elif isinstance(op, ast.Div):
+            if vb == 1: return a
+        elif isinstance(op, ast.Pow):
+            if vb == 1: return a
+            if array and vb in _POW_REDUCE: return _POW_REDUCE[vb](a)
+        return ast.BinOp(a, op, b)
+    if isinstance(n, ast.Call):
+        fname = _fname(n)
+        if fname == "log" and len(n.args) == 2:
+            # Logaritmo en base b: en arreglos el 2.º argumento de la ufunc sería `out=`
+            log_a, log_b = (ast.Call(n.func, [a], []) for a in n.args)
+            return _optimize(ast.BinOp(log_a, ast.Div(), log_b), array)
+        args = [_optimize(a, array) for a in n.args]
+        vals = [_number(a) for a in args]
+        if args and None not in vals and fname in _SCALAR_FUNCS:
+            folded = _fold(_SCALAR_FUNCS[fname], *vals)
+            if folded is not None: return folded
+        return ast.Call(n.func, args, [])
+    return n
+
+def _affine(n):
+    """(m, b) si el AST optimizado es m·x + b; None si no."""
+    v = _number(n)
+    if v is not None:
+        try: return (0.0, float(v))
+        except OverflowError: return None             # entero que no entra en un float
+    if isinstance(n, ast.Name) and n.id == "x": return (1.0, 0.0)
+    if isinstance(n, ast.UnaryOp) and isinstance(n.op, ast.USub):
+        u = _affine(n.operand)
+        return (-u[0], -u[1]) if u else None
+    if not isinstance(n, ast.BinOp) or not isinstance(n.op, (ast.Add, ast.Sub, ast.Mult, ast.Div)): return None
+    a, b = _affine(n.left), _affine(n.right)
+    if a is None or b is None: return None
+    if isinstance(n.op, ast.Add):   m, c = a[0] + b[0], a[1] + b[1]
+    elif isinstance(n.op, ast.Sub): m, c = a[0] - b[0], a[1] - b[1]
+    elif isinstance(n.op, ast.Mult):
+        if a[0] and b[0]: return None                  # x·x ya no es recta
+        k, u = (a[1], b) if not a[0] else (b[1], a)
+        m, c = k * u[0], k * u[1]
+    else:
+        if b[0] or not b[1]: return None               # dividir por x (o por 0)
+        m, c = a[0] / b[1], a[1] / b[1]
+    return (m, c) if math.isfinite(m) and math.isfinite(c) else None
+
+# -------- Derivada simbólica sobre el AST de la lista blanca --------
+def _num(v):
+    return ast.UnaryOp(ast.USub(), ast.Constant(-v)) if v < 0 else ast.Constant(v)
+
+def _is_num(n, v):
+    return isinstance(n, ast.Constant) and n.value == v
+
+def _has_x(n):
+    return any(isinstance(c, ast.Name) and c.id == "x" for c in ast.walk(n))
+
+def _const_value(n):
+    if isinstance(n, ast.Constant): return n.value
+    if isinstance(n, ast.UnaryOp) and isinstance(n.op, ast.USub) and isinstance(n.operand, ast.Constant):
+        return -n.operand.value
+    return None
+
+def _neg(a):
+    return a if _is_num(a, 0) else ast.UnaryOp(ast.USub(), a)
+
+def _add(a, b):
+    if _is_num(a, 0): return b
+    if _is_num(b, 0): return a
+    return ast.BinOp(a, ast.Add(), b)
+
+def _sub(a, b):
+    if _is_num(b, 0): return a
+    if _is_num(a, 0): return _neg(b)
+    return ast.BinOp(a, ast.Sub(), b)
+
+def _mul(a, b):
+    if _is_num(a, 0) or _is_num(b, 0): return ast.Constant(0)
+    if _is_num(a, 1): return b
+    if _is_num(b, 1): return a
+    return ast.BinOp(a, ast.Mult(), b)
+
+def _div(a, b):
+    if _is_num(a, 0): return ast.Constant(0)
+    if _is_num(b, 1): return a
+    return ast.BinOp(a, ast.Div(), b)
+
+def _pow(a, b):
+    if _is_num(b, 1): return a
+    if _is_num(b, 0): return ast.Constant(1)
+    return ast.BinOp(a, ast.Pow(), b)
+
+def _call(name, arg):
+    return ast.Call(ast.Name(name, ast.Load()), [arg], [])
+
+def _fname(n):
+    return _np_attr(n.func) or getattr(n.func, "id", None)
+
+# f'(u) en función de u, para cada función de la lista blanca
+_DERIV_RULES = {
+    "sin":    lambda u: _call("cos", u),
+    "cos":    lambda u: _neg(_call("sin", u)),
+    "tan":    lambda u: _div(ast.Constant(1), _pow(_call("cos", u), ast.Constant(2))),
+    "asin":   lambda u: _div(ast.Constant(1), _call("sqrt", _sub(ast.Constant(1), _pow(u, ast.Constant(2))))),
+    "acos":   lambda u: _neg(_div(ast.Constant(1), _call("sqrt", _sub(ast.Constant(1), _pow(u, ast.Constant(2)))))),
+    "atan":   lambda u: _div(ast.Constant(1), _add(ast.Constant(1), _pow(u, ast.Constant(2)))),
+    "sqrt":   lambda u: _div(ast.Constant(1), _mul(ast.Constant(2), _call("sqrt", u))),
+    "log":    lambda u: _div(ast.Constant(1), u),
+    "log10":  lambda u: _div(ast.Constant(1), _mul(u, _call("log", ast.Constant(10)))),
+    "exp":    lambda u: _call("exp", u),
+    "abs":    lambda u: _div(u, _call("abs", u)),
+}
+_DERIV_RULES.update(arcsin=_DERIV_RULES["asin"], arccos=_DERIV_RULES["acos"], arctan=_DERIV_RULES["atan"])
+
+def _diff(n):
+    """Devuelve el AST de dn/dx (n ya pasó la validación de CompiledExpr)."""
+    if not _has_x(n): return ast.Constant(0)
+    if isinstance(n, ast.Name): return ast.Constant(1)
+    if isinstance(n, ast.UnaryOp): return _neg(_diff(n.operand))
+    if isinstance(n, ast.BinOp):
+        u, v = n.left, n.right
+        du, dv = _diff(u), _diff(v)
+        if isinstance(n.op, ast.Add): return _add(du, dv)
+        if isinstance(n.op, ast.Sub): return _sub(du, dv)
+        if isinstance(n.op, ast.Mult): return _add(_mul(du, v), _mul(u, dv))
+        if isinstance(n.op, ast.Div):
+            if not _has_x(v): return _div(du, v)
+            return _div(_sub(_mul(du, v), _mul(u, dv)), _pow(v, ast.Constant(2)))
+        if isinstance(n.op, ast.Pow):
+            if not _has_x(v):
+                k = _const_value(v)
+                expo = _num(k - 1) if k is not None else _sub(v, ast.Constant(1))
+                return _mul(_mul(v, _pow(u, expo)), du)
+            if not _has_x(u): return _mul(_mul(n, _call("log", u)), dv)
+            return _mul(n, _add(_mul(dv, _call("log", u)), _div(_mul(v, du), u)))
+        if isinstance(n.op, ast.Mod):
+            # u % v = u - v*floor(u/v): la parte entera es constante a trozos
+            if not _has_x(v): return du
+            return _sub(du, _mul(_div(_sub(u, n), v), dv))
+    if isinstance(n, ast.Call):
+        name = _fname(n)
+        if len(n.args) == 2 and name == "log":
+            return _diff(_div(_call("log", n.args[0]), _call("log", n.args[1])))
+        if name in _DERIV_RULES and len(n.args) == 1:
+            u = n.args[0]
+            return _mul(_DERIV_RULES[name](u), _diff(u))
+    raise ValueError("No se puede derivar la expresión")
+
+def _check_size(tree):
+    stack, count = [(tree, 1)], 0
+    while stack:
+        n, depth = stack.pop(); count += 1
+        if count > MAX_EXPR_NODES: raise ValueError("Expresión demasiado larga")
+        if depth > MAX_EXPR_DEPTH: raise ValueError("Expresión demasiado anidada")
+        stack.extend((c, depth + 1) for c in ast.iter_child_nodes(n))
+
+@functools.lru_cache(maxsize=256)
+def _compile_cached(source):
+    # También se cachean los errores: un texto inválido no se re-parsea en cada tick
+    try: return CompiledExpr(source)
+    except (ValueError, SyntaxError) as err: return err
+    except (RecursionError, MemoryError): return ValueError("Expresión demasiado anidada")
+
+def compile_expr(expr):
+    """Devuelve la expresión compilada (cache LRU por texto normalizado)."""
+    source = _normalize_expr(expr)
+    if len(source) > MAX_EXPR_CHARS: raise ValueError("Expresión demasiado larga")
+    res = _compile_cached(source)
+    if isinstance(res, Exception): raise type(res)(*res.args)
+    return res
+
+def safe_eval_expr(expr: str, x_value=None):
+    return compile_expr(expr)(x_value)
+
+# -------- Programa lineal para arreglos --------
+class _Program:
+    """ASTs (ya validados y optimizados) aplanados a un programa lineal.
+
+    Cada operación es (destino, fn, a, b) sobre una lista de valores; una
+    subexpresión repetida (mismo operador y mismos operandos, p. ej. x*x en
+    x**4, o sin(x) en f y en f') ocupa un solo lugar y se calcula una vez."""
+    def __init__(self, bodies):
+        self._slots = {}            # clave → índice en `vals`
+        self._init = [None]         # slot 0 = x; el resto: constantes ya calculadas
+        self._ops = []              # (destino, fn, slot a, slot b o None)
+        self._const = set()
+        self.outputs = [self._emit(b) for b in bodies]
+
+    def _slot(self, key, value=None, fn=None, args=()):
+        idx = self._slots.get(key)
+        if idx is None:
+            idx = self._slots[key] = len(self._init); self._init.append(value)
+            if fn is None: self._const.add(idx)
+            else: self._ops.append((idx, fn, args[0], args[1] if len(args) > 1 else None))
+        return idx
+
+    def _emit(self, n):
+        if isinstance(n, ast.Constant): return self._slot(("c", n.value), n.value)
+        if isinstance(n, ast.Name) or _np_attr(n):
+            name = _np_attr(n) or n.id
+            return 0 if name == "x" else self._slot(("c", _CONSTS[name]), _CONSTS[name])
+        if isinstance(n, ast.BinOp):
+            fn, args = _ALLOWED_OPS[type(n.op)], (self._emit(n.left), self._emit(n.right))
+        elif isinstance(n, ast.UnaryOp):
+            fn, args = _ALLOWED_OPS[type(n.op)], (self._emit(n.operand),)
+        else:
+            fn, args = _ARRAY_FUNCS[_fname(n)], tuple(self._emit(a) for a in n.args)
+        if all(a in self._const for a in args):
+            # Todo constante: se pliega ahora y no cuesta nada por evaluación
+            value = _array_fold(fn, *[self._init[a] for a in args])
+            if value is not None: return self._slot(("c", value), value)
+        return self._slot((fn, args), fn=fn, args=args)
+
+    def __len__(self):
+        return len(self._ops)
+
+    def run(self, x):
+        """Lista de valores de todos los slots (llamar dentro de np.errstate)."""
+        vals = self._init.copy(); vals[0] = x
+        for dst, fn, a, b in self._ops:
+            vals[dst] = fn(vals[a]) if b is None else fn(vals[a], vals[b])
+        return vals
+
+def _count_ops(n):
+    """Operaciones del árbol contando cada aparición (sin compartir nada)."""
+    if isinstance(n, ast.BinOp): return 1 + _count_ops(n.left) + _count_ops(n.right)
+    if isinstance(n, ast.UnaryOp): return 1 + _count_ops(n.operand)
+    if isinstance(n, ast.Call): return 1 + sum(_count_ops(a) for a in n.args)
+    return 0
+
+# -------- Varias expresiones sobre la misma malla --------
+class ExprBatch:
+    """Lote de expresiones evaluadas juntas: `batch(x)` → arreglo (k, n).
+
+    Las expresiones van a un único `_Program`, así que lo que compartan
+    (p. ej. sin(x) en f y en f') se calcula una sola vez por evaluación."""
+    def __init__(self, exprs):
+        self.exprs = [e if isinstance(e, CompiledExpr) else compile_expr(e) for e in exprs]
+        self._prog = _Program([e.array_body() for e in self.exprs])
+        self.outputs = self._prog.outputs
+
+    def __len__(self):
+        return len(self.exprs)
+
+    def __call__(self, x_value):
+        with perf.span("eval"):
+            x = np.asarray(x_value, dtype=float)
+            with np.errstate(all="ignore"): vals = self._prog.run(x)
+        out = np.empty((len(self.outputs), x.size))
+        for row, slot in zip(out, self.outputs): row[:] = vals[slot]
+        return out
+
+@functools.lru_cache(maxsize=64)
+def compile_batch(sources):
+    """ExprBatch cacheado por tupla de textos (ya normalizados o no)."""
+    return ExprBatch([compile_expr(s) for s in sources])
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""
+Lógica de juego sin interfaz.
+
+- `DerivGame`: preguntas de 'Derivando con Borre' y su máquina de estados
+  (nivel, vidas, huesitos, racha de jefe).
+- `PointGame`: el minijuego de colocar puntos de la Graficadora.
+
+Las vistas de Tk solo traducen los eventos que devuelven estos objetos a
+mensajes, animaciones y cuadros de diálogo.
+"""
+
+import math, random
+from dataclasses import dataclass, field
+
+from .expr import compile_expr
+from .points import PointIndex
+
+FUNCS = [
+    ("x",           "Recta"),
+    ("2*x+1",       "Recta inclinada"),
+    ("x**2",        "Parábola"),
+    ("-0.5*x**2+4", "Parábola invertida"),
+    ("x**3/8",      "Cúbica suave"),
+    ("sin(x)",      "Seno"),
+    ("cos(x)",      "Coseno"),
+]
+
+START_LIVES = 3
+BOSS_AFTER  = 5      # aciertos para que aparezca el jefe
+BOSS_STREAK = 2      # aciertos seguidos para vencerlo
+FLAT_EPS    = 1e-2   # |f'(x0)| por debajo de esto cuenta como "Plana (0)"
+
+SIGN_OPTIONS = {
+    "Plana (0)": ["Plana (0)", "Positiva", "Negativa", "No se puede"],
+    "Positiva":  ["Positiva", "Negativa", "Plana (0)", "No se puede"],
+    "Negativa":  ["Negativa", "Positiva", "Plana (0)", "No se puede"],
+}
+
+def slope(func, x0):
+    """f'(x0) exacta (derivada simbólica compilada)."""
+    return float(compile_expr(func).derivative()(x0))
+
+def slope_sign(m):
+    if abs(m) < FLAT_EPS: return "Plana (0)"
+    return "Positiva" if m > 0 else "Negativa"
+
+@dataclass
+class Question:
+    func: str
+    x0: float
+    mode: str                 # "signo" | "valor"
+    prompt: str
+    options: list
+    answer: str
+    events: list = field(default_factory=list)   # "jefe" si con esta pregunta empieza el jefe
+
+@dataclass
+class AnswerResult:
+    ok: bool
+    answer: str
+    events: list = field(default_factory=list)   # "hueso", "vida", "fin", "nivel"
+
+class DerivGame:
+    """Estado de una partida de 'Derivando con Borre'.
+
+    Con `bank` (un cerebrino.bank.QuestionBank) las preguntas salen del banco
+    precalculado según el nivel; sin él se generan al vuelo."""
+    def __init__(self, funcs=FUNCS, rng=None, bank=None):
+        self.funcs = funcs
+        self.rng = rng or random
+        self.bank = bank
+        self.mode = "signo"          # modo elegido por el jugador
+        self.question = None
+        self.boss_toggle = 0
+        self.reset()
+
+    def reset(self):
+        self.level = 1; self.lives = START_LIVES; self.bones = 0
+        self.score = 0; self.in_boss = False; self.boss_streak = 0
+
+    # -------- preguntas
+    def new_question(self, force_mode=False):
+        events = []
+        if not self.in_boss and self.score >= BOSS_AFTER:
+            self.in_boss = True; self.mode = "signo"
+            events.append("jefe")
+
+        m = self.mode
+        if self.in_boss:
+            m = "signo" if self.boss_toggle % 2 == 0 else "valor"
+            self.boss_toggle += 1
+
+        if self.bank is not None:
+            q = self.bank.draw(m, self.level, self.rng)
+        else:
+            func, _ = self.rng.choice(self.funcs)
+            x0 = round(self.rng.uniform(-3, 3), 1)
+            q = self._q_signo(func, x0) if m == "signo" else self._q_valor(func, x0)
+        q.events = events
+        self.question = q
+        return q
+
+    def _q_signo(self, func, x0):
+        answer = slope_sign(slope(func, x0))
+        opciones = list(SIGN_OPTIONS[answer]); self.rng.shuffle(opciones)
+        return Question(func, x0, "signo", f"En y = {func} y en x = {x0}, ¿la pendiente es…?", opciones, answer)
+
+    def _q_valor(self, func, x0):
+        corr = round(slope(func, x0), 1)
+        opciones = {corr}
+        while len(opciones) < 4:
+            delta = self.rng.choice([0.1, 0.2, 0.3, 0.5, 1.0]) * self.rng.choice([-1,1])
+            opciones.add(round(corr + delta, 1))
+        opciones = [str(o) for o in opciones]; self.rng.shuffle(opciones)
+        return Question(func, x0, "valor", f"Velocidad de Borre: estima f'(x) en x = {x0}", opciones, f"{corr}")
+
+    # -------- respuestas
+    def answer(self, text):
+        correct = self.question.answer
+        res = AnswerResult(text == correct, correct)
+        if res.ok:
+            if self.in_boss:
+                self.boss_streak += 1
+                if self.boss_streak >= BOSS_STREAK:
+                    self.boss_streak = 0
+                    self.level += 1; self.score = 0; self.in_boss = False
+                    res.events.append("nivel")
+            else:
+                self.score += 1; self.bones += 1
+                res.events.append("hueso")
+        else:
+            self.lives -= 1
+            res.events.append("vida")
+            if self.lives <= 0:
+                self.reset(); res.events.append("fin")
+            if self.in_boss: self.boss_streak = 0
+        return res
+
+    def reset_level(self):
+        self.score = 0; self.in_boss = False
+
+    # -------- guardar / reanudar
+    STATE_KEYS = ("level", "lives", "bones", "score", "in_boss", "boss_streak", "boss_toggle", "mode")
+
+    def snapshot(self):
+        return {k: getattr(self, k) for k in self.STATE_KEYS}
+
+    def restore(self, state):
+        for k in self.STATE_KEYS:
+            if k in state: setattr(self, k, state[k])
+
+    # -------- textos para la vista
+    @property
+    def state_text(self):
+        return f"Nivel {self.level}  |  Vidas: {self.lives}  |  Huesitos: {self.bones}"
+
+    @property
+    def streak_text(self):
+        return f"Racha: {self.score}/{BOSS_AFTER} para Jefe"
+
+class PointGame:
+    """Minijuego: colocar un punto cerca de la meta (tx, ty)."""
+    HIT_RADIUS = 0.6
+
+    def __init__(self, rng=None):
+        self.rng = rng or random
+        self.score = 0
+        self.target = None
+        self.points = PointIndex()   # intentos de la meta actual (x, y, ok)
+
+    def new_goal(self):
+        self.target = (self.rng.randint(-5, 5), self.rng.randint(-5, 5))
+        self.points.clear()
+        return self.target
+
+    def clear(self):
+        self.points.clear()
+
+    def closest(self):
+        """Distancia del intento más cercano a la meta (inf si no hay intentos)."""
+        return self.points.nearest(*self.target)[1]
+
+    def snapshot(self):
+        return {"score": self.score}
+
+    def restore(self, state):
+        self.score = state.get("score", self.score)
+
+    def click(self, px, py):
+        """Registra un clic; si acierta suma un punto y pasa a una meta nueva."""
+        tx, ty = self.target
+        ok = math.hypot(px - tx, py - ty) <= self.HIT_RADIUS
+        self.points.add(px, py, ok)
+        if ok:
+            self.score += 1
+            self.new_goal()
+        return ok
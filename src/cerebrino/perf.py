@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+Instrumentación opcional de los caminos calientes.
+
+Apagada (por defecto) `span()` devuelve un objeto vacío compartido: el
+costo es una consulta a una variable global. Encendida, cada tramo suma a
+un contador y a un histograma logarítmico por nombre, y queda en un buffer
+circular de eventos que se puede exportar a JSON o CSV.
+
+    from cerebrino import perf
+    perf.enable()                      # o CEREBRINO_PERF=1
+    with perf.span("muestreo"): ...
+    perf.summary()                     # {nombre: {n, media_ms, p50_ms, p95_ms, max_ms}}
+    perf.export("traza.json")          # o .csv
+"""
+
+import csv, json, math, os, time
+from collections import deque
+
+BUCKETS    = 32          # cubetas potencia de 2 desde 1 µs (la última junta todo lo > ~35 min)
+MAX_EVENTS = 20000
+
+enabled = os.environ.get("CEREBRINO_PERF") == "1"
+
+class Histogram:
+    """Conteo, suma, máximo y cubetas log2 en microsegundos."""
+    __slots__ = ("n", "total", "max", "buckets")
+
+    def __init__(self):
+        self.n = 0; self.total = 0.0; self.max = 0.0
+        self.buckets = [0] * BUCKETS
+
+    def add(self, dt):
+        self.n += 1; self.total += dt
+        if dt > self.max: self.max = dt
+        self.buckets[min(max(math.frexp(dt * 1e6)[1], 0), BUCKETS - 1)] += 1
+
+    def quantile(self, q):
+        """Cota superior (s) de la cubeta donde cae el cuantil q."""
+        if not self.n: return 0.0
+        rank, acc = q * self.n, 0
+        for b, c in enumerate(self.buckets):
+            acc += c
+            if acc >= rank: return min(2.0 ** b * 1e-6, self.max)
+        return self.max
+
+    def summary(self):
+        ms = lambda s: round(s * 1e3, 3)
+        return {"n": self.n, "media_ms": ms(self.total / self.n) if self.n else 0.0,
+                "p50_ms": ms(self.quantile(0.5)), "p95_ms": ms(self.quantile(0.95)), "max_ms": ms(self.max)}
+
+_hists = {}
+_counters = {}
+_events = deque(maxlen=MAX_EVENTS)
+_t0 = time.perf_counter()
+
+class _Span:
+    __slots__ = ("name", "t")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.t = time.perf_counter(); return self
+
+    def __exit__(self, *exc):
+        record(self.name, time.perf_counter() - self.t, self.t)
+
+class _NullSpan:
+    __slots__ = ()
+    def __enter__(self): return self
+    def __exit__(self, *exc): pass
+
+_NULL = _NullSpan()
+
+def span(name):
+    """Context manager que mide el bloque (sin costo si está apagado)."""
+    return _Span(name) if enabled else _NULL
+
+def record(name, dt, start=None):
+    """Suma una duración (s) ya medida."""
+    if not enabled: return
+    h = _hists.get(name)
+    if h is None: h = _hists[name] = Histogram()
+    h.add(dt)
+    _events.append((round(((start if start is not None else time.perf_counter() - dt) - _t0) * 1e3, 3), name, dt))
+
+def count(name, n=1):
+    if enabled: _counters[name] = _counters.get(name, 0) + n
+
+def enable(on=True):
+    global enabled
+    enabled = on
+
+def reset():
+    _hists.clear(); _counters.clear(); _events.clear()
+
+def last(name, default=None):
+    """Resumen de un nombre (o `default` si todavía no hay datos)."""
+    h = _hists.get(name)
+    return h.summary() if h else default
+
+def summary():
+    return {name: h.summary() for name, h in sorted(_hists.items())}
+
+def export(path):
+    """Escribe la traza: .csv con un evento por fila, si no JSON con resumen y eventos."""
+    if path.endswith(".csv"):
+        with open(path, "w", newline="", encoding="utf-8") as fh:
+            w = csv.writer(fh); w.writerow(["t_ms", "nombre", "ms"])
+            for t, name, dt in list(_events): w.writerow([t, name, round(dt * 1e3, 4)])
+    else:
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump({"resumen": summary(), "contadores": dict(_counters),
+                       "eventos": [{"t_ms": t, "nombre": n, "ms": round(dt * 1e3, 4)} for t, n, dt in list(_events)]},
+                      fh, ensure_ascii=False, indent=1)
+    return path
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+Puntos colocados en el minijuego, en arreglos y con un índice de grilla.
+
+Las coordenadas viven en un arreglo que crece por duplicación (la vista lo
+pasa tal cual a un único scatter) y cada punto se anota en la celda de una
+grilla uniforme. Buscar el más cercano recorre anillos de celdas alrededor
+de la consulta, así que cuesta lo mismo con 10 puntos que con 10 000.
+"""
+
+import math
+import numpy as np
+
+class PointIndex:
+    """Puntos (x, y, ok) con búsqueda del vecino más cercano por grilla."""
+    def __init__(self, cell=1.0, capacity=64):
+        self.cell = self._cell0 = cell
+        self._xy = np.empty((capacity, 2))
+        self._ok = np.zeros(capacity, dtype=bool)
+        self.n = 0
+        self._grid = {}          # (i, j) → [índices]
+        self._span = None        # celdas extremas ocupadas: (imin, jmin, imax, jmax)
+
+    def __len__(self):
+        return self.n
+
+    def __iter__(self):
+        return ((float(x), float(y), bool(ok)) for (x, y), ok in zip(self.xy, self.ok))
+
+    @property
+    def xy(self):
+        return self._xy[:self.n]
+
+    @property
+    def ok(self):
+        return self._ok[:self.n]
+
+    def _key(self, x, y):
+        return math.floor(x / self.cell), math.floor(y / self.cell)
+
+    def add(self, x, y, ok=False):
+        if self.n == len(self._xy):
+            self._xy = np.resize(self._xy, (2 * self.n, 2)); self._ok = np.resize(self._ok, 2 * self.n)
+            # Celdas muy pobladas: se achican (amortizado, solo al duplicar). Si achicar
+            # no reparte nada (puntos repetidos) se deshace y se deja de subdividir.
+            while self.n > 8 * len(self._grid):
+                cells = len(self._grid); self._rebuild(self.cell / 2)
+                if len(self._grid) <= cells:
+                    self._rebuild(self.cell * 2); break
+        i = self.n; self.n += 1
+        self._xy[i] = x, y; self._ok[i] = ok
+        self._insert(i)
+        return i
+
+    def _insert(self, i):
+        key = self._key(*self._xy[i])
+        self._grid.setdefault(key, []).append(i)
+        s = self._span
+        self._span = (key + key) if s is None else (min(s[0], key[0]), min(s[1], key[1]), max(s[2], key[0]), max(s[3], key[1]))
+
+    def _rebuild(self, cell):
+        self.cell = cell; self._grid = {}; self._span = None
+        for i in range(self.n): self._insert(i)
+
+    def clear(self):
+        self.n = 0; self._grid = {}; self._span = None; self.cell = self._cell0
+
+    def nearest(self, x, y):
+        """(índice, distancia) del punto más cercano a (x, y); (None, inf) si no hay."""
+        if not self.n: return None, math.inf
+        ci, cj = self._key(x, y)
+        span = self._span; imin, jmin, imax, jmax = span
+        # Pocos puntos, o consulta fuera de la zona ocupada (habría que recorrerla
+        # entera): una pasada vectorizada sobre el arreglo es más barata
+        if self.n <= 32 or not (imin <= ci <= imax and jmin <= cj <= jmax): return self._brute(x, y)
+        last = max(ci - imin, imax - ci, cj - jmin, jmax - cj)
+        best, best_d = None, math.inf
+        grid = self._grid
+        for r in range(last + 1):
+            idx = [i for key in self._ring(ci, cj, r, span) for i in grid.get(key, ())]
+            if idx:
+                d = np.hypot(self._xy[idx, 0] - x, self._xy[idx, 1] - y); k = int(np.argmin(d))
+                if d[k] < best_d: best, best_d = idx[k], float(d[k])
+            # Lo que quede en anillos más lejanos está al menos a r celdas
+            if best_d <= r * self.cell: break
+        return best, best_d
+
+    def _brute(self, x, y):
+        d = np.hypot(self.xy[:, 0] - x, self.xy[:, 1] - y)
+        i = int(np.argmin(d)); return i, float(d[i])
+
+    @staticmethod
+    def _ring(ci, cj, r, span):
+        """Celdas del anillo r alrededor de (ci, cj), recortadas a la zona ocupada."""
+        imin, jmin, imax, jmax = span
+        if r == 0:
+            yield ci, cj; return
+        i0, i1 = max(ci - r, imin), min(ci + r, imax)
+        for j in (cj - r, cj + r):
+            if jmin <= j <= jmax:
+                for i in range(i0, i1 + 1): yield i, j
+        j0, j1 = max(cj - r + 1, jmin), min(cj + r - 1, jmax)
+        for i in (ci - r, ci + r):
+            if imin <= i <= imax:
+                for j in range(j0, j1 + 1): yield i, j
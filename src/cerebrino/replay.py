@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+"""
+Sesiones con semilla: grabar lo que hace el jugador y reproducirlo sin Tk.
+
+Cada sesión tiene una semilla y cada juego saca de ella su propio generador
+(`session_rng(semilla, "derivando")`), así que dos sesiones con la misma
+semilla y las mismas entradas ven las mismas preguntas y las mismas metas.
+`Recorder` anota cada entrada (respuesta elegida, slider, clic, función
+escrita, pan/zoom) como `[t_ms, código, *args]` junto con lo que se vio en
+pantalla; `Replayer` le pasa esas entradas al motor a toda velocidad,
+compara lo que sale con lo grabado y rehace el trabajo de los gráficos
+(tramos, muestreo, pendiente) para medir el rendimiento con sesiones reales.
+
+    PYTHONPATH=src python -m cerebrino.replay ~/.cerebrino/trazas/            # reproduce y verifica
+    PYTHONPATH=src python -m cerebrino.replay --sinteticas 2000 --eventos 300  # carga con sesiones generadas
+
+Códigos de evento:
+    dq modo func x0          nueva pregunta (modo elegido; func y x0 que salieron)
+    da elegida ok            respuesta
+    dx x0                    slider x0 (tangente y, si cambió la función, la curva)
+    dr                       reiniciar nivel
+    de estado banco          jugador nuevo: partida nueva con su estado guardado
+    db banco                 llegó el banco de preguntas (banco = cantidad de preguntas)
+    gp x1 x2 yvista preview func recta derivada comparar     render de la graficadora
+    gg tx ty                 meta nueva
+    gc x y ok                clic en el gráfico
+    gl                       borrar puntos
+    ge puntaje               jugador nuevo en la graficadora
+"""
+
+import argparse, glob, gzip, hashlib, json, os, random, sys, time
+
+from .expr import compile_expr
+from .sampling import sample_curve, curve_ylim
+from .tiles import TileCache
+from .game import FUNCS, DerivGame, PointGame
+
+VERSION = 1
+
+def session_rng(seed, stream):
+    """Generador propio de un juego dentro de la sesión (no depende del orden de uso)."""
+    return random.Random(f"{seed}/{stream}")
+
+def default_dir():
+    return os.environ.get("CEREBRINO_TRAZAS") or os.path.join(os.path.expanduser("~"), ".cerebrino", "trazas")
+
+# ==========================
+#   GRABACIÓN
+# ==========================
+class Recorder:
+    """Semilla de la sesión y eventos de entrada con su momento (ms desde el inicio)."""
+    def __init__(self, seed=None, player=None):
+        self.seed = seed if seed is not None else random.SystemRandom().randrange(2**32)
+        self.player = player
+        self.started = time.time()
+        self.events = []
+        self._t0 = time.perf_counter()
+
+    def __len__(self):
+        return len(self.events)
+
+    def rng(self, stream):
+        return session_rng(self.seed, stream)
+
+    def record(self, code, *args):
+        self.events.append([int((time.perf_counter() - self._t0) * 1000), code, *args])
+
+    def trace(self):
+        return {"version": VERSION, "semilla": self.seed, "jugador": self.player,
+                "inicio": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started)), "eventos": self.events}
+
+    def save(self, folder=None):
+        """Guarda la traza comprimida en `folder` (por defecto ~/.cerebrino/trazas); devuelve la ruta."""
+        folder = folder or default_dir()
+        name = "".join(c if c.isalnum() else "_" for c in (self.player or "anonimo"))[:40]
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(self.started))
+        return save_trace(self.trace(), os.path.join(folder, f"{stamp}-{name}-{self.seed}.json.gz"))
+
+def save_trace(trace, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    opener = gzip.open if path.endswith(".gz") else open
+    tmp = path + ".tmp"
+    with opener(tmp, "wt", encoding="utf-8") as fh: json.dump(trace, fh, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
+    return path
+
+def load_trace(path):
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as fh: trace = json.load(fh)
+    if trace.get("version") != VERSION: raise ValueError(f"Versión de traza no soportada: {trace.get('version')}")
+    return trace
+
+# ==========================
+#   REPRODUCCIÓN
+# ==========================
+_bank = None
+
+def default_bank():
+    """El mismo banco que usa la app (el de disco, o uno generado si no hay)."""
+    global _bank
+    if _bank is None:
+        from .bank import QuestionBank, build_bank, default_path
+        try: _bank = QuestionBank.load(default_path())
+        except Exception: _bank = QuestionBank(build_bank(FUNCS))
+    return _bank
+
+class Replayer:
+    """Reproduce una traza sobre el motor y anota dónde difiere de lo grabado."""
+    MAX_REPORTED = 20
+
+    def __init__(self, trace, bank=None):
+        self.trace = trace
+        self.seed = trace["semilla"]
+        self._bank = bank
+        self.game = self.points = None
+        self.tiles = TileCache()
+        self.divergences = []
+        self.n_divergences = 0
+        self._func = self._plotted = None
+        self._hash = hashlib.blake2b(digest_size=12)
+        self._handlers = {"dq": self._dq, "da": self._da, "dx": self._dx, "dr": self._dr, "de": self._de,
+                          "db": self._db, "gp": self._gp, "gg": self._gg, "gc": self._gc, "gl": self._gl,
+                          "ge": self._ge}
+
+    def run(self):
+        t = time.perf_counter()
+        for i, (_, code, *args) in enumerate(self.trace["eventos"]):
+            self._i = i
+            try: self._handlers[code](*args)
+            except KeyError: self._diverge(f"evento desconocido {code!r}")
+            except Exception as err: self._diverge(f"{code}: {type(err).__name__}: {err}")
+        dt = time.perf_counter() - t
+        n = len(self.trace["eventos"])
+        return {"eventos": n, "segundos": round(dt, 4), "eventos_s": round(n / dt) if dt else None,
+                "divergencias": self.n_divergences, "primeras": self.divergences, "huella": self._hash.hexdigest(),
+                "derivando": self.game.snapshot() if self.game else None,
+                "graficadora": self.points.snapshot() if self.points else None}
+
+    def _diverge(self, what):
+        self.n_divergences += 1
+        if len(self.divergences) < self.MAX_REPORTED: self.divergences.append(f"#{self._i} {what}")
+
+    def _expect(self, code, got, want):
+        self._hash.update(repr(got).encode())
+        if got != want: self._diverge(f"{code}: se obtuvo {got!r}, se grabó {want!r}")
+
+    def bank(self, size):
+        if not size: return None
+        bank = self._bank = self._bank or default_bank()
+        if len(bank) != size: self._diverge(f"banco de {len(bank)} preguntas, se grabó uno de {size}")
+        return bank
+
+    # -------- Derivando
+    def _deriv(self):
+        if self.game is None: self.game = DerivGame(FUNCS, rng=session_rng(self.seed, "derivando"))
+        return self.game
+
+    def _dq(self, mode, func, x0):
+        game = self._deriv()
+        game.mode = mode
+        q = game.new_question()
+        self._func = q.func
+        self._expect("dq", (q.func, q.x0), (func, x0))
+
+    def _da(self, chosen, ok):
+        game = self._deriv()
+        if game.question is None: return self._diverge("da: no había pregunta pendiente")
+        res = game.answer(chosen)
+        self._expect("da", res.ok, ok)
+
+    def _dx(self, x0):
+        # Lo mismo que DerivandoFrame._refresh_plot, sin dibujar
+        if self._func is None: return
+        f = compile_expr(self._func)
+        if self._plotted != self._func:
+            sample_curve(f, -6, 6); self._plotted = self._func
+        self._hash.update(repr(tuple(round(float(v), 9) for v in f.value_and_slope(x0))).encode())
+
+    def _dr(self):
+        self._deriv().reset_level()
+
+    def _de(self, state, bank):
+        self.game = DerivGame(FUNCS, rng=session_rng(self.seed, "derivando"), bank=self.bank(bank))
+        self.game.restore(state)
+
+    def _db(self, size):
+        self._deriv().bank = self.bank(size)
+
+    # -------- Graficadora
+    def _pts(self):
+        if self.points is None: self.points = PointGame(rng=session_rng(self.seed, "puntos"))
+        return self.points
+
+    def _gp(self, x1, x2, yview, preview, func, line, deriv, compare):
+        # Lo mismo que GrapherFrame._plot, sin dibujar
+        srcs = [func] + ([f"{line[0]:.2f}*x + {line[1]:.2f}"] if line else [])
+        fs, has_f = [], False
+        for k, src in enumerate(srcs + (["'"] if deriv else []) + list(compare)):
+            try: fs.append(compile_expr(func).derivative() if src == "'" else compile_expr(src)); has_f |= k == 0
+            except Exception: pass
+        data = self.tiles.try_curves(fs, x1, x2, preview=preview)
+        try: ylim = yview or (curve_ylim(*data[0]) if has_f and data[0] is not None else (-10, 10))
+        except Exception: ylim = (-10, 10)
+        self._hash.update(repr(tuple(round(float(v), 9) for v in ylim)).encode())
+
+    def _gg(self, tx, ty):
+        self._expect("gg", list(self._pts().new_goal()), [tx, ty])
+
+    def _gc(self, x, y, ok):
+        pts = self._pts()
+        if pts.target is None: return self._diverge("gc: no había meta")
+        self._expect("gc", pts.click(x, y), ok)
+        pts.closest()
+
+    def _gl(self):
+        self._pts().clear()
+
+    def _ge(self, score):
+        self.points = PointGame(rng=session_rng(self.seed, "puntos"))
+        self.points.restore({"score": score})
+
+def replay(trace, bank=None):
+    return Replayer(trace, bank).run()
+
+# ==========================
+#   SESIONES SINTÉTICAS
+# ==========================
+def synthetic(seed, events=300, accuracy=0.7):
+    """Traza de un alumno simulado, grabada igual que en la app (para pruebas de carga)."""
+    rec = Recorder(seed, player=f"sintetico{seed}")
+    you = random.Random(seed)                        # las decisiones del alumno, aparte del juego
+    game = DerivGame(FUNCS, rng=rec.rng("derivando"))
+    points = PointGame(rng=rec.rng("puntos"))
+    def question(mode):
+        q = game.new_question(); rec.record("dq", mode, q.func, q.x0); rec.record("dx", q.x0)
+        return game.mode
+    mode = question("signo")
+    rec.record("gg", *points.new_goal())
+    view = {"func": you.choice(FUNCS)[0], "x": [-10.0, 10.0], "line": None, "deriv": False, "cmp": []}
+    def render(preview):
+        rec.record("gp", *view["x"], None, preview, view["func"], view["line"], view["deriv"], list(view["cmp"]))
+    for _ in range(events):
+        r = you.random()
+        if r < 0.3:                                  # responder (y la pregunta siguiente)
+            q = game.question
+            chosen = q.answer if you.random() < accuracy else you.choice(q.options)
+            rec.record("da", chosen, game.answer(chosen).ok)
+            mode = question(mode)
+        elif r < 0.4:                                # slider x0
+            rec.record("dx", you.randrange(-12, 13) / 2)
+        elif r < 0.43:                               # cambiar de modo
+            game.mode = mode = "valor" if mode == "signo" else "signo"; mode = question(mode)
+        elif r < 0.75:                               # arrastrar un slider de la graficadora
+            k = you.randrange(4)
+            for _ in range(you.randint(3, 12)):
+                if k == 0: view["x"] = [min(view["x"][0] + you.uniform(-1, 1), view["x"][1] - 1), view["x"][1]]
+                elif k == 1: view["x"] = [view["x"][0], max(view["x"][1] + you.uniform(-1, 1), view["x"][0] + 1)]
+                else: view["line"] = [round(you.uniform(-5, 5), 2), round(you.uniform(-5, 5), 2)]
+                render(True)
+            render(False)
+        elif r < 0.8:                                # escribir otra función / comparar
+            view["func"] = you.choice(FUNCS)[0]
+            if you.random() < 0.3: view["cmp"] = (view["cmp"] + [view["func"]])[-3:]
+            view["deriv"] = you.random() < 0.5
+            render(False)
+        else:                                        # clic cerca de la meta
+            tx, ty = points.target
+            x, y = tx + you.gauss(0, 0.8), ty + you.gauss(0, 0.8)
+            rec.record("gc", x, y, points.click(x, y))      # si acierta, la meta nueva sale sola
+    return rec.trace()
+
+# ==========================
+#   CLI
+# ==========================
+def _paths(args):
+    for a in args:
+        if os.path.isdir(a): yield from sorted(glob.glob(os.path.join(a, "*.json*")))
+        else: yield a
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m cerebrino.replay", description="Reproduce sesiones grabadas sin interfaz.")
+    ap.add_argument("trazas", nargs="*", help="archivos .json/.json.gz o carpetas (por defecto ~/.cerebrino/trazas)")
+    ap.add_argument("--sinteticas", type=int, default=0, metavar="N", help="generar y reproducir N sesiones simuladas")
+    ap.add_argument("--eventos", type=int, default=300, help="entradas por sesión simulada")
+    ap.add_argument("--semilla", type=int, default=0, help="semilla de la primera sesión simulada")
+    ap.add_argument("--guardar", metavar="CARPETA", help="guardar las sesiones simuladas como trazas")
+    ap.add_argument("-v", "--verbose", action="store_true", help="una línea por sesión")
+    args = ap.parse_args(argv)
+
+    if args.sinteticas:
+        t = time.perf_counter()
+        traces = [(f"sintetica-{s}", synthetic(s, args.eventos)) for s in range(args.semilla, args.semilla + args.sinteticas)]
+        print(f"{len(traces)} sesiones simuladas en {time.perf_counter() - t:.1f} s")
+        if args.guardar:
+            for name, tr in traces: save_trace(tr, os.path.join(args.guardar, name + ".json.gz"))
+    else:
+        traces = ((p, load_trace(p)) for p in _paths(args.trazas or [default_dir()]))
+
+    sessions = events = bad = 0; secs = 0.0
+    for name, tr in traces:
+        res = replay(tr)
+        sessions += 1; events += res["eventos"]; secs += res["segundos"]
+        if res["divergencias"]: bad += 1
+        if args.verbose or res["divergencias"]:
+            print(f"  {name}: {res['eventos']} eventos, {res['divergencias']} divergencias, huella {res['huella']}")
+            for d in res["primeras"]: print(f"      {d}")
+    if not sessions:
+        print("No hay trazas para reproducir"); return 1
+    rate = f"{events / secs:,.0f}" if secs else "—"
+    print(f"{sessions} sesiones, {events} eventos en {secs:.2f} s ({rate} eventos/s); {bad} con divergencias")
+    return 1 if bad else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
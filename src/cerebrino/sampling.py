@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+Muestreo adaptativo de curvas y=f(x) para graficar.
+"""
+
+import numpy as np
+
+def _eval_grid(f, x):
+    y = np.array(f(x), dtype=float)
+    y[~np.isfinite(y)] = np.nan
+    return y
+
+def _y_scale(y):
+    """Altura 'visible' de la curva (percentiles, inmune a asíntotas)."""
+    valid = y[np.isfinite(y)]
+    if not valid.size: return 1.0
+    lo, hi = np.percentile(valid, [5, 95])
+    return float(hi - lo) if hi > lo else max(1.0, abs(float(hi)))
+
+def _interval_error(x, y, scale):
+    """Desvío de cada punto interior respecto a la cuerda de sus vecinos, por intervalo."""
+    t = (x[1:-1] - x[:-2]) / (x[2:] - x[:-2])
+    dev = np.abs(y[1:-1] - (y[:-2] + t * (y[2:] - y[:-2]))) / scale
+    dev = np.nan_to_num(dev, nan=0.0)
+    err = np.zeros(x.size - 1)
+    err[:-1] = dev; err[1:] = np.maximum(err[1:], dev)
+    # Un extremo definido y el otro no: ahí empieza/termina el dominio
+    err[np.isfinite(y[:-1]) != np.isfinite(y[1:])] = np.inf
+    return err
+
+def _find_jumps(f, x, y, scale, rounds=12):
+    """Bisecta los saltos grandes; los que no se achican son discontinuidades.
+
+    Devuelve los índices `i` (salto entre x[i-1] y x[i]) y dónde está cada uno."""
+    cand = np.flatnonzero(np.abs(np.diff(y)) > 0.5 * scale)
+    if not cand.size: return cand, x[:0]
+    lo, hi = x[cand].copy(), x[cand + 1].copy()
+    ylo, yhi = y[cand].copy(), y[cand + 1].copy()
+    for _ in range(rounds):
+        mid = (lo + hi) / 2; ym = _eval_grid(f, mid)
+        left = np.abs(ym - ylo) >= np.abs(yhi - ym)
+        hi = np.where(left, mid, hi); yhi = np.where(left, ym, yhi)
+        lo = np.where(left, lo, mid); ylo = np.where(left, ylo, ym)
+    jump = ~(np.abs(yhi - ylo) <= 0.25 * scale)
+    return cand[jump] + 1, (lo[jump] + hi[jump]) / 2
+
+def _break_jumps(f, x, y, scale, rounds=12):
+    """Corta cada discontinuidad insertando un NaN en el punto del salto."""
+    at, where = _find_jumps(f, x, y, scale, rounds)
+    if not at.size: return x, y
+    return np.insert(x, at, where), np.insert(y, at, np.nan)
+
+def _refine(f, x, y, scale, budget, tol=1e-3, rounds=12):
+    """Parte por la mitad los intervalos donde la cuerda se aparta de la curva (hasta `budget` puntos)."""
+    min_dx = (x[-1] - x[0]) * 1e-6
+    for _ in range(rounds):
+        room = budget - x.size
+        if room <= 0: break
+        err = _interval_error(x, y, scale)
+        err[np.diff(x) < min_dx] = 0
+        bad = np.flatnonzero(err > tol)
+        if not bad.size: break
+        if bad.size > room: bad = np.sort(bad[np.argsort(err[bad])[-room:]])
+        xm = (x[bad] + x[bad + 1]) / 2
+        x = np.insert(x, bad + 1, xm); y = np.insert(y, bad + 1, _eval_grid(f, xm))
+    return x, y
+
+def sample_curve(f, x1, x2, budget=600, coarse=33, tol=1e-3, rounds=12):
+    """Muestrea y=f(x) en [x1, x2] refinando solo donde hay curvatura o saltos.
+
+    Una recta conocida (`affine`) son dos puntos y otra recta se queda en la
+    malla gruesa; el resto se refina por tandas vectorizadas hasta `budget`
+    puntos. Las asíntotas se cortan con NaN."""
+    line = getattr(f, "affine", None)
+    if line is not None:
+        x = np.array([float(x1), float(x2)]); return x, line[0] * x + line[1]
+    x = np.linspace(x1, x2, coarse)
+    y = _eval_grid(f, x)
+    scale = _y_scale(y)
+    x, y = _refine(f, x, y, scale, budget, tol, rounds)
+    return _break_jumps(f, x, y, scale, rounds)
+
+def sample_many(batch, x1, x2, budget=193, coarse=65, tol=1e-3, rounds=12):
+    """Muestrea juntas las expresiones de un ExprBatch en [x1, x2]; devuelve [(x, y)].
+
+    La malla gruesa se evalúa en una sola pasada para todas; después cada
+    curva se refina por su cuenta como en `sample_curve` (hasta `budget`
+    puntos) y sus asíntotas se cortan con NaN."""
+    x = np.linspace(x1, x2, coarse)
+    Y = batch(x)
+    finite = np.isfinite(Y)
+    Y[~finite] = np.nan
+    # Escalas de todas las filas sin huecos de una vez (percentiles 5–95 por rango)
+    full = finite.all(axis=1); scales = np.empty(len(Y))
+    if full.any():
+        k5, k95 = (coarse - 1) * 5 // 100, (coarse - 1) * 95 // 100
+        part = np.partition(Y[full], [k5, k95], axis=1); lo, hi = part[:, k5], part[:, k95]
+        scales[full] = np.where(hi > lo, hi - lo, np.maximum(1.0, np.abs(hi)))
+    for r in np.flatnonzero(~full): scales[r] = _y_scale(Y[r])
+    out = []
+    for row, f, scale in zip(Y, batch.exprs, scales):
+        xr, yr = _refine(f, x, row, scale, budget, tol, rounds)
+        out.append(_break_jumps(f, xr, yr, scale, rounds))
+    return out
+
+def curve_ylim(x, y, pad=0.1):
+    """Límites en y; si hay asíntotas, recorta las colas en vez de aplastar la curva."""
+    xs = x[np.isfinite(y)]
+    if not xs.size: return (-10, 10)
+    yu = np.interp(np.linspace(x[0], x[-1], 256), x, y)
+    valid = yu[np.isfinite(yu)]
+    if not valid.size: valid = y[np.isfinite(y)]
+    lo, hi = float(valid.min()), float(valid.max())
+    p_lo, p_hi = map(float, np.percentile(valid, [2, 98]))
+    if hi - lo > 10 * (p_hi - p_lo) > 0: lo, hi = p_lo, p_hi
+    d = pad * (hi - lo + 1e-6)
+    return lo - d, hi + d
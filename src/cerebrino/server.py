@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+"""
+Modo aula: un solo motor para todo el curso.
+
+El servidor (asyncio, TCP) habla JSON por líneas: cada pedido es un objeto
+con "op" y recibe exactamente una línea de respuesta. Las preguntas salen
+del banco precalculado y cada alumno tiene su propio `DerivGame`, así que
+responder es un acceso O(1) dentro del loop, sin hilos ni bloqueos. El
+cliente usa solo la biblioteca estándar (socket + json).
+
+    PYTHONPATH=src python -m cerebrino.server                       # sirve en 0.0.0.0:8765
+    PYTHONPATH=src python -m cerebrino.server panel --host 10.0.0.5 # panel docente en vivo
+    PYTHONPATH=src python -m cerebrino.server carga --alumnos 40    # prueba de carga por loopback
+
+Operaciones:
+    {"op": "hola", "nombre": "Ana"}              → estado del alumno (se reanuda por nombre; error si ya está conectado)
+    {"op": "pregunta", "modo": "valor"}          → pregunta (func, x0, prompt, options, events)
+    {"op": "responder", "respuesta": "1.5"}      → {ok, answer, events, estado}
+    {"op": "panel"}                              → agregados del curso
+"""
+
+import argparse, asyncio, json, random, socket, statistics, sys, time
+from collections import Counter
+from dataclasses import asdict
+
+from .game import DerivGame
+
+DEFAULT_PORT = 8765
+MAX_LINE     = 4096
+
+class Student:
+    __slots__ = ("name", "game", "answers", "correct", "seen", "sid", "online")
+
+    def __init__(self, name, game):
+        self.name, self.game = name, game
+        self.answers = self.correct = 0
+        self.seen = time.time(); self.sid = None; self.online = False
+
+class ClassroomServer:
+    """Estado del curso y despacho de pedidos (el transporte va aparte)."""
+    def __init__(self, bank=None, store=None, seed=None):
+        self.bank = bank
+        self.store = store            # ProgressStore opcional: cada respuesta queda registrada
+        self.rng = random.Random(seed)
+        self.students = {}
+        self.misses = Counter()       # función → fallos de todo el curso
+        self.started = time.time()
+
+    # -------- pedidos
+    def dispatch(self, student, msg):
+        """Atiende un pedido; devuelve (alumno de la conexión, respuesta)."""
+        op = msg.get("op")
+        if op == "hola":
+            name = str(msg.get("nombre", "")).strip()[:40]
+            if not name: return student, {"error": "Falta el nombre"}
+            other = self.students.get(name)
+            if other is not None and other.online and other is not student:
+                return student, {"error": f"«{name}» ya está conectado"}
+            if student is not None: student.online = False     # la conexión cambia de alumno
+            student = other
+            if student is None:
+                rng = random.Random(self.rng.random())
+                student = self.students[name] = Student(name, DerivGame(rng=rng, bank=self.bank))
+                if self.store is not None: student.sid = self.store.start_session(name, "aula")
+            student.online = True; student.seen = time.time()
+            return student, {"estado": student.game.snapshot()}
+        if op == "panel":
+            return student, self.dashboard()
+        if student is None:
+            return student, {"error": "Primero hay que decir «hola»"}
+        student.seen = time.time()
+        game = student.game
+        if op == "pregunta":
+            if msg.get("modo") in ("signo", "valor"): game.mode = msg["modo"]
+            q = game.new_question()
+            return student, {k: v for k, v in asdict(q).items() if k != "answer"}
+        if op == "responder":
+            if game.question is None: return student, {"error": "No hay pregunta pendiente"}
+            q = game.question
+            res = game.answer(str(msg.get("respuesta", "")))
+            game.question = None          # cada pregunta se responde una sola vez
+            student.answers += 1; student.correct += res.ok
+            if not res.ok: self.misses[q.func] += 1
+            if self.store is not None:
+                self.store.log(student.sid, "respuesta", ok=res.ok, modo=q.mode, func=q.func, x0=q.x0,
+                               elegida=msg.get("respuesta"), correcta=res.answer, nivel=game.level)
+            return student, {"ok": res.ok, "answer": res.answer, "events": res.events, "estado": game.snapshot()}
+        return student, {"error": f"Operación desconocida: {op}"}
+
+    def dashboard(self):
+        """Agregados en vivo para el panel docente."""
+        rows = sorted(self.students.values(), key=lambda s: (-s.game.level, -s.correct, s.name))
+        answers = sum(s.answers for s in rows); correct = sum(s.correct for s in rows)
+        return {
+            "alumnos": [{"nombre": s.name, "conectado": s.online, "nivel": s.game.level,
+                         "vidas": s.game.lives, "huesitos": s.game.bones, "respuestas": s.answers,
+                         "aciertos": s.correct, "hace_s": round(time.time() - s.seen, 1)} for s in rows],
+            "total": {"alumnos": len(rows), "conectados": sum(s.online for s in rows),
+                      "respuestas": answers, "aciertos": correct,
+                      "precision": round(correct / answers, 3) if answers else None},
+            "mas_falladas": self.misses.most_common(5),
+            "activo_s": round(time.time() - self.started, 1),
+        }
+
+    # -------- transporte
+    async def _handle(self, reader, writer):
+        student = None
+        try:
+            while True:
+                line = await reader.readline()
+                if not line: break
+                try:
+                    msg = json.loads(line)
+                    if not isinstance(msg, dict): raise ValueError
+                    student, resp = self.dispatch(student, msg)
+                except ValueError:
+                    resp = {"error": "Pedido inválido"}
+                writer.write(json.dumps(resp, ensure_ascii=False).encode() + b"\n")
+                await writer.drain()
+        except (ConnectionError, ValueError, asyncio.IncompleteReadError):
+            pass    # desconexión o línea más larga que MAX_LINE
+        finally:
+            if student is not None: student.online = False
+            writer.close()
+
+    async def start(self, host="0.0.0.0", port=DEFAULT_PORT):
+        return await asyncio.start_server(self._handle, host, port, limit=MAX_LINE)
+
+    def serve_forever(self, host="0.0.0.0", port=DEFAULT_PORT):
+        async def run():
+            server = await self.start(host, port)
+            addrs = ", ".join(f"{a[0]}:{a[1]}" for a in (s.getsockname() for s in server.sockets))
+            print(f"Aula escuchando en {addrs}")
+            async with server: await server.serve_forever()
+        try: asyncio.run(run())
+        except KeyboardInterrupt: pass
+
+# ==========================
+#   CLIENTE (solo stdlib)
+# ==========================
+class ClassroomClient:
+    """Cliente liviano y bloqueante: un pedido, una respuesta."""
+    def __init__(self, host="127.0.0.1", port=DEFAULT_PORT, timeout=5.0):
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._rfile = self.sock.makefile("rb")
+
+    def call(self, op, **kw):
+        self.sock.sendall(json.dumps(dict(kw, op=op), ensure_ascii=False).encode() + b"\n")
+        line = self._rfile.readline()
+        if not line: raise ConnectionError("El servidor cerró la conexión")
+        resp = json.loads(line)
+        if "error" in resp: raise RuntimeError(resp["error"])
+        return resp
+
+    def hello(self, name):            return self.call("hola", nombre=name)
+    def question(self, mode=None):    return self.call("pregunta", **({"modo": mode} if mode else {}))
+    def answer(self, text):           return self.call("responder", respuesta=text)
+    def dashboard(self):              return self.call("panel")
+
+    def close(self):
+        self._rfile.close(); self.sock.close()
+
+    def __enter__(self): return self
+    def __exit__(self, *exc): self.close()
+
+# ==========================
+#   PRUEBA DE CARGA (loopback)
+# ==========================
+async def _student_loop(host, port, name, questions, rng, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    async def call(**msg):
+        writer.write(json.dumps(msg).encode() + b"\n"); await writer.drain()
+        return json.loads(await reader.readline())
+    await call(op="hola", nombre=name)
+    for _ in range(questions):
+        q = await call(op="pregunta", modo=rng.choice(("signo", "valor")))
+        t = time.perf_counter()
+        await call(op="responder", respuesta=rng.choice(q["options"]))
+        latencies.append(time.perf_counter() - t)
+    writer.close()
+
+async def load_test(students=40, questions=30, host="127.0.0.1", port=0, server=None, seed=0):
+    """Levanta un servidor en loopback (si no se da uno) y lanza `students` alumnos a la vez."""
+    srv = server or ClassroomServer(seed=seed)
+    handle = await srv.start(host, port)
+    port = handle.sockets[0].getsockname()[1]
+    latencies, rng = [], random.Random(seed)
+    t = time.perf_counter()
+    await asyncio.gather(*[_student_loop(host, port, f"alumno{i:02d}", questions, random.Random(rng.random()), latencies)
+                           for i in range(students)])
+    wall = time.perf_counter() - t
+    handle.close(); await handle.wait_closed()
+    lat = sorted(latencies)
+    return {"respuestas": len(lat), "segundos": round(wall, 3),
+            "p50_ms": round(statistics.median(lat) * 1e3, 3),
+            "p95_ms": round(lat[int(0.95 * (len(lat) - 1))] * 1e3, 3),
+            "panel": srv.dashboard()["total"]}
+
+# ==========================
+#   CLI
+# ==========================
+def _print_dashboard(d):
+    print(f"\n{time.strftime('%H:%M:%S')}  alumnos {d['total']['conectados']}/{d['total']['alumnos']}"
+          f"  respuestas {d['total']['respuestas']}  precisión {d['total']['precision']}")
+    for a in d["alumnos"]:
+        print(f"  {'●' if a['conectado'] else '○'} {a['nombre']:16} nivel {a['nivel']}  vidas {a['vidas']}"
+              f"  huesitos {a['huesitos']:3}  {a['aciertos']}/{a['respuestas']}")
+    if d["mas_falladas"]:
+        print("  más falladas: " + ", ".join(f"{f} ({n})" for f, n in d["mas_falladas"]))
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m cerebrino.server", description="Modo aula de Cerebrino.")
+    ap.add_argument("cmd", nargs="?", default="servir", choices=("servir", "panel", "carga"))
+    ap.add_argument("--host", default=None)
+    ap.add_argument("--port", type=int, default=DEFAULT_PORT)
+    ap.add_argument("--db", help="registrar las respuestas en este SQLite de progreso")
+    ap.add_argument("--cada", type=float, default=2.0, help="panel: segundos entre actualizaciones")
+    ap.add_argument("--alumnos", type=int, default=40)
+    ap.add_argument("--preguntas", type=int, default=30)
+    args = ap.parse_args(argv)
+
+    if args.cmd == "panel":
+        with ClassroomClient(args.host or "127.0.0.1", args.port) as cli:
+            try:
+                while True:
+                    _print_dashboard(cli.dashboard()); time.sleep(args.cada)
+            except KeyboardInterrupt:
+                return 0
+
+    from .bank import QuestionBank, build_bank, default_path
+    try: bank = QuestionBank.load(default_path())
+    except Exception: bank = QuestionBank(build_bank())
+    store = None
+    if args.db:
+        from .store import ProgressStore
+        store = ProgressStore(args.db)
+    server = ClassroomServer(bank=bank, store=store)
+    if args.cmd == "carga":
+        res = asyncio.run(load_test(args.alumnos, args.preguntas, server=server))
+        print(json.dumps(res, ensure_ascii=False, indent=1))
+    else:
+        server.serve_forever(args.host or "0.0.0.0", args.port)
+    if store is not None: store.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
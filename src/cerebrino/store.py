@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""
+Progreso persistente: sesiones y registro de eventos (solo se agrega).
+
+Todo vive en un SQLite local en modo WAL. Las escrituras van a una cola y
+un hilo escritor las vuelca en tandas dentro de una sola transacción, así
+que `log()` nunca toca el disco en el hilo de la interfaz. Las lecturas
+(historial, reanudar, reporte) usan su propia conexión de solo lectura y
+tampoco esperan al escritor: el último estado y los jugadores de este
+proceso se sirven de memoria, y lo demás puede llegar con la tanda en curso
+de atraso (`flush()` si hace falta leer todo lo escrito).
+
+    store = ProgressStore()
+    sid = store.start_session("Ana", "derivando")
+    store.log(sid, "respuesta", ok=True, modo="signo", func="x**2", x0=1.5)
+    store.log(sid, "estado", **game.snapshot())
+    store.last_state("Ana", "derivando")      # → dict para DerivGame.restore
+    store.report(sid)                         # → dict listo para json.dump
+"""
+
+import json, os, queue, sqlite3, threading, time, uuid
+
+BATCH_MAX  = 256       # eventos por transacción como máximo
+BATCH_WAIT = 0.05      # s que el escritor espera para juntar una tanda
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id      TEXT PRIMARY KEY,
+    player  TEXT NOT NULL,
+    game    TEXT NOT NULL,
+    started REAL NOT NULL,
+    ended   REAL
+);
+CREATE TABLE IF NOT EXISTS events (
+    id      INTEGER PRIMARY KEY,
+    session TEXT NOT NULL,
+    t       REAL NOT NULL,
+    kind    TEXT NOT NULL,
+    data    TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_player ON sessions (player, game, started);
+CREATE INDEX IF NOT EXISTS events_session  ON events (session, kind, id);
+"""
+
+def default_path():
+    return os.environ.get("CEREBRINO_DB") or os.path.join(os.path.expanduser("~"), ".cerebrino", "progreso.db")
+
+def _connect(path, readonly=False):
+    if readonly:
+        uri = "file:" + os.path.abspath(path).replace("?", "%3f").replace("#", "%23") + "?mode=ro"
+        return sqlite3.connect(uri, uri=True, check_same_thread=False)
+    con = sqlite3.connect(path, check_same_thread=False)
+    con.execute("PRAGMA journal_mode=WAL"); con.execute("PRAGMA synchronous=NORMAL")
+    return con
+
+class ProgressStore:
+    """Sesiones por jugador y eventos; las escrituras no bloquean al llamador."""
+    def __init__(self, path=None):
+        self.path = path or default_path()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        con = _connect(self.path); con.executescript(_SCHEMA); con.close()
+        self._q = queue.Queue()
+        self._reader = None
+        self._lock = threading.Lock()
+        # Lo encolado que las lecturas no deben esperar: dueño de cada sesión,
+        # último 'estado' por (jugador, juego) y jugadores de este proceso
+        self._owner = {}
+        self._state = {}
+        self._recent = []
+        self._writer = threading.Thread(target=self._run, name="cerebrino-store", daemon=True)
+        self._writer.start()
+
+    # -------- escritura (hilo de la interfaz: solo encola)
+    def start_session(self, player, game):
+        sid = uuid.uuid4().hex
+        self._owner[sid] = (player, game)
+        if player in self._recent: self._recent.remove(player)
+        self._recent.insert(0, player)
+        self._q.put(("INSERT INTO sessions (id, player, game, started) VALUES (?, ?, ?, ?)",
+                     (sid, player, game, time.time())))
+        return sid
+
+    def end_session(self, sid):
+        self._q.put(("UPDATE sessions SET ended = ? WHERE id = ?", (time.time(), sid)))
+
+    def log(self, sid, kind, **data):
+        if kind == "estado" and sid in self._owner: self._state[self._owner[sid]] = dict(data)
+        self._q.put(("INSERT INTO events (session, t, kind, data) VALUES (?, ?, ?, ?)",
+                     (sid, time.time(), kind, json.dumps(data, separators=(",", ":")))))
+
+    def flush(self, timeout=5.0):
+        """Espera a que todo lo encolado hasta ahora esté en disco."""
+        done = threading.Event(); self._q.put(done)
+        return done.wait(timeout)
+
+    def close(self):
+        self._q.put(None); self._writer.join(5.0)
+        if self._reader is not None: self._reader.close(); self._reader = None
+
+    def _run(self):
+        con = _connect(self.path)
+        while True:
+            batch = [self._q.get()]
+            deadline = time.monotonic() + BATCH_WAIT
+            while len(batch) < BATCH_MAX and batch[-1] is not None and not isinstance(batch[-1], threading.Event):
+                try: batch.append(self._q.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty: break
+            stmts = [b for b in batch if isinstance(b, tuple)]
+            if stmts:
+                try:
+                    with con:
+                        for sql, args in stmts: con.execute(sql, args)
+                except sqlite3.Error:
+                    pass    # el progreso nunca debe tumbar el juego
+            for b in batch:
+                if isinstance(b, threading.Event): b.set()
+            if batch[-1] is None: break
+        con.close()
+
+    # -------- lectura
+    def _query(self, sql, args=()):
+        # Sin flush(): la interfaz nunca espera al escritor (ver el docstring del módulo)
+        with self._lock:
+            if self._reader is None: self._reader = _connect(self.path, readonly=True)
+            return self._reader.execute(sql, args).fetchall()
+
+    def players(self):
+        """Jugadores, del más reciente al más antiguo."""
+        rows = self._query("SELECT player, MAX(started) AS s FROM sessions GROUP BY player ORDER BY s DESC")
+        return self._recent + [r[0] for r in rows if r[0] not in self._recent]
+
+    def last_state(self, player, game):
+        """Último evento 'estado' del jugador en ese juego (para reanudar), o None."""
+        state = self._state.get((player, game))
+        if state is not None: return dict(state)
+        rows = self._query(
+            "SELECT e.data FROM sessions s JOIN events e ON e.session = s.id AND e.kind = 'estado' "
+            "WHERE s.player = ? AND s.game = ? ORDER BY s.started DESC, e.id DESC LIMIT 1", (player, game))
+        return json.loads(rows[0][0]) if rows else None
+
+    def history(self, player):
+        """Resumen por sesión del jugador, de la más reciente a la más antigua."""
+        rows = self._query(
+            "SELECT s.id, s.game, s.started, s.ended, "
+            "  COUNT(e.id), SUM(json_extract(e.data, '$.ok') = 1) "
+            "FROM sessions s LEFT JOIN events e ON e.session = s.id AND e.kind IN ('respuesta', 'punto') "
+            "WHERE s.player = ? GROUP BY s.id ORDER BY s.started DESC", (player,))
+        return [{"session": sid, "game": game, "started": t0, "ended": t1,
+                 "answers": n, "correct": int(ok or 0)} for sid, game, t0, t1, n, ok in rows]
+
+    def events(self, sid, kind=None):
+        sql = "SELECT t, kind, data FROM events WHERE session = ?" + (" AND kind = ?" if kind else "") + " ORDER BY id"
+        rows = self._query(sql, (sid, kind) if kind else (sid,))
+        return [dict(json.loads(d), t=t, kind=k) for t, k, d in rows]
+
+    def report(self, sid):
+        """Reporte de una sesión como dict serializable a JSON."""
+        head = self._query("SELECT player, game, started, ended FROM sessions WHERE id = ?", (sid,))
+        if not head: raise KeyError(sid)
+        player, game, t0, t1 = head[0]
+        evs = self.events(sid)
+        answers = [e for e in evs if e["kind"] in ("respuesta", "punto")]
+        by_mode = {}
+        for e in answers:
+            m = by_mode.setdefault(e.get("modo", e["kind"]), {"answers": 0, "correct": 0})
+            m["answers"] += 1; m["correct"] += bool(e.get("ok"))
+        states = [e for e in evs if e["kind"] == "estado"]
+        end = t1 or (evs[-1]["t"] if evs else t0)
+        correct = sum(bool(e.get("ok")) for e in answers)
+        return {
+            "player": player, "game": game, "session": sid,
+            "started": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(t0)),
+            "duration_s": round(end - t0, 1),
+            "answers": len(answers), "correct": correct,
+            "accuracy": round(correct / len(answers), 3) if answers else None,
+            "by_mode": by_mode,
+            "final_state": {k: v for k, v in states[-1].items() if k not in ("t", "kind")} if states else None,
+            "mistakes": [{k: e[k] for k in ("func", "x0", "modo", "elegida", "correcta") if k in e}
+                         for e in answers if not e.get("ok") and e["kind"] == "respuesta"],
+        }
+
+    def write_report(self, sid, path):
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(self.report(sid), fh, ensure_ascii=False, indent=1)
+        return path
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+Cache de tramos muestreados para mover y hacer zoom sin remuestrear todo.
+
+El eje x se parte en tramos de ancho 2**k. El nivel k sale del ancho de la
+vista (entre 4 y 8 tramos visibles), así que la resolución acompaña al
+zoom. Cada tramo guarda las muestras de una expresión con la clave
+(expresión, k, índice); al desplazar la vista solo se calculan los tramos
+que recién aparecen. Si faltan tramos de varias curvas a la vez, la malla
+gruesa del tramo se evalúa en una sola pasada (`ExprBatch`) y después cada
+curva se refina dentro del tramo como en `sample_curve`.
+Las rectas (`CompiledExpr.affine`) no usan tramos: alcanza con dos puntos.
+"""
+
+import math
+from collections import OrderedDict
+import numpy as np
+
+from . import perf
+from .expr import compile_batch
+from .sampling import sample_many
+
+TILES_PER_VIEW = 4
+TILE_COARSE    = 65        # malla gruesa de cada tramo (densa para no confundir oscilaciones rápidas)
+TILE_POINTS    = 193       # tope de muestras por tramo tras refinar
+MAX_TILES      = 1024
+
+class TileCache:
+    """LRU de tramos (x, y) por (expresión, nivel, índice)."""
+    def __init__(self, max_tiles=MAX_TILES, points=TILE_POINTS, coarse=TILE_COARSE):
+        self.max_tiles = max_tiles
+        self.points, self.coarse = points, coarse
+        self._tiles = OrderedDict()
+        self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._tiles)
+
+    @staticmethod
+    def level(x1, x2):
+        return math.floor(math.log2((x2 - x1) / TILES_PER_VIEW))
+
+    def _fill(self, sources, k, i):
+        """Muestrea juntas las expresiones a las que les falta el tramo (k, i)."""
+        w = 2.0 ** k
+        with perf.span("muestreo"):
+            done = sample_many(compile_batch(sources), i * w, (i + 1) * w, self.points, self.coarse)
+        for src, xy in zip(sources, done): self._tiles[(src, k, i)] = xy
+        while len(self._tiles) > self.max_tiles: self._tiles.popitem(last=False)
+
+    def curves(self, fs, x1, x2, preview=False):
+        """[(x, y)] de cada expresión en [x1, x2] (un nivel más grueso en preview)."""
+        k = self.level(x1, x2) + (1 if preview else 0)
+        w = 2.0 ** k
+        sources = list(dict.fromkeys(f.source for f in fs if f.affine is None))
+        parts = {src: [] for src in sources}
+        for i in range(math.floor(x1 / w), math.floor(x2 / w) + 1):
+            missing = tuple(s for s in sources if (s, k, i) not in self._tiles)
+            self.misses += len(missing); self.hits += len(sources) - len(missing)
+            perf.count("tramos_nuevos", len(missing))
+            if missing: self._fill(missing, k, i)
+            for s in sources:
+                key = (s, k, i); self._tiles.move_to_end(key)
+                parts[s].append(self._tiles[key])
+        out = {}
+        for f in fs:
+            if f.affine is not None:
+                m, b = f.affine; x = np.array([x1, x2]); out[f.source] = (x, m * x + b)
+        for s, tiles in parts.items():
+            x = np.concatenate([t[0] for t in tiles]); y = np.concatenate([t[1] for t in tiles])
+            # Solo lo visible (más un punto a cada lado para que la línea llegue al borde)
+            lo = max(int(np.searchsorted(x, x1)) - 1, 0); hi = int(np.searchsorted(x, x2, side="right")) + 1
+            out[s] = (x[lo:hi], y[lo:hi])
+        return [out[f.source] for f in fs]
+
+    def try_curves(self, fs, x1, x2, preview=False):
+        """Como `curves`, pero una expresión que no se puede evaluar da None y no tumba al resto.
+
+        Si el lote falla se reintenta curva por curva (los tramos ya hechos quedan)."""
+        try: return self.curves(fs, x1, x2, preview)
+        except Exception: pass
+        out = []
+        for f in fs:
+            try: out.append(self.curve(f, x1, x2, preview))
+            except Exception: out.append(None)
+        return out
+
+    def curve(self, f, x1, x2, preview=False):
+        return self.curves([f], x1, x2, preview)[0]
+
+    def clear(self):
+        self._tiles.clear()
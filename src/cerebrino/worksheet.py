@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""
+Hojas de ejercicios imprimibles: "estima f'(x₀)" con el gráfico de cada función.
+
+Renderiza fuera de pantalla con Agg. Las páginas se reparten entre un pool
+de procesos; cada proceso arma una sola Figure con sus artistas y la
+reutiliza cambiando solo los datos. Cada página se escribe a disco apenas
+está lista.
+
+    PYTHONPATH=src python -m cerebrino.worksheet hojas/ -n 200                   # del banco de preguntas
+    PYTHONPATH=src python -m cerebrino.worksheet hojas/ --pares "x**2@1.5" "sin(x)@0" --formato pdf
+    PYTHONPATH=src python -m cerebrino.worksheet hojas/ --archivo pares.txt --soluciones
+
+En `--archivo` va un par por línea: `función, x0`. Los pares se validan
+antes de lanzar el pool (f y f' tienen que estar definidas en x0); con
+`--omitir` los inválidos se saltean en lugar de cancelar todo.
+"""
+
+import argparse, math, os, random, sys, time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .expr import compile_expr
+from .sampling import sample_curve
+
+ROWS, COLS = 3, 2
+PER_PAGE   = ROWS * COLS
+FORMATS    = ("png", "svg", "pdf")
+VIEW       = (-6, 6)
+
+# Estado de cada proceso: una figura con sus artistas, creada una sola vez
+_page = None
+
+class _Page:
+    """Figura A4 con ROWS×COLS gráficos; entre páginas solo cambian los datos."""
+    def __init__(self, dpi=150):
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        self.fig = Figure(figsize=(8.27, 11.69), dpi=dpi)
+        FigureCanvasAgg(self.fig)
+        self.header = self.fig.text(0.06, 0.965, "", fontsize=13, weight="bold")
+        self.fig.text(0.60, 0.965, "Nombre: ____________________", fontsize=11)
+        axes = self.fig.subplots(ROWS, COLS, gridspec_kw=dict(left=0.07, right=0.97, top=0.92, bottom=0.05,
+                                                                 hspace=0.45, wspace=0.22))
+        self.cells = []
+        for ax in axes.flat:
+            ax.set_xlim(*VIEW); ax.set_ylim(*VIEW)
+            ax.axhline(0, color="#444", linewidth=0.8); ax.axvline(0, color="#444", linewidth=0.8)
+            ax.grid(True, linestyle="--", linewidth=0.5, alpha=0.5)
+            curve, = ax.plot([], [], color="#1d3557", linewidth=2)
+            tangent, = ax.plot([], [], color="#e63946", linewidth=1.5, linestyle="--")
+            point, = ax.plot([], [], "o", color="#e63946", markersize=6)
+            self.cells.append((ax, curve, tangent, point))
+
+    def render(self, title, items, solutions):
+        self.header.set_text(title)
+        for k, (ax, curve, tangent, point) in enumerate(self.cells):
+            if k >= len(items):
+                ax.set_visible(False); continue
+            num, func, x0 = items[k]
+            ax.set_visible(True)
+            f = compile_expr(func)
+            curve.set_data(*sample_curve(f, *VIEW, budget=300))
+            y0, m = map(float, f.value_and_slope(x0))
+            point.set_data([x0], [y0])
+            ax.set_title(f"{num}) y = {func}    x₀ = {x0}", fontsize=11, loc="left")
+            if solutions:
+                tangent.set_data([x0 - 2, x0 + 2], [y0 - 2*m, y0 + 2*m])
+                ax.set_xlabel(f"f'(x₀) = {round(m, 1) + 0.0}", fontsize=11, color="#e63946")
+            else:
+                tangent.set_data([], [])
+                ax.set_xlabel("f'(x₀) ≈ ________", fontsize=11)
+
+def _init_worker(dpi):
+    global _page
+    _page = _Page(dpi)
+
+def _render_page(task):
+    """Worker: renderiza y guarda una página; devuelve la ruta."""
+    path, title, items, solutions = task
+    _page.render(title, items, solutions)
+    tmp = path + ".tmp"
+    _page.fig.savefig(tmp, format=os.path.splitext(path)[1][1:])
+    os.replace(tmp, path)      # nunca queda una página a medio escribir
+    return path
+
+def pages(pairs, out_dir, fmt="png", solutions=False, title="Cerebrino — Estima f'(x₀)"):
+    """Tareas (ruta, título, ítems, soluciones) de a PER_PAGE pares por hoja."""
+    numbered = [(i + 1, f, x0) for i, (f, x0) in enumerate(pairs)]
+    npages = (len(numbered) + PER_PAGE - 1) // PER_PAGE
+    for p in range(npages):
+        items = numbered[p * PER_PAGE:(p + 1) * PER_PAGE]
+        yield os.path.join(out_dir, f"hoja-{p + 1:03d}.{fmt}"), f"{title} · Hoja {p + 1}/{npages}", items, False
+        if solutions:
+            yield os.path.join(out_dir, f"soluciones-{p + 1:03d}.{fmt}"), f"Soluciones · Hoja {p + 1}/{npages}", items, True
+
+def check_pair(func, x0):
+    """Lo que el worker evalúa de un par; ValueError si no se puede graficar."""
+    try: y0, m = map(float, compile_expr(func).value_and_slope(x0))
+    except (ValueError, SyntaxError, ArithmeticError, TypeError) as err:
+        raise ValueError(f"{func} en x0 = {x0}: {err}") from None
+    if not (math.isfinite(y0) and math.isfinite(m)): raise ValueError(f"{func} no está definida en x0 = {x0}")
+
+def split_pairs(pairs):
+    """(pares válidos, [(par, error)])."""
+    good, bad = [], []
+    for func, x0 in pairs:
+        try: check_pair(func, x0); good.append((func, x0))
+        except ValueError as err: bad.append(((func, x0), str(err)))
+    return good, bad
+
+def render(pairs, out_dir, fmt="png", solutions=False, workers=None, dpi=150, progress=None):
+    """Renderiza todas las hojas; devuelve las rutas en el orden en que se terminaron.
+
+    Valida todos los pares antes de escribir nada: uno inválido levanta ValueError."""
+    if fmt not in FORMATS: raise ValueError(f"Formato no soportado: {fmt}")
+    _, bad = split_pairs(pairs)                  # errores antes de lanzar el pool
+    if bad: raise ValueError("Pares inválidos: " + "; ".join(err for _, err in bad))
+    os.makedirs(out_dir, exist_ok=True)
+    tasks = list(pages(pairs, out_dir, fmt, solutions))
+    workers = max(1, min(workers or os.cpu_count() or 1, len(tasks)))
+    done = []
+    if workers == 1:
+        _init_worker(dpi)
+        for t in tasks:
+            done.append(_render_page(t))
+            if progress: progress(done[-1], len(done), len(tasks))
+        return done
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(dpi,)) as pool:
+        for fut in as_completed([pool.submit(_render_page, t) for t in tasks]):
+            done.append(fut.result())
+            if progress: progress(done[-1], len(done), len(tasks))
+    return done
+
+def _parse_pair(text):
+    """'función@x0' (se corta en la última @) o 'función, x0' (última coma fuera de paréntesis)."""
+    func, _, x0 = text.rpartition("@")
+    if "@" not in text:
+        depth, cut = 0, -1
+        for i, c in enumerate(text):
+            if c in "([": depth += 1
+            elif c in ")]": depth -= 1
+            elif c == "," and depth == 0: cut = i
+        if cut >= 0: func, x0 = text[:cut], text[cut + 1:]
+    if not func.strip(): raise ValueError(f"Par inválido (se espera función@x0): {text}")
+    return func.strip(), round(float(x0), 2)
+
+def _bank_pairs(n, level, seed):
+    from .bank import QuestionBank, build_bank, default_path
+    try: bank = QuestionBank.load(default_path())
+    except Exception: bank = QuestionBank(build_bank())
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        q = bank.draw("valor", level or rng.randint(1, 3), rng)
+        out.append((q.func, q.x0))
+    return out
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m cerebrino.worksheet", description="Hojas de ejercicios de derivadas.")
+    ap.add_argument("salida", help="carpeta de salida")
+    src = ap.add_mutually_exclusive_group()
+    src.add_argument("--pares", nargs="+", metavar="F@X0", help="pares función@x0")
+    src.add_argument("--archivo", help="archivo con un par 'función, x0' por línea")
+    ap.add_argument("-n", type=int, default=24, help="cantidad de preguntas del banco (si no hay pares)")
+    ap.add_argument("--nivel", type=int, choices=(1, 2, 3), help="nivel del banco (por defecto, mezclados)")
+    ap.add_argument("--semilla", type=int, default=0)
+    ap.add_argument("--formato", choices=FORMATS, default="png")
+    ap.add_argument("--soluciones", action="store_true", help="agregar hojas con tangente y valor")
+    ap.add_argument("--procesos", type=int, default=None)
+    ap.add_argument("--dpi", type=int, default=150)
+    ap.add_argument("--omitir", action="store_true", help="saltear los pares inválidos en lugar de cancelar")
+    args = ap.parse_args(argv)
+
+    if args.pares: pairs = [_parse_pair(p) for p in args.pares]
+    elif args.archivo:
+        with open(args.archivo, encoding="utf-8") as fh:
+            pairs = [_parse_pair(l) for l in fh if l.strip() and not l.lstrip().startswith("#")]
+    else: pairs = _bank_pairs(args.n, args.nivel, args.semilla)
+
+    pairs, bad = split_pairs(pairs)
+    for _, err in bad: print(f"  inválido: {err}", file=sys.stderr)
+    if bad and not args.omitir:
+        print(f"{len(bad)} pares inválidos: no se generó ninguna hoja (--omitir para saltearlos)", file=sys.stderr)
+        return 2
+    if not pairs:
+        print("No hay pares para imprimir", file=sys.stderr); return 2
+
+    t = time.perf_counter()
+    def progress(path, i, n): print(f"  [{i}/{n}] {path}")
+    done = render(pairs, args.salida, args.formato, args.soluciones, args.procesos, args.dpi, progress)
+    print(f"{len(pairs)} preguntas, {len(done)} páginas en {time.perf_counter() - t:.1f} s")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+# El motor vive en src/ sin empaquetar (igual que PYTHONPATH=src en el README)
+import itertools, os, sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+class FakeTk:
+    """Loop de Tk falso: `after` encola con su hora y `run()` dispara lo pendiente en orden."""
+    def __init__(self):
+        self.now = 0
+        self.pending = []          # [(hora_ms, id, fn, args)]
+        self._ids = itertools.count(1)
+        self.attrs = {}
+
+    def after(self, ms, fn=None, *args):
+        i = f"after#{next(self._ids)}"
+        self.pending.append((self.now + ms, i, fn, args)); return i
+
+    def after_idle(self, fn, *args):
+        return self.after(0, fn, *args)
+
+    def after_cancel(self, i):
+        self.pending = [p for p in self.pending if p[1] != i]
+
+    def attributes(self, name, value=None):
+        if value is None: return self.attrs.get(name)
+        self.attrs[name] = value
+
+    def run(self, ms=None, limit=10000):
+        """Avanza `ms` (o hasta vaciar la cola) disparando los callbacks que vencen."""
+        end = None if ms is None else self.now + ms
+        for _ in range(limit):
+            due = [p for p in self.pending if end is None or p[0] <= end]
+            if not due: break
+            p = min(due, key=lambda p: p[0]); self.pending.remove(p)
+            self.now = max(self.now, p[0]); p[2](*p[3])
+        if end is not None: self.now = end
+
+@pytest.fixture
+def tk_falso():
+    return FakeTk()
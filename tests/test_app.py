@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+# Piezas de la app que no necesitan una ventana: se prueban con Agg y un Tk falso
+import os, subprocess, sys, time
+import numpy as np
+import pytest
+
+import Prototipo1 as app
+from conftest import FakeTk
+
+@pytest.fixture
+def surface(monkeypatch):
+    """PlotSurface sobre Agg (sin widget) que cuenta dibujos completos y blits."""
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    s = app.PlotSurface.__new__(app.PlotSurface)
+    s.fig = Figure(figsize=(4, 3), dpi=50); s.canvas = FigureCanvasAgg(s.fig); s.widget = None; s.active = None
+    s.canvas.mpl_connect("draw_event", s._on_draw)
+    s.draws = s.blits = 0
+    draw, blit = s.canvas.draw, s.canvas.blit
+    def counted_draw(): s.draws += 1; draw()
+    def counted_blit(bbox=None): s.blits += 1; blit(bbox)
+    monkeypatch.setattr(s.canvas, "draw", counted_draw); monkeypatch.setattr(s.canvas, "blit", counted_blit)
+    return s
+
+def _activate(surface, view):
+    if surface.active is not None: surface.active.ax.set_visible(False)
+    view.ax.set_visible(True); view.invalidate(); surface.active = view
+
+# -------- Gráfico: artistas persistentes y blitting
+def test_mismos_limites_solo_blit(surface):
+    view = app.PlotCanvas(surface); _activate(surface, view)
+    ln = view.line(animated=True, color="red")
+    ln.set_data([-1, 1], [-1, 1]); view.update((-2, 2), (-2, 2))
+    assert (surface.draws, surface.blits) == (1, 0)
+    before = np.asarray(surface.canvas.buffer_rgba()).copy()
+    ln.set_data([-1, 1], [1, -1]); view.update((-2, 2), (-2, 2))
+    assert (surface.draws, surface.blits) == (1, 1)
+    assert (np.asarray(surface.canvas.buffer_rgba()) != before).any()   # la línea nueva quedó dibujada
+    view.update((-3, 3), (-2, 2))
+    assert surface.draws == 2
+    view.set_grid(False); view.refresh()
+    assert surface.draws == 3
+
+def test_vista_oculta_no_dibuja(surface):
+    shown, hidden = app.PlotCanvas(surface), app.PlotCanvas(surface); _activate(surface, shown)
+    hidden.update((0, 1), (0, 1))
+    assert surface.draws == 0 and hidden.ax.get_xlim() == (0, 1)
+    _activate(surface, hidden); hidden.refresh()
+    assert surface.draws == 1
+
+# -------- Sliders: un render por cuadro con el estado más reciente
+def test_pedidos_agrupados_en_un_render(tk_falso):
+    done = []
+    sched = app.RenderScheduler(tk_falso, done.append)
+    for _ in range(5): sched.request(preview=True)
+    assert len(tk_falso.pending) == 1
+    tk_falso.run()
+    assert done == [True]
+    sched.request(preview=True); sched.request(preview=False); sched.request(preview=True)
+    tk_falso.run()
+    assert done == [True, False]          # la calidad completa gana sobre el preview
+
+def test_cancelar_descarta_el_render(tk_falso):
+    done = []
+    sched = app.RenderScheduler(tk_falso, done.append)
+    sched.request(); sched.cancel(); tk_falso.run()
+    assert done == [] and not tk_falso.pending
+    sched.request(); tk_falso.run()
+    assert done == [False]
+
+# -------- Pantallas: se construyen al primer uso, sin matplotlib al arrancar
+class FakeApp(FakeTk):
+    """Lo mínimo de App para navegar: sus métodos reales sobre un loop falso."""
+    _get_frame, _raise, _prewarm = app.App._get_frame, app.App._raise, app.App._prewarm
+    show_frame, _show_frame, _fade = app.App.show_frame, app.App._show_frame, app.App._fade
+
+    def __init__(self, reduced_motion=False):
+        super().__init__()
+        self.frames = {}; self.container = None; self.player = None; self.current = None
+        self.reduced_motion = reduced_motion; self._fade_token = None
+        self.animator = app.AnimationManager(self)
+
+def _screen(name):
+    class Screen:
+        built = 0
+        def __init__(self, parent, controller):
+            type(self).built += 1; self.raised = 0; self.players = []
+        def grid(self, **kw): pass
+        def tkraise(self): self.raised += 1
+        def on_player(self, name): self.players.append(name)
+    Screen.__name__ = name
+    return Screen
+
+def test_importar_la_app_no_carga_matplotlib():
+    code = "import sys, Prototipo1; sys.exit('matplotlib' in sys.modules)"
+    env = dict(os.environ, PYTHONPATH=os.path.dirname(app.__file__))
+    assert subprocess.run([sys.executable, "-c", code], env=env).returncode == 0
+
+def test_pantallas_al_primer_uso_y_precarga_de_a_una():
+    root = FakeApp(reduced_motion=True)
+    menu, calc, graf = _screen("Menu"), _screen("Calc"), _screen("Graf")
+    root.show_frame(menu, animate=False)
+    assert (menu.built, calc.built, graf.built) == (1, 0, 0)
+    root.player = "Ana"
+    root._prewarm_queue = [menu, calc, graf]
+    root._prewarm()
+    assert (calc.built, graf.built) == (1, 0)            # una por turno
+    assert root.frames[calc].players == ["Ana"]
+    root.run()
+    assert (menu.built, calc.built, graf.built) == (1, 1, 1)
+    assert root.current is root.frames[menu] and root.frames[menu].raised == 3   # vuelve arriba tras cada una
+    root.show_frame(calc)
+    assert calc.built == 1 and root.current is root.frames[calc]
+
+# -------- Animación: un solo tick y solo para la pantalla visible
+def test_pantallas_ocultas_no_reciben_ticks(tk_falso):
+    anim = app.AnimationManager(tk_falso, interval=80)
+    ticks = {"a": 0, "b": 0}
+    anim.register("a", lambda: ticks.__setitem__("a", ticks["a"] + 1))
+    anim.register("b", lambda: ticks.__setitem__("b", ticks["b"] + 1))
+    assert not tk_falso.pending                       # nada visible todavía
+    anim.set_visible("a"); anim.set_visible("a")
+    assert len(tk_falso.pending) == 1                 # un solo `after` en vuelo
+    tk_falso.run(800)
+    assert ticks == {"a": 10, "b": 0}
+    anim.set_visible("menu"); tk_falso.run(800)
+    assert ticks == {"a": 10, "b": 0} and not tk_falso.pending   # sin animaciones: el tick se apaga
+    anim.paused = True; anim.set_visible("b"); tk_falso.run(800)
+    assert ticks["b"] == 0
+
+def test_borre_no_toca_el_canvas_si_no_se_movio():
+    class Canvas:
+        moves = 0
+        def coords(self, *a): Canvas.moves += 1
+    panel = app.BigBorrePanel.__new__(app.BigBorrePanel)
+    panel.canvas = Canvas(); panel._item = 1; panel._phase = 0.0; panel._dy = None
+    panel._x_center, panel._y_center = 100, 100
+    for _ in range(84): panel._animate()            # dos vueltas completas
+    assert 0 < Canvas.moves < 84
+
+# -------- Sprites de Borre: pirámide por cubetas
+@pytest.fixture
+def sprites():
+    Image = pytest.importorskip("PIL.Image")
+    cache = app.SpriteCache()
+    cache._original = Image.new("RGBA", (400, 600), (200, 120, 40, 255)); cache._loaded = True
+    return cache
+
+def test_cubetas_de_la_piramide(sprites):
+    assert sprites._bucket(800, 800) == 0                 # no se agranda
+    k = sprites._bucket(200, 300)
+    assert 1.25 ** -k <= 0.5 < 1.25 ** -(k - 1)
+    img = sprites._level(k)
+    assert img.width <= 200 and img.height <= 300
+    assert sprites._level(k) is img                       # generada una sola vez
+    assert set(sprites._levels) == {k}
+
+def test_version_exacta_fuera_del_hilo_de_tk(sprites):
+    fut = sprites.exact_async(150, 150)
+    k = sprites._bucket(150, 150)
+    assert k - 1 in sprites._levels                       # el nivel de partida se armó acá
+    img = fut.result(5)
+    assert max(img.size) == 150 and img.size == (100, 150)
+    assert set(sprites._levels) == {k - 1}                # el hilo no tocó la pirámide
+
+# -------- Transiciones: el fundido corre sobre el loop y se puede interrumpir
+def test_fundido_no_bloquea():
+    root = FakeApp(); menu, calc = _screen("Menu"), _screen("Calc")
+    root.show_frame(menu, animate=False)
+    root.show_frame(calc)
+    new = root.frames[calc]
+    assert root.current is new and new.raised == 0 and root.pending   # volvió enseguida
+    alphas = []
+    while root.pending:
+        root.run(10); alphas.append(root.attributes("-alpha"))
+    assert new.raised == 1 and root.attributes("-alpha") == 1.0
+    assert min(alphas) >= 0.75
+
+def test_navegar_durante_el_fundido_lo_corta():
+    root = FakeApp(); menu, calc, graf = _screen("Menu"), _screen("Calc"), _screen("Graf")
+    root.show_frame(menu, animate=False)
+    root.show_frame(calc); root.run(20)
+    root.show_frame(graf, animate=False)
+    root.run()
+    assert root.frames[calc].raised == 0                 # el fundido viejo no llegó a subirla
+    assert root.current is root.frames[graf] and root.attributes("-alpha") == 1.0
+
+def test_sin_animaciones_cambia_al_instante():
+    root = FakeApp(reduced_motion=True); menu, calc = _screen("Menu"), _screen("Calc")
+    root.show_frame(menu); root.show_frame(calc)
+    assert root.frames[calc].raised == 1 and not root.pending
+
+# -------- Calculadora: evaluación con tiempo máximo fuera del hilo de Tk
+def _wait(root, ev):
+    for _ in range(500):
+        if not ev.pending: return
+        root.run(15, limit=1); time.sleep(0.005)
+    pytest.fail("la evaluación no terminó")
+
+def test_evaluacion_en_segundo_plano(tk_falso):
+    ev, out = app.BackgroundEval(tk_falso), []
+    ev.submit("6*7", out.append, lambda e: out.append(e)); _wait(tk_falso, ev)
+    assert out == [42]
+    ev.submit("9**9**9", out.append, lambda e: out.append(e)); _wait(tk_falso, ev)
+    assert isinstance(out[-1], OverflowError)
+
+def test_evaluacion_lenta_se_corta(tk_falso, monkeypatch):
+    monkeypatch.setattr(app, "safe_eval_expr", lambda expr: time.sleep(0.3) or 1)
+    ev, out = app.BackgroundEval(tk_falso, timeout_ms=50), []
+    ev.submit("1", out.append, lambda e: out.append(e)); _wait(tk_falso, ev)
+    assert len(out) == 1 and isinstance(out[0], TimeoutError)
+    ev.submit("1", out.append, out.append); ev.cancel(); time.sleep(0.35); tk_falso.run()
+    assert len(out) == 1                                  # lo cancelado no vuelve
@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+import random
+import numpy as np
+import pytest
+
+from cerebrino import FUNCS, QuestionBank, build_bank
+from cerebrino.bank import save_bank
+
+def test_banco_de_otras_funciones_no_se_usa(tmp_path):
+    path = str(tmp_path / "banco.npz")
+    save_bank(build_bank(FUNCS[:2]), path)
+    with pytest.raises(ValueError):
+        QuestionBank.load(path)
+    assert len(QuestionBank.load(path, FUNCS[:2]))
+
+def test_x0_fuera_de_int8(tmp_path):
+    path = str(tmp_path / "banco.npz")
+    grid = np.array([-20.0, -13.5, 13.5, 20.0])
+    save_bank(build_bank([("2*x + 1", "recta")], x0_grid=grid), path)
+    bank = QuestionBank.load(path, [("2*x + 1", "recta")])
+    rng = random.Random(0)
+    assert {bank.draw("valor", 1, rng).x0 for _ in range(200)} == set(grid)
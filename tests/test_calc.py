@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""IncrementalCalc contra el evaluador completo, tecla por tecla."""
+import math, random
+import pytest
+
+from cerebrino import IncrementalCalc, CalcTape, safe_eval_expr
+
+KEYS = "0123456789.+-*/"
+
+def _full(text):
+    try: return True, safe_eval_expr(text)
+    except Exception as err: return False, type(err)
+
+def _typed(rng):
+    # Sesgado a lo que se teclea de verdad: números de 1-3 cifras entre operadores
+    out = []
+    for _ in range(rng.randint(1, 9)):
+        r = rng.random()
+        if r < 0.55:
+            n = rng.choice((0, rng.randint(0, 9), rng.randint(0, 999)))
+            out.append(str(n) if rng.random() < 0.8 else f"{n}.{rng.randint(0, 99)}")
+        elif r < 0.9: out.append(rng.choice("+-*/"))
+        else: out.append(rng.choice(KEYS))
+    return "".join(out)[:70]
+
+def _same(a, b):
+    if isinstance(a, float) or isinstance(b, float):
+        return math.isclose(a, b, rel_tol=1e-12, abs_tol=1e-12) or (math.isnan(a) and math.isnan(b))
+    return a == b and type(a) is type(b)
+
+@pytest.mark.parametrize("seed", range(5))
+def test_diferencial_contra_safe_eval(seed):
+    rng = random.Random(seed)
+    calc = IncrementalCalc()
+    for _ in range(3000):
+        text = _typed(rng)
+        calc.set(text)
+        if calc.fallback: continue
+        ok, full = _full(text)
+        if calc.complete:
+            if calc.error is not None:
+                assert not ok and isinstance(calc.error, full), text
+            else:
+                assert ok and _same(calc.result(), full), (text, calc.result(), full)
+        else:
+            # Incompleta para la calculadora: el evaluador completo tampoco la acepta
+            assert not ok, (text, full)
+
+def test_borrar_vuelve_al_estado_anterior():
+    calc = IncrementalCalc("12+3*4")
+    assert calc.result() == 24
+    calc.pop(); calc.pop()
+    assert calc.result() == 15
+    calc.pop()
+    assert not calc.complete and calc.preview() == 12
+    calc.push("5")
+    assert calc.result() == 17
+    calc.set("12+3*40")
+    assert calc.result() == 132
+
+def test_fallback_para_lo_que_no_modela():
+    for text in ("2**3", "1e-05", "(1+2)", "1..2"):
+        assert IncrementalCalc(text).fallback, text
+
+def test_cinta():
+    tape = CalcTape(maxlen=2)
+    tape.add("1+1", 2); tape.add("2*3", 6); tape.add("1/0", "Error", ok=False)
+    assert "1+1" not in tape and tape.get("2*3") == (True, 6)
+    assert tape.entries() == [("2*3", 6)]
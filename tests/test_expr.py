@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+import math
+import numpy as np
+import pytest
+
+from cerebrino import compile_expr, safe_eval_expr, sample_curve
+
+def test_log_base_scalar_y_arreglo():
+    assert safe_eval_expr("log(8, 2)") == pytest.approx(3.0)
+    xs = np.array([2.0, 8.0, 0.5])
+    assert compile_expr("log(x, 2)")(xs) == pytest.approx([1.0, 3.0, -1.0])
+    assert compile_expr("log(x, 2)")(4.0) == pytest.approx(2.0)
+    assert compile_expr("log(x, 2)").derivative()(1.0) == pytest.approx(1 / math.log(2))
+    x, y = sample_curve(compile_expr("log(x, 2)"), -6, 6)
+    assert len(x) and np.isfinite(y).any()
+
+@pytest.mark.parametrize("expr", ["sin(x, 2)", "exp(x, 1)", "log(x, 2, 3)", "sqrt()"])
+def test_aridad_invalida(expr):
+    with pytest.raises(ValueError):
+        compile_expr(expr)
+
+@pytest.mark.parametrize("expr, value", [("2**1100", 2**1100), ("10**400", 10**400), ("10**400 - 10**400 + 3", 3)])
+def test_enteros_grandes_no_rompen_la_deteccion_afin(expr, value):
+    assert safe_eval_expr(expr) == value
+
+def test_recta_con_constante_enorme_no_es_afin():
+    f = compile_expr("10**400*x")
+    assert f.affine is None
+    assert compile_expr("3*x + 10**2").affine == (3.0, 100.0)
+
+@pytest.mark.parametrize("expr, expected", [
+    ("1/0+x", np.inf), ("0**-1*x", np.inf), ("(-1/(((0.5)**-1-2))**0.5)", -np.inf),
+    ("(1/0+x)*(1/0+x)+x*x", np.inf), ("sqrt(-1)+x*0", np.nan),
+])
+def test_constantes_que_fallan_en_arreglos_dan_inf_o_nan(expr, expected):
+    from cerebrino import ExprBatch, TileCache
+    xs = np.array([1.0, 2.0])
+    np.testing.assert_array_equal(compile_expr(expr)(xs), [expected, expected])
+    np.testing.assert_array_equal(ExprBatch([expr, "x"])(xs)[0], [expected, expected])
+    x, _ = TileCache().curve(compile_expr(expr), -1, 1)
+    assert len(x)
+
+def test_constantes_que_fallan_en_escalar_siguen_siendo_error():
+    with pytest.raises(ZeroDivisionError):
+        safe_eval_expr("1/0+x", 1.0)
+
+def test_productos_de_enteros_acotados_como_la_potencia():
+    with pytest.raises(OverflowError): safe_eval_expr("(10**1000)*(10**1000)")
+    with pytest.raises(OverflowError): safe_eval_expr("x*(10**1000)*(10**1000)", 1)
+    # Pegar un resultado y seguir multiplicando: siempre cabe en str()
+    res = 1
+    for _ in range(200):
+        try: res = safe_eval_expr(f"{res}*99999999999")
+        except (OverflowError, ValueError): break
+        str(res)
+    else: pytest.fail("la cadena de productos no se cortó")
+    assert safe_eval_expr("9" * 150 + "*" + "9" * 150) == int("9" * 150) ** 2
+
+def test_se_compila_una_sola_vez():
+    f = compile_expr("  X^2 + 1 ")
+    assert compile_expr("x**2 + 1") is f
+    assert f(3) == 10 and f(0.5) == 1.25
+    assert safe_eval_expr("2*(3+4) - 10 % 4") == 12
+
+@pytest.mark.parametrize("expr", ["__import__('os')", "x.real", "y + 1", "[x]", "lambda: 1", "open('a')", "'a'"])
+def test_solo_la_lista_blanca(expr):
+    with pytest.raises((ValueError, SyntaxError)):
+        safe_eval_expr(expr, 1.0)
+
+def test_errores_cacheados_salen_como_excepciones_nuevas():
+    errs = []
+    for _ in range(2):
+        with pytest.raises(SyntaxError) as info: compile_expr("2 +* 3")
+        errs.append(info.value)
+    assert errs[0] is not errs[1]
+    with pytest.raises(ValueError): compile_expr("x + 1")(None)   # falta x
+
+def test_funciones_sobre_arreglos():
+    xs = np.linspace(-2, 2, 9)
+    for name, ref in [("sin", np.sin), ("cos", np.cos), ("exp", np.exp), ("abs", np.abs), ("atan", np.arctan)]:
+        np.testing.assert_allclose(compile_expr(f"{name}(x)")(xs), ref(xs))
+    np.testing.assert_allclose(compile_expr("np.sin(x) + pi")(xs), np.sin(xs) + np.pi)
+    # Fuera del dominio: nan (o -inf en log(0)) en ese punto, sin excepción
+    with np.errstate(all="raise"):
+        y = compile_expr("sqrt(x) + log(x)")(xs)
+    assert not np.isfinite(y[xs <= 0]).any() and np.isfinite(y[xs > 0]).all()
+    # Una constante también da un arreglo del tamaño de x
+    assert compile_expr("3")(xs).shape == xs.shape
+
+@pytest.mark.parametrize("expr, exact", [
+    ("x**3", lambda x: 3 * x**2), ("sin(x)*x", lambda x: np.cos(x) * x + np.sin(x)),
+    ("1/(1+x**2)", lambda x: -2 * x / (1 + x**2) ** 2), ("exp(2*x)", lambda x: 2 * np.exp(2 * x)),
+    ("x**x", lambda x: x**x * (np.log(x) + 1)), ("2**x", lambda x: 2**x * np.log(2)),
+    ("sqrt(x)", lambda x: 0.5 / np.sqrt(x)), ("atan(x)", lambda x: 1 / (1 + x**2)), ("7", lambda x: 0 * x),
+])
+def test_derivada_exacta(expr, exact):
+    xs = np.linspace(0.3, 2.5, 12)
+    f = compile_expr(expr)
+    np.testing.assert_allclose(f.derivative()(xs), exact(xs), rtol=1e-12, atol=1e-12)
+    y, m = f.value_and_slope(1.7)
+    assert (y, m) == (pytest.approx(float(f(1.7))), pytest.approx(float(exact(1.7))))
+    assert f.derivative() is f.derivative()
+
+def test_derivada_de_recta_es_constante():
+    d = compile_expr("3*x - 2").derivative()
+    assert d.affine == (0.0, 3.0) and not d.uses_x
+
+@pytest.mark.parametrize("expr", ["9**9**9", "2**100000", "(10**100)**100", "x**10**10"])
+def test_potencias_gigantes_se_cortan_enseguida(expr):
+    import time
+    t = time.perf_counter()
+    with pytest.raises(OverflowError): safe_eval_expr(expr, 7)
+    assert time.perf_counter() - t < 0.5
+
+def test_limites_de_tamano():
+    from cerebrino.expr import MAX_EXPR_CHARS, MAX_EXPR_DEPTH
+    with pytest.raises(ValueError, match="larga"): compile_expr("1+" * (MAX_EXPR_CHARS // 2) + "1")
+    with pytest.raises(ValueError, match="anidada"): compile_expr("-" * (MAX_EXPR_DEPTH + 5) + "x")
+    assert safe_eval_expr("2**64") == 2**64 and safe_eval_expr("1.5**1000") == pytest.approx(1.5**1000)
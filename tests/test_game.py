@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+import random
+import numpy as np
+import pytest
+
+from cerebrino import FUNCS, DerivGame, compile_expr, slope
+from cerebrino.game import BOSS_AFTER, BOSS_STREAK, START_LIVES
+
+@pytest.mark.parametrize("func", [f for f, _ in FUNCS] + ["x**3/8", "exp(-x**2)", "sin(x)*x", "log(x, 2)"])
+def test_derivada_exacta_contra_diferencias_finitas(func):
+    f = compile_expr(func)
+    xs = np.linspace(0.3, 2.7, 9)
+    h = 1e-6
+    assert f.derivative()(xs) == pytest.approx((f(xs + h) - f(xs - h)) / (2 * h), rel=1e-5, abs=1e-6)
+
+def test_partida_con_semilla_es_reproducible():
+    a, b = DerivGame(rng=random.Random(3)), DerivGame(rng=random.Random(3))
+    for _ in range(50):
+        qa, qb = a.new_question(), b.new_question()
+        assert (qa.func, qa.x0, qa.options) == (qb.func, qb.x0, qb.options)
+        a.answer(qa.answer); b.answer(qb.answer)
+
+def test_jefe_y_nivel():
+    game = DerivGame(rng=random.Random(0))
+    for _ in range(BOSS_AFTER):
+        game.answer(game.new_question().answer)
+    q = game.new_question()
+    assert "jefe" in q.events and game.in_boss
+    events = []
+    for _ in range(BOSS_STREAK):
+        events += game.answer(game.question.answer).events; game.new_question()
+    assert "nivel" in events and game.level == 2
+
+def test_sin_vidas_reinicia():
+    game = DerivGame(rng=random.Random(0))
+    for _ in range(START_LIVES):
+        q = game.new_question()
+        res = game.answer(next(o for o in q.options if o != q.answer))
+    assert "fin" in res.events and game.lives == START_LIVES and game.level == 1
+
+def test_respuesta_de_valor_es_la_pendiente():
+    game = DerivGame(rng=random.Random(1)); game.mode = "valor"
+    for _ in range(20):
+        q = game.new_question()
+        assert float(q.answer) == round(slope(q.func, q.x0), 1)
+        assert len(set(q.options)) == 4 and q.answer in q.options
@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from cerebrino import TileCache, compile_expr, perf
+
+@pytest.fixture
+def medir():
+    was = perf.enabled; perf.reset(); perf.enable(True)
+    yield
+    perf.enable(was); perf.reset()
+
+def test_eval_cuenta_los_caminos_calientes(medir):
+    f = compile_expr("x**3 - 2*x")
+    f.value_and_slope(1.5)                              # tangente de Derivando
+    assert perf.last("eval")["n"] == 2
+    TileCache().curves([f, compile_expr("sin(x)")], -5, 5)  # gráfico por tramos
+    assert perf.last("eval")["n"] > 2
+    assert perf.last("muestreo")["n"] > 0
+
+def test_apagado_no_registra():
+    was = perf.enabled; perf.reset(); perf.enable(False)
+    try:
+        compile_expr("x + 1")(2.0)
+        assert perf.last("eval") is None
+    finally:
+        perf.enable(was)
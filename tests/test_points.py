@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+import math
+import numpy as np
+
+from cerebrino import PointIndex, PointGame
+
+def test_puntos_repetidos():
+    idx = PointIndex()
+    for _ in range(5000): idx.add(1.0, 1.0)
+    assert idx.cell > 1e-3
+    i, d = idx.nearest(1.0, 1.0)
+    assert d == 0.0 and 0 <= i < 5000
+    assert idx.nearest(4.0, 5.0)[1] == 5.0
+
+def test_repetidos_mezclados_con_dispersos():
+    rng = np.random.default_rng(0)
+    idx = PointIndex()
+    pts = [(2.5, -1.0)] * 3000 + [tuple(p) for p in rng.uniform(-10, 10, (2000, 2))]
+    for x, y in pts: idx.add(x, y)
+    arr = np.array(pts)
+    for qx, qy in rng.uniform(-12, 12, (200, 2)):
+        assert idx.nearest(qx, qy)[1] == np.hypot(arr[:, 0] - qx, arr[:, 1] - qy).min()
+
+def test_clics_en_el_mismo_pixel():
+    game = PointGame(); game.target = (3, 4)
+    for _ in range(200): assert not game.click(-2.0, -2.0)
+    assert game.closest() == math.hypot(5, 6)
@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+from cerebrino.replay import Recorder, load_trace, replay, save_trace, session_rng, synthetic
+
+def test_sesion_sintetica_se_reproduce_igual(tmp_path):
+    trace = synthetic(7, events=150)
+    path = save_trace(trace, str(tmp_path / "s.json.gz"))
+    a, b = replay(load_trace(path)), replay(trace)
+    assert a["divergencias"] == 0 and a["eventos"] == len(trace["eventos"])
+    assert a["huella"] == b["huella"] and a["derivando"] == b["derivando"]
+
+def test_detecta_divergencias():
+    trace = synthetic(7, events=150)
+    for ev in trace["eventos"]:
+        if ev[1] == "gg": ev[2] += 1; break
+    assert replay(trace)["divergencias"] > 0
+    other = synthetic(7, events=150); other["semilla"] = 8
+    assert replay(other)["divergencias"] > 0
+
+def test_generadores_por_juego_independientes():
+    rec = Recorder(42)
+    assert rec.rng("derivando").random() == session_rng(42, "derivando").random()
+    assert rec.rng("derivando").random() != rec.rng("puntos").random()
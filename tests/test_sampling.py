@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+
+from cerebrino import compile_expr, curve_ylim, sample_curve
+
+def test_recta_son_dos_puntos():
+    x, y = sample_curve(compile_expr("2*x + 1"), -6, 6)
+    assert list(x) == [-6, 6] and list(y) == [-11, 13]
+
+def test_refina_donde_hay_curvatura():
+    f = compile_expr("sqrt(x)")
+    x, y = sample_curve(f, -10, 10)
+    assert x.size < 600
+    dx = np.diff(x)
+    assert dx[(x[:-1] >= 0) & (x[:-1] < 0.1)].min() < dx[x[:-1] > 5].min() / 16
+    xd = np.linspace(0, 10, 100001)
+    assert np.abs(np.interp(xd, x, y) - np.sqrt(xd)).max() < 1e-2
+
+def test_respeta_el_presupuesto():
+    x, _ = sample_curve(compile_expr("sin(50*x)"), -10, 10, budget=300)
+    assert x.size <= 300 + 40          # más los cortes de saltos, si los hay
+
+def test_asintotas_cortadas_con_nan():
+    x, y = sample_curve(compile_expr("tan(x)"), -3, 3)
+    cut = np.flatnonzero(np.isnan(y))
+    assert (x[cut] < 0).any() and (x[cut] > 0).any()
+    # Solo junto a las asíntotas (la rama empinada puede cortarse también, fuera de pantalla)
+    assert np.allclose(np.abs(x[cut]), np.pi / 2, atol=1e-3)
+    # Sin cortes falsos donde la curva es continua
+    x, y = sample_curve(compile_expr("x**3"), -10, 10)
+    assert np.isfinite(y).all()
+
+def test_ylim_recorta_las_colas():
+    lo, hi = curve_ylim(*sample_curve(compile_expr("tan(x)"), -3, 3))
+    assert -30 < lo < -3 and 3 < hi < 30
+    lo, hi = curve_ylim(*sample_curve(compile_expr("x**2"), -2, 2))
+    assert lo < 0 and 4 < hi < 5
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+import asyncio, threading, time
+
+import pytest
+
+from cerebrino.server import ClassroomClient, ClassroomServer, load_test
+
+@pytest.fixture
+def aula():
+    """Servidor en 127.0.0.1:0 con su propio loop en un hilo; devuelve (servidor, puerto)."""
+    srv = ClassroomServer(seed=1)
+    loop = asyncio.new_event_loop()
+    handle = loop.run_until_complete(srv.start("127.0.0.1", 0))
+    th = threading.Thread(target=loop.run_forever, daemon=True); th.start()
+    yield srv, handle.sockets[0].getsockname()[1]
+    async def stop():
+        handle.close(); await handle.wait_closed()
+    asyncio.run_coroutine_threadsafe(stop(), loop).result(5)
+    loop.call_soon_threadsafe(loop.stop); th.join(5); loop.close()
+
+def _wait(cond, timeout=5.0):
+    end = time.time() + timeout
+    while not cond():
+        if time.time() > end: pytest.fail("el servidor no se enteró a tiempo")
+        time.sleep(0.01)
+
+def _answer(srv, cli, name, right=True):
+    q = cli.question("signo")
+    correct = srv.students[name].game.question.answer
+    return cli.answer(correct if right else next(o for o in q["options"] if o != correct))
+
+def test_responder_y_reanudar_por_nombre(aula):
+    srv, port = aula
+    with ClassroomClient(port=port) as cli:
+        assert cli.hello("Ana")["estado"]["level"] == 1
+        res = _answer(srv, cli, "Ana")
+        assert res["ok"] and res["estado"]["bones"] == 1
+        res = _answer(srv, cli, "Ana", right=False)
+        assert not res["ok"] and "vida" in res["events"]
+        with pytest.raises(RuntimeError): cli.answer("1")     # la pregunta ya se respondió
+        state = res["estado"]
+    _wait(lambda: not srv.students["Ana"].online)
+    with ClassroomClient(port=port) as cli:
+        assert cli.hello("Ana")["estado"] == state
+
+def test_panel_totales(aula):
+    srv, port = aula
+    with ClassroomClient(port=port) as a, ClassroomClient(port=port) as b:
+        a.hello("Ana"); b.hello("Beto")
+        _answer(srv, a, "Ana"); _answer(srv, a, "Ana")
+        _answer(srv, b, "Beto", right=False)
+        d = a.dashboard()
+    assert d["total"] == {"alumnos": 2, "conectados": 2, "respuestas": 3, "aciertos": 2, "precision": 0.667}
+    assert [r["nombre"] for r in d["alumnos"]] == ["Ana", "Beto"]
+    assert sum(n for _, n in d["mas_falladas"]) == 1
+
+def test_desconexion_deja_al_alumno_fuera_de_linea(aula):
+    srv, port = aula
+    cli = ClassroomClient(port=port)
+    cli.hello("Ana")
+    assert srv.students["Ana"].online
+    cli.close()
+    _wait(lambda: not srv.students["Ana"].online)
+    with ClassroomClient(port=port) as panel:
+        assert panel.dashboard()["total"]["conectados"] == 0
+
+def test_nombre_conectado_no_se_puede_tomar(aula):
+    srv, port = aula
+    with ClassroomClient(port=port) as ana, ClassroomClient(port=port) as intruso:
+        ana.hello("Ana"); _answer(srv, ana, "Ana")
+        with pytest.raises(RuntimeError, match="ya está conectado"): intruso.hello("Ana")
+        assert ana.question()["options"]        # la sesión de Ana sigue intacta
+        with pytest.raises(RuntimeError): intruso.question()
+
+def test_cambiar_de_nombre_libera_el_anterior(aula):
+    srv, port = aula
+    with ClassroomClient(port=port) as cli:
+        cli.hello("Ana"); cli.hello("Beto")
+        d = cli.dashboard()
+    conectado = {r["nombre"]: r["conectado"] for r in d["alumnos"]}
+    assert conectado == {"Ana": False, "Beto": True}
+
+def test_carga_por_loopback():
+    res = asyncio.run(load_test(students=5, questions=4, seed=3))
+    assert res["respuestas"] == 20
+    assert res["panel"]["alumnos"] == 5 and res["panel"]["respuestas"] == 20
+    assert res["p95_ms"] >= res["p50_ms"] > 0
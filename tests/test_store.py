@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from cerebrino import ProgressStore
+
+@pytest.fixture
+def store(tmp_path):
+    s = ProgressStore(str(tmp_path / "progreso.db"))
+    yield s
+    s.close()
+
+def test_lecturas_no_esperan_al_escritor(store, monkeypatch):
+    sid = store.start_session("Ana", "derivando")
+    store.log(sid, "estado", level=2, lives=3)
+    monkeypatch.setattr(store, "flush", lambda *a, **k: pytest.fail("una lectura esperó al escritor"))
+    assert store.last_state("Ana", "derivando") == {"level": 2, "lives": 3}
+    assert store.players()[0] == "Ana"
+    store.history("Ana")
+
+def test_historial_y_reanudar_desde_disco(store, tmp_path):
+    sid = store.start_session("Ana", "derivando")
+    store.log(sid, "respuesta", ok=True, modo="signo")
+    store.log(sid, "respuesta", ok=False, modo="valor")
+    store.log(sid, "estado", level=3)
+    assert store.flush()
+    other = ProgressStore(store.path)
+    try:
+        assert other.last_state("Ana", "derivando") == {"level": 3}
+        assert other.players() == ["Ana"]
+        h, = other.history("Ana")
+        assert (h["answers"], h["correct"]) == (2, 1)
+    finally:
+        other.close()
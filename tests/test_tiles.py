@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+
+from cerebrino import TileCache, compile_expr
+from cerebrino import tiles
+
+def test_una_curva_que_falla_no_tumba_al_resto(monkeypatch):
+    good, bad = compile_expr("sin(x)"), compile_expr("x**3 - x")
+    real = tiles.compile_batch
+    def batch(sources):
+        if bad.source in sources: raise ZeroDivisionError("division by zero")
+        return real(sources)
+    monkeypatch.setattr(tiles, "compile_batch", batch)
+    out = TileCache().try_curves([good, bad, compile_expr("2*x + 1")], -5, 5)
+    assert out[1] is None
+    x, y = out[0]
+    assert np.allclose(y, np.sin(x))
+    assert np.allclose(out[2][1], 2 * out[2][0] + 1)
+
+def test_los_tramos_se_refinan_y_cortan_las_asintotas():
+    x, y = TileCache().curve(compile_expr("tan(x)"), -3, 3)
+    cut = ~np.isfinite(y)
+    assert cut.sum() == 2
+    # El corte es un punto nuevo en la asíntota; las muestras reales quedan intactas
+    assert np.allclose(np.abs(x[cut]), np.pi / 2, atol=1e-3)
+    assert np.allclose(y[~cut], np.tan(x[~cut]))
+    # Más puntos cerca de la asíntota que donde la curva es casi recta
+    dx = np.diff(x); near = np.abs(x[:-1] - np.pi / 2) < 0.1; flat = (np.abs(x[:-1]) < 0.5) & (dx > 0)
+    assert dx[near].min() < dx[flat].min() / 8
+
+def test_tramos_refinados_cerca_de_la_raiz():
+    f = compile_expr("sqrt(x)")
+    x, y = TileCache().curve(f, -10, 10)
+    xd = np.linspace(0, 10, 100001)
+    assert np.abs(np.interp(xd, x, y) - np.sqrt(xd)).max() < 2e-3 * np.sqrt(10)
+    assert x.size < 500
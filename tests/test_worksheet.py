@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from cerebrino.worksheet import _parse_pair, render, split_pairs
+
+def test_pares_invalidos_antes_del_pool(tmp_path):
+    good, bad = split_pairs([("x**2", 1.0), ("sqrt(x)", -1.0), ("1/x", 0.0), ("log(x)", 0.0)])
+    assert good == [("x**2", 1.0)]
+    assert [p for p, _ in bad] == [("sqrt(x)", -1.0), ("1/x", 0.0), ("log(x)", 0.0)]
+    out = tmp_path / "hojas"
+    with pytest.raises(ValueError):
+        render([("x**2", 1.0), ("sqrt(x)", -1.0)], str(out), workers=1)
+    assert not out.exists()
+
+def test_pares_con_funciones_de_dos_argumentos():
+    assert _parse_pair("log(x, 2)@3") == ("log(x, 2)", 3.0)
+    assert _parse_pair("log(x, 2), 3\n") == ("log(x, 2)", 3.0)
+    assert _parse_pair("x**2 + log(x, 10) , 1.5") == ("x**2 + log(x, 10)", 1.5)
+    assert _parse_pair("sin(x)@-0.25") == ("sin(x)", -0.25)
+    for bad in ("log(x, 2)", "@3", ", 3"):
+        with pytest.raises(ValueError): _parse_pair(bad)
+    good, bad = split_pairs([_parse_pair("log(x, 2)@3")])
+    assert good and not bad